@@ -1,63 +1,202 @@
-from flask import Flask, render_template, request, jsonify
-import pandas as pd
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context, g, url_for, redirect
+import hashlib
+import hmac
 import os
+import signal
+import time
+from typing import NamedTuple
 from dotenv import load_dotenv
 from model_predictor import DiseasePredictor
+from model_store import ModelArtifactStore
+from symptom_catalog import SymptomCatalog
+from predictor_reloader import PredictorReloader, validate_predictor
+from micro_batcher import MicroBatcher
+from diagnosis_session import SessionStore
+import metrics
 
 # Pour l'intégration de Gemini
-from google import genai
-from google.genai import types
+import chat_service
+from chat_cache import CachedChatSource, DiskCacheBackend, MemoryCacheBackend
 
 # Charger les variables d'environnement
 load_dotenv()
 
 app = Flask(__name__)
 
+# Cache des réponses du chat : en mémoire par défaut, sur disque (partagé entre workers)
+# si CHAT_CACHE_PATH est défini
+chat_cache_ttl = float(os.environ.get("CHAT_CACHE_TTL", "3600"))
+if os.environ.get("CHAT_CACHE_PATH"):
+    chat_cache_backend = DiskCacheBackend(os.environ["CHAT_CACHE_PATH"],
+                                          max_size=int(os.environ.get("CHAT_CACHE_SIZE", "10000")),
+                                          ttl=chat_cache_ttl)
+else:
+    chat_cache_backend = MemoryCacheBackend(max_size=int(os.environ.get("CHAT_CACHE_SIZE", "1024")),
+                                            ttl=chat_cache_ttl)
+
+# Source de texte du chat : backend Gemini partagé (client réutilisé, concurrence bornée)
+# derrière le cache des réponses, remplaçable par un faux générateur local pour les tests
+app.config.setdefault("CHAT_SOURCE", CachedChatSource(chat_service.get_default_backend(), chat_cache_backend))
+
 # ---- Configuration et initialisation ----
 
-# Initialisation du prédicteur avec tous les fichiers CSV
-predictor = DiseasePredictor(
-    "data/maladies_symptomes_binary.csv",
+# Nombre maximal d'enregistrements acceptés par appel à /api/predict
+MAX_BATCH_SIZE = 1000
+
+# Nombre maximal de suggestions renvoyées par /api/symptoms/suggest
+MAX_SUGGESTIONS = 200
+
+# Nombre maximal de maladies et de questions renvoyées par /api/sessions
+MAX_SESSION_RESULTS = 50
+
+# Poids et images des symptômes
+SEVERITY_PATH = "data/Symptom-severity.csv"
+
+# Fichiers de référence (médicaments, descriptions, régimes, précautions, exercices)
+REFERENCE_FILES = dict(
     medications_path="data/medications.csv",
     description_path="data/description.csv",
     diets_path="data/diets.csv",
     precautions_path="data/precautions_df.csv",
     workout_path="data/workout_df.csv",
-    model_path=None  # Mettre le chemin vers votre modèle préentraîné si disponible
 )
 
-# Chargement des données des symptômes avec poids et images
-symptoms_info = pd.read_csv("data/symptom-severity.csv")
+class ServingState(NamedTuple):
+    """Tout ce qui dépend des fichiers de données, remplacé d'un bloc lors d'un rechargement"""
+    predictor: DiseasePredictor
+    symptom_catalog: SymptomCatalog
 
-symptoms_dict = {}
-symptoms = []
+def build_serving_state():
+    """
+    Initialisation du prédicteur avec tous les fichiers CSV
+    (DISEASE_DATA_PATH peut pointer vers le format binaire produit par symptom_matrix.py)
+    """
+    predictor = DiseasePredictor(
+        os.environ.get("DISEASE_DATA_PATH", "data/maladies_symptomes_binary.csv"),
+        **REFERENCE_FILES,
+        # Modèle préentraîné, par exemple celui choisi par model_selection.py
+        model_path=os.environ.get("MODEL_PATH"),
+        inference_backend=os.environ.get("INFERENCE_BACKEND", "numpy"),
+        # Modèle mis en cache sur disque : pas de réentraînement au démarrage si les données n'ont pas changé
+        artifact_store=ModelArtifactStore(os.environ.get("MODEL_ARTIFACT_DIR", "models")),
+        cache_size=int(os.environ.get("PREDICTION_CACHE_SIZE", "4096")),
+        deduplicate_training=os.environ.get("DEDUPLICATE_TRAINING", "0") == "1",
+        # "random_forest" (par défaut) ou "svm"
+        model_type=os.environ.get("MODEL_TYPE", "random_forest"),
+        severity_path=SEVERITY_PATH,
+        # Part du moteur de similarité pondéré par la gravité (0 = forêt seule, 1 = similarité seule)
+        similarity_weight=float(os.environ.get("SIMILARITY_WEIGHT", "0"))
+    )
+    # Catalogue des symptômes (poids et images), servi en JSON versionné et mis en cache par le
+    # navigateur ; Last-Modified suit aussi le fichier des maladies, dont vient la liste des symptômes
+    catalog_sources = [SEVERITY_PATH, os.environ.get("DISEASE_DATA_PATH", "data/maladies_symptomes_binary.csv")]
+    return ServingState(predictor, SymptomCatalog(predictor.all_symptoms, SEVERITY_PATH, catalog_sources))
 
-for _, row in symptoms_info.iterrows():
-    raw_name = row['Symptom']
-    formatted_name = raw_name.replace('_', ' ').capitalize()
-    
-    symptoms_dict[formatted_name] = {
-        'weight': row['weight'],
-        'url': row['url'] if 'url' in row and not pd.isna(row['url']) else None
-    }
-    symptoms.append(raw_name)
+# Rechargement à chaud : les routes lisent reloader.current une fois par requête
+reloader = PredictorReloader(
+    build_serving_state,
+    watch_paths=[os.environ.get("DISEASE_DATA_PATH", "data/maladies_symptomes_binary.csv"),
+                 os.environ.get("MODEL_PATH"), SEVERITY_PATH, *REFERENCE_FILES.values()],
+    validate=lambda state: validate_predictor(state.predictor),
+)
+
+def start_file_watcher(on_change=None):
+    """
+    Surveillance des fichiers toutes les PREDICTOR_WATCH_INTERVAL secondes (0 = désactivée).
+    En pré-fork, elle tourne dans le maître avec on_change = envoi de SIGHUP au maître
+    (voir gunicorn.conf.py) : un worker qui rechargerait lui-même construirait un
+    prédicteur privé, non partagé, et les autres workers garderaient l'ancien.
+    """
+    interval = float(os.environ.get("PREDICTOR_WATCH_INTERVAL", "0"))
+    if interval > 0:
+        reloader.start_watcher(interval, on_change)
+
+# Regroupement des prédictions unitaires concurrentes (MICROBATCH_WINDOW_MS=0 : désactivé).
+# Le lot est évalué sur reloader.current au moment de son départ.
+MICROBATCH_WINDOW_MS = float(os.environ.get("MICROBATCH_WINDOW_MS", "0"))
+batcher = None
+if MICROBATCH_WINDOW_MS > 0:
+    batcher = MicroBatcher(lambda symptom_lists: reloader.current.predictor.predict_batch(symptom_lists),
+                           max_batch_size=int(os.environ.get("MICROBATCH_MAX_SIZE", "32")),
+                           max_wait=MICROBATCH_WINDOW_MS / 1000)
+
+def predict_one(predictor, symptoms):
+    """Prédiction unitaire, regroupée avec les requêtes concurrentes si le micro-batching est actif"""
+    if batcher is not None:
+        return batcher.predict(symptoms)
+    return predictor.predict(symptoms)
+
+# Sessions de diagnostic interactives, propres à chaque processus
+diagnosis_sessions = SessionStore(max_sessions=int(os.environ.get("DIAGNOSIS_MAX_SESSIONS", "10000")),
+                                  idle_timeout=float(os.environ.get("DIAGNOSIS_SESSION_TTL", "1800")))
+
+# Jeton requis par /admin/reload (endpoint désactivé si absent)
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+
+# Page d'accueil sans résultat, rendue une seule fois par version du catalogue : (html, etag)
+_index_page = {}
+
+# Durée de cache de la ressource versionnée (son contenu ne change jamais pour une version donnée)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
 # ---- Routes principales ----
 
+def render_index(symptom_catalog, result=None):
+    """Rend index.html ; la liste des symptômes est chargée par le navigateur depuis le catalogue"""
+    catalog_url = url_for("symptom_catalog_versioned", version=symptom_catalog.version)
+    with metrics.timer("http_render_seconds", template="index.html"):
+        return render_template("index.html", result=result, catalog_url=catalog_url)
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     """Page d'accueil permettant l'analyse des symptômes"""
+    state = reloader.current
     result = None
 
     if request.method == "POST":
         selected_symptoms = request.form.getlist("symptoms")
         
         if selected_symptoms:
-            result = predictor.predict(selected_symptoms)
+            result = predict_one(state.predictor, selected_symptoms)
             result["score"] = f"{result['score']*100:.2f}%"
             result["precision"] = f"{result['precision']:.2f}%"
     
-    return render_template("index.html", symptoms=symptoms, result=result, symptoms_dict=symptoms_dict)
+    if result is not None:
+        return render_index(state.symptom_catalog, result)
+    
+    # Sans résultat la page est invariante : rendue une fois, puis revalidée par ETag
+    version = state.symptom_catalog.version
+    cached = _index_page.get(version)
+    if cached is None:
+        html = render_index(state.symptom_catalog)
+        _index_page.clear()  # Seule la version courante est conservée
+        cached = _index_page[version] = (html, hashlib.sha256(html.encode("utf-8")).hexdigest()[:16])
+    html, etag = cached
+    response = Response(html, mimetype="text/html")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+@app.route('/api/symptoms/catalog')
+def symptom_catalog_latest():
+    """Catalogue des symptômes, version courante (revalidation par ETag / Last-Modified)"""
+    return catalog_response(reloader.current.symptom_catalog, "no-cache")
+
+@app.route('/api/symptoms/catalog/<version>.json')
+def symptom_catalog_versioned(version):
+    """Catalogue des symptômes d'une version donnée, mis en cache un an par le navigateur"""
+    symptom_catalog = reloader.current.symptom_catalog
+    if version != symptom_catalog.version:
+        return redirect(url_for("symptom_catalog_versioned", version=symptom_catalog.version))
+    return catalog_response(symptom_catalog, IMMUTABLE_CACHE_CONTROL)
+
+def catalog_response(symptom_catalog, cache_control):
+    """Réponse JSON du catalogue avec ETag, Last-Modified et réponse 304 si inchangé"""
+    response = Response(symptom_catalog.body, mimetype="application/json")
+    response.set_etag(symptom_catalog.version)
+    response.last_modified = symptom_catalog.last_modified
+    response.headers["Cache-Control"] = cache_control
+    return response.make_conditional(request)
 
 @app.route('/chat', methods=['POST'])
 def chat():
@@ -78,58 +217,255 @@ def chat():
         app.logger.error(f"Erreur lors du traitement de la requête chat: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    """API de chat en streaming (Server-Sent Events) : les fragments sont envoyés dès leur arrivée"""
+    data = request.get_json(silent=True)
+    if not data or 'message' not in data:
+        return jsonify({"error": "Message requis"}), 400
+    
+    chunks = chat_service.stream_response(data.get("message", ""), source=app.config["CHAT_SOURCE"])
+    return Response(
+        stream_with_context(chat_service.sse_events(chunks)),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.route('/api/predict', methods=['POST'])
+def api_predict():
+    """
+    API JSON de prédiction par lot
+    
+    Corps attendu : {"records": [["itching", "skin rash"], ["cough", ...], ...]}
+    Réponse : {"results": [...]} avec un résultat par enregistrement, dans le même ordre
+    """
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data.get("records"), list):
+        return jsonify({"error": "Liste 'records' requise"}), 400
+    
+    records = data["records"]
+    if len(records) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"Maximum {MAX_BATCH_SIZE} enregistrements par requête"}), 413
+    
+    if not all(isinstance(r, list) and all(isinstance(s, str) for s in r) for r in records):
+        return jsonify({"error": "Chaque enregistrement doit être une liste de symptômes"}), 400
+    
+    if len(records) == 1:
+        results = [predict_one(reloader.current.predictor, records[0])]
+    else:
+        results = reloader.current.predictor.predict_batch(records)
+    for result in results:
+        result["score"] = float(result["score"])
+        result["precision"] = float(result["precision"])
+    
+    return jsonify({"results": results})
+
+@app.route('/api/symptoms/suggest')
+def suggest_symptoms():
+    """
+    Autocomplétion des symptômes (préfixes, alias français, synonymes, fautes de frappe)
+    
+    Paramètres : q (saisie), limit (nombre de suggestions, 10 par défaut)
+    Réponse : {"query": ..., "suggestions": [{"symptom", "label", "weight"}, ...]}
+    """
+    query = request.args.get("q", "")
+    try:
+        limit = int(request.args.get("limit", 10))
+    except ValueError:
+        return jsonify({"error": "'limit' doit être un entier"}), 400
+    limit = max(0, min(limit, MAX_SUGGESTIONS))
+    
+    suggestions = reloader.current.predictor.symptom_index.suggest(query, limit)
+    return jsonify({"query": query, "suggestions": suggestions})
+
+def _session_answers(data, fields):
+    """Extrait les listes de symptômes d'un corps JSON ; None si le format est invalide"""
+    answers = {}
+    for field in fields:
+        values = data.get(field, [])
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            return None
+        answers[field] = values
+    return answers
+
+def _apply_answers(session, predictor, answers):
+    """Met à jour la session ; retourne les saisies qui ne correspondent à aucun symptôme"""
+    unrecognized = []
+    actions = {"present": session.add, "absent": session.exclude, "remove": session.remove}
+    for field, values in answers.items():
+        for value in values:
+            symptoms = predictor.normalize_symptoms([value])
+            if not symptoms:
+                unrecognized.append(value)
+            for symptom in symptoms:
+                actions[field](symptom)
+    return unrecognized
+
+def _session_limits():
+    """Paramètres top et questions de la requête, bornés ; None s'ils ne sont pas entiers"""
+    try:
+        top = max(1, min(int(request.args.get("top", 5)), MAX_SESSION_RESULTS))
+        questions = max(0, min(int(request.args.get("questions", 5)), MAX_SESSION_RESULTS))
+    except ValueError:
+        return None
+    return top, questions
+
+def _session_response(session, limits, unrecognized=(), status=200):
+    top, questions = limits
+    state = session.state(differential_size=top, questions=questions)
+    state["unrecognized"] = list(unrecognized)
+    return jsonify(state), status
+
+@app.route('/api/sessions', methods=['POST'])
+def create_session():
+    """
+    Démarre un diagnostic interactif conservé côté serveur
+    
+    Corps (optionnel) : {"present": ["itching", ...], "absent": [...]}
+    Réponse (201) : {"session_id", "symptoms", "absent", "differential": [{"disease", "probability"}],
+    "next_symptoms": [{"symptom", "probability", "information_gain"}], "unrecognized"}
+    Paramètres : top (taille du différentiel), questions (nombre de symptômes à demander)
+    """
+    # Requête validée entièrement avant de créer la session
+    limits = _session_limits()
+    if limits is None:
+        return jsonify({"error": "'top' et 'questions' doivent être des entiers"}), 400
+    answers = _session_answers(request.get_json(silent=True) or {}, ("present", "absent"))
+    if answers is None:
+        return jsonify({"error": "'present' et 'absent' doivent être des listes de symptômes"}), 400
+    
+    predictor = reloader.current.predictor
+    session = diagnosis_sessions.create(predictor.symptom_statistics)
+    with session.lock:
+        unrecognized = _apply_answers(session, predictor, answers)
+        return _session_response(session, limits, unrecognized, status=201)
+
+@app.route('/api/sessions/<session_id>', methods=['GET', 'POST', 'DELETE'])
+def diagnosis_session(session_id):
+    """
+    GET : état de la session ; DELETE : la supprime
+    POST : {"present": [...], "absent": [...], "remove": [...]} ajoute des symptômes, en écarte,
+    ou oublie une réponse, puis renvoie le différentiel et les prochains symptômes à demander
+    """
+    if request.method == "DELETE":
+        if not diagnosis_sessions.delete(session_id):
+            return jsonify({"error": "Session inconnue ou expirée"}), 404
+        return "", 204
+    
+    session = diagnosis_sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Session inconnue ou expirée"}), 404
+    
+    # Requête validée entièrement avant de modifier la session
+    limits = _session_limits()
+    if limits is None:
+        return jsonify({"error": "'top' et 'questions' doivent être des entiers"}), 400
+    answers = {}
+    if request.method == "POST":
+        answers = _session_answers(request.get_json(silent=True) or {}, ("remove", "absent", "present"))
+        if answers is None:
+            return jsonify({"error": "'present', 'absent' et 'remove' doivent être des listes de symptômes"}), 400
+    
+    predictor = reloader.current.predictor
+    with session.lock:
+        # Après un rechargement, la session est recalculée sur les nouvelles statistiques
+        session.rebind(predictor.symptom_statistics)
+        unrecognized = _apply_answers(session, predictor, answers)
+        return _session_response(session, limits, unrecognized)
+
+@app.route('/admin/reload', methods=['GET', 'POST'])
+def admin_reload():
+    """
+    Rechargement à chaud du modèle et des CSV de référence (en-tête X-Admin-Token requis)
+    
+    GET : état des rechargements ; POST : lance un rechargement en arrière-plan (202)
+
+    En pré-fork (gunicorn, voir wsgi.create_app), POST envoie SIGHUP au maître : il
+    recharge le prédicteur puis remplace tous les workers, qui partagent le nouvel état.
+    Le GET répond avec l'état du worker interrogé, à jour une fois les workers remplacés
+    (generation, failures et last_error viennent du maître).
+    """
+    if not ADMIN_TOKEN:
+        return jsonify({"error": "Endpoint désactivé (ADMIN_TOKEN non défini)"}), 404
+    token = request.headers.get("X-Admin-Token", "")
+    if not hmac.compare_digest(token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        return jsonify({"error": "Jeton invalide"}), 403
+    
+    if request.method == "POST":
+        if app.config.get("PREFORK"):
+            os.kill(os.getppid(), signal.SIGHUP)
+            return jsonify({"status": "started", "prefork": True, **reloader.stats()}), 202
+        if not reloader.reload_async(reason="admin"):
+            return jsonify({"error": "Rechargement déjà en cours", **reloader.stats()}), 409
+        return jsonify({"status": "started", **reloader.stats()}), 202
+    return jsonify(reloader.stats())
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Métriques au format texte Prometheus"""
+    if not metrics.REGISTRY.enabled:
+        return jsonify({"error": "Métriques désactivées"}), 404
+    return Response(metrics.REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+# ---- Instrumentation ----
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    """Compte les requêtes et mesure leur latence par route (hors corps des réponses en streaming)"""
+    start = g.pop("request_start", None)
+    if start is not None and metrics.REGISTRY.enabled:
+        endpoint = request.endpoint or "unknown"
+        metrics.observe("http_request_duration_seconds", time.perf_counter() - start,
+                        endpoint=endpoint, method=request.method)
+        metrics.inc("http_requests_total", endpoint=endpoint, method=request.method,
+                    status=response.status_code)
+    return response
+
+def collect_component_metrics():
+    """État des caches et du backend de chat, lu au moment de l'export"""
+    samples = metrics.stats_samples("prediction_cache", reloader.current.predictor.prediction_cache.stats(),
+                                    counters={"hits", "misses", "evictions"})
+    samples.append(("predictor_generation", "gauge", {}, reloader.generation))
+    samples.append(("predictor_reload_failures_total", "counter", {}, reloader.failures))
+    samples.append(("predictor_last_reload_failed", "gauge", {}, int(reloader.last_error is not None)))
+    samples += metrics.stats_samples("diagnosis_sessions", diagnosis_sessions.stats(),
+                                     counters={"created", "evictions", "expirations"})
+    if batcher is not None:
+        samples += metrics.stats_samples("predictor_microbatch", batcher.stats(),
+                                         counters={"batches", "items", "failed_batches"})
+    chat_source = app.config["CHAT_SOURCE"]
+    if isinstance(chat_source, CachedChatSource):
+        samples += metrics.stats_samples("chat_cache", chat_source.stats(), counters={"hits", "misses"})
+        chat_source = chat_source.source
+    if isinstance(chat_source, chat_service.ChatBackend):
+        samples += metrics.stats_samples("chat_backend", chat_source.stats(),
+                                         counters={"requests", "rejected", "timeouts", "errors", "queue_wait_total"})
+    return samples
+
+metrics.REGISTRY.register_collector(collect_component_metrics)
+metrics.REGISTRY.describe("predictor_stage_seconds", "Durée de chaque étape de la prédiction")
+metrics.REGISTRY.describe("http_request_duration_seconds", "Latence des requêtes HTTP par route")
+metrics.REGISTRY.describe("http_render_seconds", "Durée du rendu des templates")
+metrics.REGISTRY.describe("predictor_reload_seconds", "Durée de construction et validation d'un nouveau prédicteur")
+metrics.REGISTRY.describe("predictor_last_reload_failed", "1 si le dernier rechargement a échoué (l'ancien prédicteur reste en service)")
+metrics.REGISTRY.describe("predictor_microbatch_size", "Nombre de prédictions regroupées par appel au modèle")
+metrics.REGISTRY.describe("predictor_microbatch_wait_seconds", "Attente d'une prédiction avant le départ de son lot")
+metrics.REGISTRY.describe("chat_upstream_seconds", "Durée totale des appels au modèle de chat")
+metrics.REGISTRY.describe("chat_first_chunk_seconds", "Délai avant le premier fragment de réponse du chat")
+
 # ---- Fonctions auxiliaires ----
 
 def generate_response(user_input):
-    """Génère une réponse via l'API Gemini"""
-    try:
-        # Vérification de la clé API
-        api_key = os.environ.get("GEMINI_API_KEY")
-        if not api_key:
-            return "Erreur: Clé API Gemini non configurée."
-        
-        # Initialisation du client Gemini
-        client = genai.Client(api_key=api_key)
-        
-        # Configuration de la requête
-        model = "gemini-1.5-flash"
-        
-        contents = [
-            types.Content(
-                role="user",
-                parts=[types.Part.from_text(text=user_input)],
-            ),
-        ]
-        
-        generate_content_config = types.GenerateContentConfig(
-            safety_settings=[
-                types.SafetySetting(category="HARM_CATEGORY_HARASSMENT", threshold="BLOCK_ONLY_HIGH"),
-                types.SafetySetting(category="HARM_CATEGORY_HATE_SPEECH", threshold="BLOCK_ONLY_HIGH"),
-                types.SafetySetting(category="HARM_CATEGORY_SEXUALLY_EXPLICIT", threshold="BLOCK_ONLY_HIGH"),
-                types.SafetySetting(category="HARM_CATEGORY_DANGEROUS_CONTENT", threshold="BLOCK_ONLY_HIGH"),
-            ],
-            response_mime_type="text/plain",
-            system_instruction=[
-                types.Part.from_text(text="""Tu es un assistant santé bienveillant."""),
-            ],
-        )
-        
-        # Génération de la réponse
-        output = ""
-        for chunk in client.models.generate_content_stream(
-            model=model,
-            contents=contents,
-            config=generate_content_config,
-        ):
-            if chunk.text:
-                output += chunk.text
-        
-        return output
-    except Exception as e:
-        app.logger.error(f"Erreur lors de la génération de réponse: {str(e)}")
-        return f"Désolé, je n'ai pas pu traiter votre demande: {str(e)}"
+    """Génère une réponse complète via l'API Gemini"""
+    return chat_service.generate_response(user_input, source=app.config["CHAT_SOURCE"])
 
 # ---- Point d'entrée de l'application ----
 
 if __name__ == "__main__":
+    # Serveur de développement ; en production : gunicorn -c gunicorn.conf.py "wsgi:create_app()"
+    start_file_watcher()
     app.run(debug=True)
\ No newline at end of file
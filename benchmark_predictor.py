@@ -0,0 +1,412 @@
+import argparse
+import ast
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from micro_batcher import MicroBatcher
+from model_predictor import DiseasePredictor
+from model_store import ModelArtifactStore
+from predictor_reloader import PredictorReloader, validate_predictor
+
+
+DATA_FILES = dict(
+    medications_path="data/medications.csv",
+    description_path="data/description.csv",
+    diets_path="data/diets.csv",
+    precautions_path="data/precautions_df.csv",
+    workout_path="data/workout_df.csv",
+)
+
+
+def _parse_list(value):
+    """Conversion identique à l'ancien code (ast.literal_eval à chaque appel)"""
+    if isinstance(value, str) and value.startswith('['):
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return [value]
+    return [value] if isinstance(value, str) else value
+
+
+def legacy_enrichment(predictor, disease_name):
+    """
+    Reproduit l'enrichissement d'avant l'index : six analyses pandas par requête.
+    Sert uniquement de point de comparaison pour le benchmark.
+    """
+    disease_data = predictor.disease_data
+    rows = disease_data[disease_data[predictor.disease_column] == disease_name]
+    symptoms = [s for s in predictor.all_symptoms if rows[s].iloc[0] == 1]
+
+    meds_data = predictor.medications_data
+    meds = []
+    if disease_name in meds_data['Disease'].values:
+        meds = _parse_list(meds_data[meds_data['Disease'] == disease_name]['Medication'].iloc[0])
+
+    desc_data = predictor.description_data
+    description = ""
+    if disease_name in desc_data['Disease'].values:
+        description = desc_data[desc_data['Disease'] == disease_name]['Description'].iloc[0]
+
+    diets_data = predictor.diets_data
+    diets = []
+    if disease_name in diets_data['Disease'].values:
+        diets = _parse_list(diets_data[diets_data['Disease'] == disease_name]['Diet'].iloc[0])
+
+    prec_data = predictor.precautions_data
+    precautions = []
+    if disease_name in prec_data['Disease'].values:
+        row = prec_data[prec_data['Disease'] == disease_name]
+        for col in ['Precaution_1', 'Precaution_2', 'Precaution_3', 'Precaution_4']:
+            if not pd.isna(row[col].iloc[0]):
+                precautions.append(row[col].iloc[0])
+
+    work_data = predictor.workout_data
+    workout = []
+    if disease_name in work_data['disease'].values:
+        workout = work_data[work_data['disease'] == disease_name]['workout'].tolist()
+
+    return symptoms, meds, description, diets, precautions, workout
+
+
+def indexed_enrichment(predictor, disease_name):
+    """Enrichissement actuel : une seule recherche dans l'index précalculé"""
+    return predictor._build_result(disease_name, 1.0, [], precision=0.0)
+
+
+def _time_calls(func, args_list, repeat):
+    """Retourne les durées (en microsecondes) de chaque appel"""
+    timings = []
+    for _ in range(repeat):
+        for args in args_list:
+            start = time.perf_counter()
+            func(*args)
+            timings.append((time.perf_counter() - start) * 1e6)
+    return np.array(timings)
+
+
+def _stats(timings):
+    """Percentiles (en microsecondes) d'une série de durées"""
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    return {"n": int(len(timings)), "p50_us": float(p50), "p95_us": float(p95),
+            "p99_us": float(p99), "mean_us": float(np.mean(timings))}
+
+
+def _summary(name, stats):
+    print(f"{name:<28} p50={stats['p50_us']:11.1f} µs  p95={stats['p95_us']:11.1f} µs  "
+          f"p99={stats['p99_us']:11.1f} µs")
+
+
+def generate_synthetic_dataset(directory, n_rows, n_symptoms, n_diseases, seed=0):
+    """
+    Génère un jeu de données synthétique au format des fichiers de data/ : chaque maladie
+    a un profil de 3 à 10 symptômes, chaque ligne en retire ou ajoute quelques-uns.
+
+    Returns:
+        (chemin du CSV maladies/symptômes, dictionnaire des chemins des fichiers d'enrichissement)
+    """
+    rng = np.random.default_rng(seed)
+    symptoms = [f"symptom_{i}" for i in range(n_symptoms)]
+    diseases = [f"Disease {i}" for i in range(n_diseases)]
+
+    profiles = np.zeros((n_diseases, n_symptoms), dtype=np.uint8)
+    for d in range(n_diseases):
+        profiles[d, rng.choice(n_symptoms, size=rng.integers(3, 11), replace=False)] = 1
+
+    labels = rng.integers(0, n_diseases, size=n_rows)
+    matrix = profiles[labels].copy()
+    # Bruit : ~10 % des symptômes du profil absents, quelques symptômes parasites
+    matrix[(matrix == 1) & (rng.random(matrix.shape) < 0.1)] = 0
+    matrix[rng.random(matrix.shape) < 1.0 / n_symptoms] = 1
+
+    os.makedirs(directory, exist_ok=True)
+    data_path = os.path.join(directory, "maladies_symptomes_binary.csv")
+    frame = pd.DataFrame(matrix, columns=symptoms)
+    frame["prognosis"] = np.array(diseases)[labels]
+    frame.to_csv(data_path, index=False)
+
+    items = lambda prefix, d: str([f"{prefix} {d} {j}" for j in range(5)])
+    paths = {
+        "medications_path": os.path.join(directory, "medications.csv"),
+        "description_path": os.path.join(directory, "description.csv"),
+        "diets_path": os.path.join(directory, "diets.csv"),
+        "precautions_path": os.path.join(directory, "precautions_df.csv"),
+        "workout_path": os.path.join(directory, "workout_df.csv"),
+    }
+    pd.DataFrame({"Disease": diseases, "Medication": [items("Medication", d) for d in diseases]}) \
+        .to_csv(paths["medications_path"], index=False)
+    pd.DataFrame({"Disease": diseases, "Description": [f"{d} description." for d in diseases]}) \
+        .to_csv(paths["description_path"], index=False)
+    pd.DataFrame({"Disease": diseases, "Diet": [items("Diet", d) for d in diseases]}) \
+        .to_csv(paths["diets_path"], index=False)
+    pd.DataFrame({"Disease": diseases, **{f"Precaution_{j}": [f"precaution {j}" for _ in diseases]
+                                           for j in range(1, 5)}}) \
+        .to_csv(paths["precautions_path"])
+    pd.DataFrame({"disease": np.repeat(diseases, 10), "workout": [f"workout {j}" for j in range(10)] * n_diseases}) \
+        .to_csv(paths["workout_path"])
+    return data_path, paths
+
+
+def run_suite(data_path, data_files, repeat=20, construct_repeat=3, batch_size=256,
+              inference_backend="sklearn", compare_legacy=True):
+    """
+    Mesure chaque étape du prédicteur sur un jeu de données
+
+    Returns:
+        Dictionnaire {étape: statistiques} sérialisable en JSON
+    """
+    results = {}
+
+    # Construction : lecture des CSV + entraînement
+    timings = []
+    predictor = None
+    for _ in range(construct_repeat):
+        del predictor  # Un seul prédicteur en mémoire à la fois
+        start = time.perf_counter()
+        predictor = DiseasePredictor(data_path, inference_backend=inference_backend, **data_files)
+        timings.append((time.perf_counter() - start) * 1e6)
+    results["construction"] = _stats(timings)
+
+    # Requêtes représentatives : symptômes caractéristiques de chaque maladie (au plus 200)
+    classes = list(predictor.model.classes_[:200])
+    requests = [(predictor.get_disease_symptoms(disease),) for disease in classes]
+
+    results["predict"] = _stats(_time_calls(predictor.predict, requests, repeat))
+    results["enrichment"] = _stats(_time_calls(indexed_enrichment, [(predictor, d) for d in classes], repeat))
+    if compare_legacy:
+        # Le DataFrame d'entraînement est construit hors de la mesure (il est ensuite conservé)
+        predictor.disease_data
+        results["enrichment_legacy"] = _stats(
+            _time_calls(legacy_enrichment, [(predictor, d) for d in classes[:50]], max(1, repeat // 4)))
+
+    # Chargement d'un modèle sauvegardé
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "model.joblib")
+        predictor.save_model(model_path)
+        results["load_model"] = _stats(_time_calls(predictor.load_model, [(model_path,)], construct_repeat))
+        results["model_size_bytes"] = os.path.getsize(model_path)
+
+    # Débit par lot
+    batch = [requests[i % len(requests)][0] for i in range(batch_size)]
+    batch_timings = _time_calls(predictor.predict_batch, [(batch,)], max(1, repeat // 4))
+    results["predict_batch"] = _stats(batch_timings)
+    results["predict_batch"]["batch_size"] = batch_size
+    results["predict_batch"]["rows_per_second"] = float(batch_size / (np.median(batch_timings) / 1e6))
+
+    results["dataset"] = {
+        "rows": int(predictor.symptom_data.matrix.shape[0]),
+        "symptoms": len(predictor.all_symptoms),
+        "diseases": int(len(predictor.model.classes_)),
+    }
+    return results
+
+
+def run_reload_benchmark(data_path, data_files, reloads=5, clients=4, settle_seconds=1.0,
+                         swap_window=0.05, inference_backend="numpy"):
+    """
+    Mesure la latence de predict pendant des rechargements à chaud : des threads clients
+    interrogent reloader.current en continu pendant que des rechargements (construction,
+    validation, substitution) sont lancés. Les requêtes sont classées selon leur instant
+    de départ : hors rechargement, pendant la construction, ou à moins de `swap_window`
+    secondes d'une substitution.
+
+    Returns:
+        Dictionnaire {phase: statistiques} sérialisable en JSON
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ModelArtifactStore(tmp)
+
+        def factory():
+            # Comme en production : le modèle est rechargé depuis l'artefact, pas réentraîné
+            return DiseasePredictor(data_path, inference_backend=inference_backend,
+                                    artifact_store=store, **data_files)
+
+        reloader = PredictorReloader(factory, validate=validate_predictor)
+        predictor = reloader.current
+        classes = list(predictor.model.classes_[:200])
+        requests = [predictor.get_disease_symptoms(disease) for disease in classes]
+
+        samples = []  # (début, fin) de chaque requête, en secondes perf_counter
+        stop = threading.Event()
+
+        def client(offset):
+            local = []
+            i = offset
+            while not stop.is_set():
+                start = time.perf_counter()
+                reloader.current.predict(requests[i % len(requests)])
+                local.append((start, time.perf_counter()))
+                i += 1
+            samples.extend(local)
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+        for thread in threads:
+            thread.start()
+
+        windows = []  # (début du rechargement, instant de la substitution)
+        reload_seconds = []
+        swap_seconds = []
+        time.sleep(settle_seconds)
+        for _ in range(reloads):
+            start = time.perf_counter()
+            if reloader.reload(reason="benchmark"):
+                windows.append((start, reloader.last_swap_at))
+                reload_seconds.append(reloader.last_reload_seconds)
+                swap_seconds.append(reloader.last_swap_seconds * 1e6)
+            time.sleep(settle_seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    phases = {"steady": [], "building": [], "swap": []}
+    for start, end in samples:
+        latency = (end - start) * 1e6
+        if any(abs(start - swap_at) <= swap_window for _, swap_at in windows):
+            phases["swap"].append(latency)
+        elif any(begin <= start <= swap_at for begin, swap_at in windows):
+            phases["building"].append(latency)
+        else:
+            phases["steady"].append(latency)
+
+    results = {phase: _stats(np.array(values)) for phase, values in phases.items() if values}
+    results["reloads"] = len(windows)
+    results["reload_seconds_mean"] = float(np.mean(reload_seconds)) if reload_seconds else None
+    results["swap_us_max"] = float(np.max(swap_seconds)) if swap_seconds else None
+    return results
+
+
+def run_microbatch_benchmark(predictor, clients=16, duration=2.0, windows_ms=(1, 2, 5), max_batch_size=32):
+    """
+    Débit de predict avec `clients` threads concurrents, appel direct puis via MicroBatcher
+    pour chaque fenêtre de regroupement. Le cache de prédiction doit être désactivé
+    (cache_size=0) pour mesurer le modèle et non le cache.
+
+    Returns:
+        Dictionnaire {mode: {"rows_per_second", "p50_us", "p99_us", "mean_batch_size"}}
+    """
+    requests = [predictor.get_disease_symptoms(disease) for disease in predictor.model.classes_[:200]]
+
+    def measure(predict):
+        latencies = []
+        stop = threading.Event()
+
+        def client(offset):
+            local = []
+            i = offset
+            while not stop.is_set():
+                start = time.perf_counter()
+                predict(requests[i % len(requests)])
+                local.append((time.perf_counter() - start) * 1e6)
+                i += 1
+            latencies.extend(local)
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        latencies = np.array(latencies)
+        return {
+            "rows_per_second": float(len(latencies) / duration),
+            "p50_us": float(np.percentile(latencies, 50)),
+            "p99_us": float(np.percentile(latencies, 99)),
+        }
+
+    results = {"direct": measure(predictor.predict)}
+    for window_ms in windows_ms:
+        batcher = MicroBatcher(predictor.predict_batch, max_batch_size=max_batch_size, max_wait=window_ms / 1000)
+        results[f"microbatch_{window_ms}ms"] = measure(batcher.predict)
+        results[f"microbatch_{window_ms}ms"]["mean_batch_size"] = batcher.stats()["mean_batch_size"]
+    return results
+
+
+def _parse_scale(text):
+    """Convertit "LIGNESxSYMPTÔMESxMALADIES" en tuple d'entiers"""
+    rows, symptoms, diseases = (int(v) for v in text.lower().split("x"))
+    return rows, symptoms, diseases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du prédicteur de maladies")
+    parser.add_argument("--data", default="data/maladies_symptomes_binary.csv")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--construct-repeat", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--backend", choices=["sklearn", "numpy"], default="sklearn")
+    parser.add_argument("--scales", nargs="*", default=[],
+                        help="Jeux synthétiques LIGNESxSYMPTÔMESxMALADIES, ex. 10000x500x200 100000x1000x500")
+    parser.add_argument("--skip-shipped", action="store_true", help="Ne pas mesurer les fichiers de data/")
+    parser.add_argument("--reloads", type=int, default=0,
+                        help="Mesurer la latence pendant N rechargements à chaud (0 = désactivé)")
+    parser.add_argument("--microbatch-clients", type=int, default=0,
+                        help="Comparer predict direct et MicroBatcher avec N threads clients (0 = désactivé)")
+    parser.add_argument("--output", help="Fichier JSON des résultats")
+    args = parser.parse_args()
+
+    report = {
+        "config": {"repeat": args.repeat, "batch_size": args.batch_size, "backend": args.backend},
+        "datasets": {},
+    }
+    options = dict(repeat=args.repeat, construct_repeat=args.construct_repeat,
+                   batch_size=args.batch_size, inference_backend=args.backend)
+
+    datasets = []
+    if not args.skip_shipped:
+        datasets.append(("shipped", lambda tmp: (args.data, DATA_FILES)))
+    for scale in args.scales:
+        rows, symptoms, diseases = _parse_scale(scale)
+        datasets.append((f"synthetic_{rows}x{symptoms}x{diseases}",
+                         lambda tmp, r=rows, s=symptoms, d=diseases: generate_synthetic_dataset(tmp, r, s, d)))
+
+    for name, prepare in datasets:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_path, data_files = prepare(tmp)
+            results = run_suite(data_path, data_files, **options)
+        report["datasets"][name] = results
+
+        print(f"\n== {name} : {results['dataset']}")
+        for stage in ["construction", "predict", "enrichment", "enrichment_legacy", "load_model", "predict_batch"]:
+            if stage in results:
+                _summary(stage, results[stage])
+        print(f"{'débit par lot':<28} {results['predict_batch']['rows_per_second']:.0f} lignes/s")
+
+        if args.reloads:
+            with tempfile.TemporaryDirectory() as tmp:
+                data_path, data_files = prepare(tmp)
+                reload_results = run_reload_benchmark(data_path, data_files, reloads=args.reloads,
+                                                      inference_backend=args.backend)
+            results["hot_reload"] = reload_results
+            print(f"-- rechargement à chaud ({reload_results['reloads']} rechargements, "
+                  f"{reload_results['reload_seconds_mean']:.2f} s chacun, "
+                  f"substitution max {reload_results['swap_us_max']:.1f} µs)")
+            for phase in ["steady", "building", "swap"]:
+                if phase in reload_results:
+                    _summary(f"predict ({phase})", reload_results[phase])
+
+        if args.microbatch_clients:
+            with tempfile.TemporaryDirectory() as tmp:
+                data_path, data_files = prepare(tmp)
+                predictor = DiseasePredictor(data_path, inference_backend=args.backend, cache_size=0, **data_files)
+                microbatch_results = run_microbatch_benchmark(predictor, clients=args.microbatch_clients)
+            results["microbatch"] = microbatch_results
+            print(f"-- micro-batching ({args.microbatch_clients} clients concurrents)")
+            for mode, stats in microbatch_results.items():
+                batch = f"  lot moyen {stats['mean_batch_size']:.1f}" if "mean_batch_size" in stats else ""
+                print(f"{mode:<28} {stats['rows_per_second']:>8.0f} req/s  p50 {stats['p50_us']:>8.1f} µs  "
+                      f"p99 {stats['p99_us']:>8.1f} µs{batch}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
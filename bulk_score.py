@@ -0,0 +1,545 @@
+import argparse
+import ast
+import csv
+import io
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import metrics
+from model_predictor import DiseasePredictor
+from model_store import ModelArtifactStore
+from prefork import freeze_shared_state
+
+# Fichiers de référence utilisés pour l'enrichissement (--enrich)
+REFERENCE_FILES = dict(
+    medications_path="data/medications.csv",
+    description_path="data/description.csv",
+    diets_path="data/diets.csv",
+    precautions_path="data/precautions_df.csv",
+    workout_path="data/workout_df.csv",
+)
+
+# Champs ajoutés à chaque résultat par --enrich
+ENRICHMENT_FIELDS = ["description", "medications", "precautions", "diets", "workout"]
+
+# Séparateurs d'une liste de symptômes écrite dans une seule colonne CSV
+_LIST_SEPARATORS = re.compile(r"[;,|]")
+
+# Prédicteur de chaque processus du pool (hérité du parent après un fork)
+_worker_predictor = None
+
+
+def build_predictor(options):
+    """Prédicteur du traitement par lots : moteur NumPy, modèle chargé depuis l'artefact versionné"""
+    return DiseasePredictor(
+        options["data_path"],
+        **(REFERENCE_FILES if options["enrich"] else {}),
+        model_path=options["model_path"],
+        inference_backend=options["backend"],
+        artifact_store=ModelArtifactStore(options["artifact_dir"]),
+        cache_size=options["cache_size"],
+        model_type=options["model_type"],
+    )
+
+
+def _init_worker(options):
+    global _worker_predictor
+    metrics.REGISTRY.enabled = False
+    if _worker_predictor is None:
+        _worker_predictor = build_predictor(options)
+
+
+def _parse_list(value):
+    """
+    Liste de symptômes d'une cellule CSV : liste JSON ou Python ("['a', 'b']"), ou texte
+    séparé par ; , ou |
+
+    Raises:
+        ValueError: si la liste entre crochets est illisible
+    """
+    if not isinstance(value, str):
+        return []
+    value = value.strip()
+    if value.startswith("["):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            raise ValueError(f"Liste de symptômes illisible: {value[:80]}") from None
+    return [part.strip() for part in _LIST_SEPARATORS.split(value) if part.strip()]
+
+
+def _symptom_list(value):
+    """
+    Liste de symptômes d'un enregistrement (texte ou liste JSON)
+
+    Raises:
+        ValueError: si ce n'est pas une liste de chaînes
+    """
+    if isinstance(value, str):
+        value = _parse_list(value)
+    if not isinstance(value, list) or not all(isinstance(symptom, str) for symptom in value):
+        raise ValueError(f"Les symptômes doivent être une liste de chaînes (reçu: {json.dumps(value)[:80]})")
+    return value
+
+
+def _csv_records(columns, lines):
+    """
+    Lecture ligne à ligne d'un bloc CSV, quand la lecture rapide par pandas a échoué
+
+    Yields:
+        (position, enregistrement {colonne: valeur} ou None, message d'erreur ou None) ;
+        un enregistrement mal formé est tout de même renvoyé pour en retrouver l'identifiant
+    """
+    for position, line in enumerate(lines):
+        try:
+            text = line.decode("utf-8")
+        except UnicodeDecodeError as e:
+            yield position, None, f"Encodage invalide: {e}"
+            continue
+        if not text.strip():
+            continue
+        fields = next(csv.reader([text]))
+        error = None
+        if len(fields) != len(columns):
+            error = f"{len(fields)} colonnes au lieu de {len(columns)}"
+        yield position, dict(zip(columns, fields)), error
+
+
+def _read_chunk(header, lines, options):
+    """
+    Analyse un bloc de lignes brutes (dans le processus du pool). Un enregistrement
+    illisible ne fait pas échouer le bloc : il est rapporté dans les erreurs.
+
+    Returns:
+        (position de chaque enregistrement valide dans le bloc, identifiants ou None,
+        listes de symptômes ou None, matrice ou None, erreurs [(position, identifiant, message)])
+    """
+    id_column = options["id_column"]
+    field = options["symptoms_field"]
+    positions, ids, symptom_lists, errors = [], [], [], []
+
+    if options["input_format"] == "jsonl":
+        for position, line in enumerate(lines):
+            if not line.strip():
+                continue
+            record_id = None
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("l'enregistrement n'est pas un objet JSON")
+                record_id = record.get(id_column) if id_column else None
+                symptoms = _symptom_list(record.get(field, []))
+            except ValueError as e:
+                errors.append((position, record_id, str(e)))
+                continue
+            positions.append(position)
+            ids.append(record_id)
+            symptom_lists.append(symptoms)
+        return positions, ids if id_column else None, symptom_lists, None, errors
+
+    columns = next(csv.reader([header.decode("utf-8")]))
+    try:
+        return _read_csv_chunk(columns, header, lines, options)
+    except ValueError:
+        pass
+
+    # Bloc invalide pour pandas (valeur non binaire, colonnes manquantes, encodage...) :
+    # relu ligne à ligne pour isoler les enregistrements fautifs
+    predictor = _worker_predictor
+    symptom_columns = [c for c in columns if c in predictor.symptom_positions]
+    rows = []
+    for position, record, error in _csv_records(columns, lines):
+        record_id = record.get(id_column) if id_column and record else None
+        try:
+            if error is not None:
+                raise ValueError(error)
+            if field in columns:
+                symptom_lists.append(_symptom_list(record[field]))
+            else:
+                invalid = [c for c in symptom_columns if not record[c].strip().isdigit()]
+                if invalid:
+                    raise ValueError(f"Valeur non entière dans la colonne {invalid[0]}: {record[invalid[0]]!r}")
+                rows.append([int(record[c]) != 0 for c in symptom_columns])
+        except ValueError as e:
+            errors.append((position, record_id, str(e)))
+            continue
+        positions.append(position)
+        ids.append(record_id)
+
+    matrix = None
+    if field not in columns:
+        symptom_lists = None
+        matrix = np.zeros((len(rows), len(predictor.all_symptoms)))
+        if rows:
+            matrix[:, [predictor.symptom_positions[c] for c in symptom_columns]] = rows
+    return positions, ids if id_column else None, symptom_lists, matrix, errors
+
+
+def _read_csv_chunk(columns, header, lines, options):
+    """
+    Lecture rapide d'un bloc CSV par pandas
+
+    Raises:
+        ValueError: si un enregistrement est invalide (le bloc est alors relu ligne à ligne)
+    """
+    predictor = _worker_predictor
+    id_column = options["id_column"]
+    field = options["symptoms_field"]
+    # pandas ignore les lignes vides : les positions ne seraient plus celles du bloc
+    if any(not line.strip() for line in lines):
+        raise ValueError("Ligne vide dans le bloc")
+
+    if field in columns:
+        frame = pd.read_csv(io.BytesIO(header + b"".join(lines)), dtype=str, keep_default_na=False,
+                            usecols=[c for c in columns if c in (field, id_column)])
+        ids = frame[id_column].tolist() if id_column else None
+        symptom_lists = [_symptom_list(value) for value in frame[field]]
+        return range(len(frame)), ids, symptom_lists, None, []
+
+    # Format large (une colonne 0/1 par symptôme, comme maladies_symptomes_binary.csv) :
+    # lu directement en uint8, sans normalisation, puis réordonné selon les colonnes du modèle
+    symptom_columns = [c for c in columns if c in predictor.symptom_positions]
+    dtypes = dict.fromkeys(symptom_columns, np.uint8)
+    if id_column:
+        dtypes[id_column] = str
+    frame = pd.read_csv(io.BytesIO(header + b"".join(lines)), dtype=dtypes, keep_default_na=False,
+                        usecols=symptom_columns + ([id_column] if id_column else []))
+    ids = frame[id_column].tolist() if id_column else None
+    matrix = np.zeros((len(frame), len(predictor.all_symptoms)))
+    matrix[:, [predictor.symptom_positions[c] for c in symptom_columns]] = frame[symptom_columns].to_numpy() != 0
+    return range(len(frame)), ids, None, matrix, []
+
+
+def _format_rows(rows, output_format):
+    if output_format == "jsonl":
+        return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow("; ".join(value) if isinstance(value, list) else value for value in row.values())
+    return buffer.getvalue()
+
+
+def score_chunk(first_row, header, lines, options):
+    """
+    Score un bloc de lignes (exécuté dans le pool : analyse, prédiction et mise en forme
+    sont réparties sur tous les cœurs). Chaque enregistrement invalide donne une ligne
+    de résultat avec son message d'erreur, à sa place dans l'ordre d'entrée.
+
+    Returns:
+        (texte à écrire, nombre d'enregistrements en erreur)
+    """
+    predictor = _worker_predictor
+    positions, ids, symptom_lists, matrix, errors = _read_chunk(header, lines, options)
+
+    if not len(positions):
+        results = []
+    elif options["enrich"]:
+        if symptom_lists is None:
+            symptom_lists = [[predictor.all_symptoms[i] for i in np.flatnonzero(row)] for row in matrix]
+        results = predictor.predict_batch(symptom_lists)
+    else:
+        if matrix is None:
+            matrix = predictor.vectorize(symptom_lists)
+        predictions, confidence_scores, precisions = predictor.score_matrix(matrix)
+        results = [{"disease": d, "score": s, "precision": p}
+                   for d, s, p in zip(predictions, confidence_scores, precisions)]
+
+    rows = []
+    for i, (position, result) in enumerate(zip(positions, results)):
+        row = {"row": first_row + position}
+        if ids is not None:
+            row["id"] = ids[i]
+        row["disease"] = result["disease"]
+        row["score"] = round(float(result["score"]), 6)
+        row["precision"] = round(float(result["precision"]), 4)
+        if options["enrich"]:
+            for field in ENRICHMENT_FIELDS:
+                row[field] = result[field]
+        if options["output_format"] == "csv":
+            row["error"] = ""
+        rows.append((position, row))
+
+    for position, record_id, message in errors:
+        row = {"row": first_row + position}
+        if options["id_column"]:
+            row["id"] = record_id
+        if options["output_format"] == "csv":
+            # Colonnes vides pour garder l'alignement du CSV
+            row.update((column, "") for column in _output_columns(options) if column not in row)
+        row["error"] = message
+        rows.append((position, row))
+
+    rows.sort(key=lambda item: item[0])
+    return _format_rows([row for _, row in rows], options["output_format"]), len(errors)
+
+
+def _output_columns(options):
+    columns = ["row"] + (["id"] if options["id_column"] else []) + ["disease", "score", "precision"]
+    columns += ENRICHMENT_FIELDS if options["enrich"] else []
+    # En JSONL, la clé "error" n'apparaît que sur les enregistrements invalides
+    return columns + ["error"]
+
+
+def read_chunks(input_file, chunk_size, input_format, start_offset=0):
+    """
+    Lit le fichier par blocs de `chunk_size` lignes brutes (mémoire constante quelle que
+    soit la taille du fichier). Les champs CSV ne doivent pas contenir de retours à la ligne.
+
+    Yields:
+        (en-tête, lignes, position en octets après le bloc)
+    """
+    header = b""
+    if input_format == "csv":
+        header = input_file.readline()
+    if start_offset:
+        input_file.seek(start_offset)
+    offset = input_file.tell()
+    while True:
+        lines = []
+        for line in input_file:
+            lines.append(line)
+            offset += len(line)
+            if len(lines) >= chunk_size:
+                break
+        if not lines:
+            return
+        yield header, lines, offset
+
+
+# Options qui déterminent le contenu de la sortie : une reprise doit utiliser les mêmes
+# (cache_size n'influe que sur la vitesse)
+RESULT_OPTIONS = ("data_path", "model_path", "model_type", "artifact_dir", "backend", "enrich",
+                  "input_format", "output_format", "symptoms_field", "id_column")
+
+
+class Checkpoint:
+    """
+    Avancement enregistré après chaque bloc écrit : lignes traitées (dont celles en
+    erreur), position dans le fichier d'entrée et taille du fichier de sortie. Une reprise tronque la sortie à cette
+    taille (supprime un bloc à moitié écrit) et relit l'entrée à partir de cette position.
+
+    Le point de reprise mémorise aussi le fichier d'entrée (chemin, taille, date de
+    modification) et les options du lancement : une reprise avec un autre fichier ou
+    d'autres options mélangerait des résultats incompatibles dans la même sortie.
+    """
+
+    def __init__(self, path, input_path, options):
+        self.path = path
+        stat = os.stat(input_path)
+        self.run = {
+            "input_path": os.path.abspath(input_path),
+            "input_size": stat.st_size,
+            "input_mtime_ns": stat.st_mtime_ns,
+            "options": {name: options.get(name) for name in RESULT_OPTIONS},
+        }
+        self.rows = 0
+        self.errors = 0
+        self.input_offset = 0
+        self.output_bytes = 0
+
+    def load(self):
+        """
+        Charge l'avancement enregistré
+
+        Returns:
+            True si un point de reprise a été chargé, False s'il n'y en a pas
+
+        Raises:
+            ValueError: si le point de reprise concerne un autre fichier d'entrée, un
+                fichier modifié depuis ou d'autres options
+        """
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        differences = self._differences(state)
+        if differences:
+            raise ValueError(f"Reprise impossible, le lancement diffère du point de reprise {self.path} : "
+                             + ", ".join(differences))
+        self.rows = state["rows"]
+        self.errors = state.get("errors", 0)
+        self.input_offset = state["input_offset"]
+        self.output_bytes = state["output_bytes"]
+        return True
+
+    def _differences(self, state):
+        """Décrit chaque valeur du lancement qui ne correspond pas au point de reprise"""
+        differences = [f"{name} ({state.get(name)!r} -> {value!r})"
+                       for name, value in self.run.items()
+                       if name != "options" and state.get(name) != value]
+        saved_options = state.get("options") or {}
+        differences += [f"{name} ({saved_options.get(name)!r} -> {value!r})"
+                        for name, value in self.run["options"].items()
+                        if saved_options.get(name) != value]
+        return differences
+
+    def save(self, rows, errors, input_offset, output_bytes):
+        self.rows, self.errors, self.input_offset, self.output_bytes = rows, errors, input_offset, output_bytes
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w") as f:
+            json.dump({**self.run, "rows": rows, "errors": errors,
+                       "input_offset": input_offset, "output_bytes": output_bytes}, f)
+        os.replace(temporary_path, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _detect_format(path, requested):
+    if requested:
+        return requested
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def run(input_path, output_path, options, chunk_size=10000, workers=None, resume=False,
+        progress_interval=5.0):
+    """
+    Score tout le fichier d'entrée et écrit les résultats dans l'ordre des lignes
+
+    Returns:
+        Statistiques {rows, errors, seconds, rows_per_second, resumed_from} ; les
+        enregistrements invalides sont comptés dans errors et signalés dans la sortie
+
+    Raises:
+        ValueError: si resume est demandé avec un autre fichier d'entrée ou d'autres options
+    """
+    checkpoint = Checkpoint(output_path + ".checkpoint", input_path, options)
+    resumed = resume and checkpoint.load() and os.path.exists(output_path)
+    if not resumed:
+        checkpoint.rows = checkpoint.errors = checkpoint.input_offset = checkpoint.output_bytes = 0
+    resumed_from = checkpoint.rows
+
+    global _worker_predictor
+    _worker_predictor = build_predictor(options)
+    workers = workers or os.cpu_count()
+    # Le prédicteur est construit avant le fork : les processus du pool le partagent
+    freeze_shared_state()
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(options,)) if workers > 1 else None
+
+    start = time.perf_counter()
+    last_report = start
+    rows_done = checkpoint.rows
+    errors = checkpoint.errors
+    with open(input_path, "rb") as input_file, open(output_path, "r+b" if resumed else "wb") as output_file:
+        if resumed:
+            output_file.truncate(checkpoint.output_bytes)
+            output_file.seek(checkpoint.output_bytes)
+            print(f"↩️ Reprise à la ligne {checkpoint.rows}")
+        elif options["output_format"] == "csv":
+            columns = _output_columns(options)
+            output_file.write(_format_rows([dict(zip(columns, columns))], "csv").encode("utf-8"))
+
+        def write(scored, input_offset, rows_after):
+            nonlocal rows_done, errors, last_report
+            text, chunk_errors = scored
+            output_file.write(text.encode("utf-8"))
+            output_file.flush()
+            rows_done = rows_after
+            errors += chunk_errors
+            checkpoint.save(rows_done, errors, input_offset, output_file.tell())
+            now = time.perf_counter()
+            if now - last_report >= progress_interval:
+                last_report = now
+                rate = (rows_done - resumed_from) / (now - start)
+                print(f"… {rows_done} lignes ({rate:.0f} lignes/s)", file=sys.stderr)
+
+        # Blocs en vol bornés : la mémoire reste constante et l'écriture suit l'ordre d'entrée
+        pending = deque()
+        next_row = checkpoint.rows
+        try:
+            for header, lines, input_offset in read_chunks(input_file, chunk_size, options["input_format"],
+                                                           checkpoint.input_offset):
+                first_row, next_row = next_row, next_row + len(lines)
+                if pool is None:
+                    write(score_chunk(first_row, header, lines, options), input_offset, next_row)
+                    continue
+                pending.append((pool.submit(score_chunk, first_row, header, lines, options), input_offset, next_row))
+                while len(pending) > 2 * workers or (pending and pending[0][0].done()):
+                    future, offset, rows_after = pending.popleft()
+                    write(future.result(), offset, rows_after)
+            while pending:
+                future, offset, rows_after = pending.popleft()
+                write(future.result(), offset, rows_after)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    checkpoint.remove()
+    seconds = time.perf_counter() - start
+    scored = rows_done - resumed_from
+    return {
+        "rows": rows_done,
+        "errors": errors,
+        "seconds": seconds,
+        "rows_per_second": scored / seconds if seconds > 0 else 0.0,
+        "resumed_from": resumed_from,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Prédiction par lots sur un fichier de patients (CSV ou JSONL), en flux et en parallèle")
+    parser.add_argument("input", help="CSV (colonne de symptômes ou une colonne 0/1 par symptôme) ou JSONL")
+    parser.add_argument("output", help="Fichier de résultats (.csv ou .jsonl)")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="Par défaut selon l'extension")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="Par défaut selon l'extension")
+    parser.add_argument("--symptoms-field", default="symptoms",
+                        help="Colonne CSV ou clé JSONL contenant la liste des symptômes")
+    parser.add_argument("--id-column", help="Colonne ou clé recopiée dans les résultats")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=None, help="Processus (par défaut : tous les cœurs)")
+    parser.add_argument("--enrich", action="store_true",
+                        help="Ajouter description, médicaments, précautions, régimes et exercices")
+    parser.add_argument("--resume", action="store_true", help="Reprendre après une interruption")
+    parser.add_argument("--data", default=os.environ.get("DISEASE_DATA_PATH", "data/maladies_symptomes_binary.csv"))
+    parser.add_argument("--model-path", default=os.environ.get("MODEL_PATH"))
+    parser.add_argument("--model-type", default=os.environ.get("MODEL_TYPE", "random_forest"))
+    parser.add_argument("--artifact-dir", default=os.environ.get("MODEL_ARTIFACT_DIR", "models"))
+    parser.add_argument("--backend", choices=["sklearn", "numpy"], default="numpy")
+    parser.add_argument("--cache-size", type=int, default=65536,
+                        help="Cache des prédictions par processus (les exports contiennent beaucoup de doublons)")
+    args = parser.parse_args()
+
+    metrics.REGISTRY.enabled = False
+    options = {
+        "data_path": args.data,
+        "model_path": args.model_path,
+        "model_type": args.model_type,
+        "artifact_dir": args.artifact_dir,
+        "backend": args.backend,
+        "cache_size": args.cache_size,
+        "enrich": args.enrich,
+        "input_format": _detect_format(args.input, args.input_format),
+        "output_format": _detect_format(args.output, args.output_format),
+        "symptoms_field": args.symptoms_field,
+        "id_column": args.id_column,
+    }
+    try:
+        stats = run(args.input, args.output, options, chunk_size=args.chunk_size,
+                    workers=args.workers, resume=args.resume)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    print(f"✅ {stats['rows']} lignes traitées, résultats dans {args.output} en {stats['seconds']:.1f} s "
+          f"({stats['rows_per_second']:.0f} lignes/s)")
+    if stats["errors"]:
+        print(f"⚠️ {stats['errors']} enregistrements invalides, signalés par le champ error de {args.output}")
+
+
+if __name__ == "__main__":
+    main()
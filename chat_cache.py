@@ -0,0 +1,165 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_message(message):
+    """
+    Forme normalisée d'un message pour le cache : casse, espaces et accents ignorés
+    ("Qu'est-ce que la  FIÈVRE ?" et "qu'est-ce que la fievre ?" donnent la même clé)
+    """
+    decomposed = unicodedata.normalize("NFKD", message.casefold())
+    without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(without_accents.split())
+
+
+def cache_key(message, system_instruction):
+    """Clé de cache : message normalisé + instruction système"""
+    payload = normalize_message(message) + "\0" + system_instruction
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryCacheBackend:
+    """Cache en mémoire du processus, borné en taille (LRU) et en durée de vie (TTL)"""
+
+    def __init__(self, max_size=1024, ttl=3600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCacheBackend:
+    """
+    Cache SQLite sur disque, partagé par tous les workers d'une même machine.
+    Les entrées expirées et les plus anciennes au-delà de max_size sont supprimées
+    à l'écriture.
+    """
+
+    def __init__(self, path, max_size=10000, ttl=3600.0):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+
+    def _connection(self):
+        """
+        Une connexion par thread (les connexions SQLite ne se partagent pas entre threads),
+        rouverte après un fork : un worker ne réutilise jamais celle du processus maître
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value FROM responses WHERE key = ? AND expires_at >= ?", (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        with conn:
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def set(self, key, value):
+        now = time.time()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl, now),
+            )
+            conn.execute("DELETE FROM responses WHERE expires_at < ?", (now,))
+            conn.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_size,),
+            )
+
+    def clear(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class CachedChatSource:
+    """
+    Source de chat avec cache : une question déjà posée est servie depuis le cache,
+    sinon la réponse de la source est transmise au fil de l'eau puis mémorisée si la
+    génération s'est terminée sans erreur.
+    """
+
+    def __init__(self, source, backend):
+        self.source = source
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, user_input, system_instruction):
+        key = cache_key(user_input, system_instruction)
+        cached = self.backend.get(key)
+        if cached is not None:
+            with self._lock:
+                self.hits += 1
+            yield cached
+            return
+
+        with self._lock:
+            self.misses += 1
+        chunks = []
+        for chunk in self.source(user_input, system_instruction):
+            chunks.append(chunk)
+            yield chunk
+        if chunks:
+            self.backend.set(key, "".join(chunks))
+
+    def stats(self):
+        """Compteurs du cache"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.backend)}
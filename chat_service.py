@@ -0,0 +1,338 @@
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+import metrics
+from google import genai
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+# Modèle Gemini utilisé par l'assistant
+MODEL_NAME = "gemini-1.5-flash"
+
+# Instruction système par défaut de l'assistant santé
+SYSTEM_INSTRUCTION = """Tu es un assistant santé bienveillant."""
+
+
+class ChatBackendBusy(Exception):
+    """Levée quand aucune place ne se libère dans le délai d'attente"""
+
+
+class ChatUnavailable(Exception):
+    """Levée quand l'assistant n'est pas configuré (le message est montré tel quel)"""
+
+
+class GeminiTransport:
+    """
+    Transport Gemini : le client (et son pool de connexions) et les configurations de
+    génération sont construits une seule fois puis réutilisés pour tous les messages.
+    """
+
+    def __init__(self, api_key=None, model_name=MODEL_NAME, timeout=30.0):
+        self.api_key = api_key
+        self.model_name = model_name
+        self.timeout = timeout
+        self._client = None
+        self._configs = {}
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        """Crée le client Gemini au premier appel (la clé peut être chargée après l'import)"""
+        with self._lock:
+            if self._client is None:
+                api_key = self.api_key or os.environ.get("GEMINI_API_KEY")
+                if not api_key:
+                    return None
+                self._client = genai.Client(
+                    api_key=api_key,
+                    http_options=types.HttpOptions(timeout=int(self.timeout * 1000)),
+                )
+            return self._client
+
+    def _get_config(self, system_instruction):
+        """Configuration de génération mise en cache par instruction système"""
+        config = self._configs.get(system_instruction)
+        if config is None:
+            config = types.GenerateContentConfig(
+                safety_settings=[
+                    types.SafetySetting(category="HARM_CATEGORY_HARASSMENT", threshold="BLOCK_ONLY_HIGH"),
+                    types.SafetySetting(category="HARM_CATEGORY_HATE_SPEECH", threshold="BLOCK_ONLY_HIGH"),
+                    types.SafetySetting(category="HARM_CATEGORY_SEXUALLY_EXPLICIT", threshold="BLOCK_ONLY_HIGH"),
+                    types.SafetySetting(category="HARM_CATEGORY_DANGEROUS_CONTENT", threshold="BLOCK_ONLY_HIGH"),
+                ],
+                response_mime_type="text/plain",
+                system_instruction=[
+                    types.Part.from_text(text=system_instruction),
+                ],
+            )
+            self._configs[system_instruction] = config
+        return config
+
+    def __call__(self, user_input, system_instruction=SYSTEM_INSTRUCTION):
+        """
+        Renvoie les fragments de la réponse Gemini au fur et à mesure
+
+        Args:
+            user_input: Message de l'utilisateur
+            system_instruction: Instruction système de l'assistant
+
+        Yields:
+            Fragments de texte de la réponse
+        """
+        # Vérification de la clé API
+        client = self._get_client()
+        if client is None:
+            raise ChatUnavailable("Erreur: Clé API Gemini non configurée.")
+
+        contents = [
+            types.Content(
+                role="user",
+                parts=[types.Part.from_text(text=user_input)],
+            ),
+        ]
+
+        for chunk in client.models.generate_content_stream(
+            model=self.model_name,
+            contents=contents,
+            config=self._get_config(system_instruction),
+        ):
+            if chunk.text:
+                yield chunk.text
+
+
+class StubUpstreamError(Exception):
+    """Erreur simulée par StubTransport"""
+    pass
+
+
+class StubTransport:
+    """
+    Remplaçant local de Gemini pour les tests de charge (voir load_test.py) : délai avant
+    le premier fragment, délai entre fragments et taux d'erreur configurables, sans
+    appel réseau ni clé API.
+    """
+
+    def __init__(self, latency=0.5, chunk_delay=0.05, chunks=8, error_rate=0.0, seed=None):
+        """
+        Args:
+            latency: Délai (en secondes) avant le premier fragment
+            chunk_delay: Délai entre deux fragments
+            chunks: Nombre de fragments par réponse
+            error_rate: Proportion des appels qui échouent (StubUpstreamError)
+            seed: Graine du tirage des erreurs (reproductibilité)
+        """
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.chunks = chunks
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            latency=float(os.environ.get("CHAT_STUB_LATENCY", "0.5")),
+            chunk_delay=float(os.environ.get("CHAT_STUB_CHUNK_DELAY", "0.05")),
+            chunks=int(os.environ.get("CHAT_STUB_CHUNKS", "8")),
+            error_rate=float(os.environ.get("CHAT_STUB_ERROR_RATE", "0")),
+            seed=os.environ.get("CHAT_STUB_SEED"),
+        )
+
+    def __call__(self, user_input, system_instruction=SYSTEM_INSTRUCTION):
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+        time.sleep(self.latency)
+        if failed:
+            raise StubUpstreamError("Erreur simulée du service amont")
+        for i in range(self.chunks):
+            if i:
+                time.sleep(self.chunk_delay)
+            yield f"Fragment {i + 1}/{self.chunks} de la réponse à « {user_input[:40]} ». "
+
+
+class ChatBackend:
+    """
+    Couche d'accès au modèle de chat : limite le nombre d'appels simultanés vers le
+    service amont (sémaphore), applique un délai maximal par requête et mesure
+    l'attente en file.
+
+    Le transport est n'importe quel appelable (message, instruction) -> fragments de
+    texte : GeminiTransport en production, un faux générateur local dans les tests.
+    """
+
+    def __init__(self, transport, max_concurrency=8, queue_timeout=5.0, request_timeout=60.0):
+        self.transport = transport
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.request_timeout = request_timeout
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.requests = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+
+    def _record(self, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def __call__(self, user_input, system_instruction=SYSTEM_INSTRUCTION):
+        """Renvoie les fragments de la réponse en respectant la limite de concurrence"""
+        start = time.perf_counter()
+        acquired = self._semaphore.acquire(timeout=self.queue_timeout)
+        waited = time.perf_counter() - start
+        with self._lock:
+            self.requests += 1
+            self.queue_wait_total += waited
+            self.queue_wait_max = max(self.queue_wait_max, waited)
+        metrics.observe("chat_queue_wait_seconds", waited)
+        if not acquired:
+            self._record(rejected=1)
+            metrics.inc("chat_upstream_errors_total", kind="rejected")
+            raise ChatBackendBusy("Trop de requêtes en cours vers l'assistant, veuillez réessayer")
+
+        # Le transport est lu dans un thread : le délai maximal s'applique même si le
+        # service amont se bloque avant le premier fragment ou entre deux fragments
+        chunks = queue.Queue()
+        abandoned = threading.Event()
+        self._record(in_flight=1)
+        threading.Thread(target=self._pump, args=(user_input, system_instruction, chunks, abandoned),
+                         name="chat-upstream", daemon=True).start()
+
+        upstream_start = time.perf_counter()
+        deadline = time.monotonic() + self.request_timeout
+        first_chunk = True
+        try:
+            while True:
+                try:
+                    kind, value = chunks.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    self._record(timeouts=1)
+                    metrics.inc("chat_upstream_errors_total", kind="timeout")
+                    raise TimeoutError(f"Délai de {self.request_timeout:g} s dépassé") from None
+                if kind == "end":
+                    return
+                if kind == "error":
+                    if not isinstance(value, ChatUnavailable):
+                        self._record(errors=1)
+                        metrics.inc("chat_upstream_errors_total", kind="error")
+                    raise value
+                if first_chunk:
+                    metrics.observe("chat_first_chunk_seconds", time.perf_counter() - upstream_start)
+                    first_chunk = False
+                yield value
+        finally:
+            # Délai dépassé ou client déconnecté (fermeture du générateur) : le thread
+            # arrête de lire le service amont au prochain fragment
+            abandoned.set()
+
+    def _pump(self, user_input, system_instruction, chunks, abandoned):
+        """
+        Lit le transport et transmet ses fragments. La place dans la limite de concurrence
+        n'est rendue qu'à la fin de l'appel amont, même si l'appelant a abandonné avant.
+        """
+        upstream_start = time.perf_counter()
+        stream = None
+        try:
+            stream = self.transport(user_input, system_instruction)
+            for chunk in stream:
+                if abandoned.is_set():
+                    break
+                chunks.put(("chunk", chunk))
+            chunks.put(("end", None))
+        except Exception as e:
+            chunks.put(("error", e))
+        finally:
+            if hasattr(stream, "close"):
+                stream.close()
+            metrics.observe("chat_upstream_seconds", time.perf_counter() - upstream_start)
+            self._record(in_flight=-1)
+            self._semaphore.release()
+
+    def stats(self):
+        """Compteurs de la couche de chat"""
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "max_concurrency": self.max_concurrency,
+                "requests": self.requests,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+                "queue_wait_total": self.queue_wait_total,
+                "queue_wait_max": self.queue_wait_max,
+            }
+
+
+_default_backend = None
+_default_backend_lock = threading.Lock()
+
+
+def get_default_backend():
+    """
+    Backend Gemini partagé par tout le processus, configuré par variables d'environnement
+    (CHAT_BACKEND=stub : StubTransport local, pour les tests de charge)
+    """
+    global _default_backend
+    with _default_backend_lock:
+        if _default_backend is None:
+            if os.environ.get("CHAT_BACKEND", "gemini") == "stub":
+                transport = StubTransport.from_env()
+            else:
+                transport = GeminiTransport(timeout=float(os.environ.get("CHAT_REQUEST_TIMEOUT", "60")))
+            _default_backend = ChatBackend(
+                transport,
+                max_concurrency=int(os.environ.get("CHAT_MAX_CONCURRENCY", "8")),
+                queue_timeout=float(os.environ.get("CHAT_QUEUE_TIMEOUT", "5")),
+                request_timeout=float(os.environ.get("CHAT_REQUEST_TIMEOUT", "60")),
+            )
+        return _default_backend
+
+
+def stream_response(user_input, system_instruction=SYSTEM_INSTRUCTION, source=None):
+    """
+    Transmet les fragments de la source dès leur arrivée. Une erreur de la source
+    est convertie en un dernier fragment de message d'erreur.
+
+    Args:
+        user_input: Message de l'utilisateur
+        system_instruction: Instruction système de l'assistant
+        source: Générateur de texte (backend Gemini partagé par défaut, remplaçable par un
+            faux générateur local)
+    """
+    if source is None:
+        source = get_default_backend()
+    try:
+        for chunk in source(user_input, system_instruction):
+            if chunk:
+                yield chunk
+    except ChatUnavailable as e:
+        yield str(e)
+    except Exception as e:
+        logger.error(f"Erreur lors de la génération de réponse: {str(e)}")
+        yield f"Désolé, je n'ai pas pu traiter votre demande: {str(e)}"
+
+
+def generate_response(user_input, system_instruction=SYSTEM_INSTRUCTION, source=None):
+    """Génère la réponse complète (mode non streaming)"""
+    return "".join(stream_response(user_input, system_instruction, source))
+
+
+def sse_events(chunks):
+    """
+    Formate des fragments de texte en événements Server-Sent Events.
+    Chaque fragment est encodé en JSON (les retours à la ligne restent intacts),
+    puis un événement "done" signale la fin de la réponse.
+    """
+    for chunk in chunks:
+        yield f"data: {json.dumps({'text': chunk}, ensure_ascii=False)}\n\n"
+    yield "event: done\ndata: {}\n\n"
@@ -0,0 +1,197 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _entropy(probabilities, axis=0):
+    """Entropie (en bits) de distributions, nulle pour les probabilités nulles"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(probabilities > 0, probabilities * np.log2(probabilities), 0.0)
+    return -terms.sum(axis=axis)
+
+
+class DiagnosisSession:
+    """
+    Diagnostic interactif d'un patient : symptômes présents, symptômes écartés et
+    log-vraisemblance de chaque maladie, mise à jour en O(maladies) à chaque réponse
+    (ajout ou retrait d'une colonne de SymptomStatistics) au lieu d'un recalcul complet.
+    """
+
+    # Maladies les plus probables sur lesquelles est évalué le gain des questions suivantes
+    CANDIDATE_DISEASES = 32
+
+    def __init__(self, session_id, statistics):
+        self.session_id = session_id
+        self.lock = threading.Lock()
+        self.created_at = self.last_access = time.monotonic()
+        self.present = []
+        self.absent = []
+        self._bind(statistics)
+
+    def _bind(self, statistics):
+        """Recalcule les scores pour un nouveau jeu de statistiques (après un rechargement)"""
+        self.statistics = statistics
+        self.present = [s for s in self.present if s in statistics.positions]
+        self.absent = [s for s in self.absent if s in statistics.positions]
+        self.log_scores = statistics.log_prior.copy()
+        for symptom in self.present:
+            self.log_scores += statistics.log_present[:, statistics.positions[symptom]]
+        for symptom in self.absent:
+            self.log_scores += statistics.log_absent[:, statistics.positions[symptom]]
+
+    def rebind(self, statistics):
+        if statistics is not self.statistics:
+            self._bind(statistics)
+
+    def _retract(self, symptom):
+        column = self.statistics.positions[symptom]
+        if symptom in self.present:
+            self.present.remove(symptom)
+            self.log_scores -= self.statistics.log_present[:, column]
+        elif symptom in self.absent:
+            self.absent.remove(symptom)
+            self.log_scores -= self.statistics.log_absent[:, column]
+
+    def add(self, symptom):
+        """Le patient présente le symptôme"""
+        if symptom in self.present:
+            return
+        self._retract(symptom)
+        self.present.append(symptom)
+        self.log_scores += self.statistics.log_present[:, self.statistics.positions[symptom]]
+
+    def exclude(self, symptom):
+        """Le patient ne présente pas le symptôme (il ne sera plus proposé)"""
+        if symptom in self.absent:
+            return
+        self._retract(symptom)
+        self.absent.append(symptom)
+        self.log_scores += self.statistics.log_absent[:, self.statistics.positions[symptom]]
+
+    def remove(self, symptom):
+        """Oublie la réponse donnée pour le symptôme"""
+        self._retract(symptom)
+
+    def probabilities(self):
+        """Probabilité a posteriori de chaque maladie (ordre de statistics.diseases)"""
+        scores = np.exp(self.log_scores - self.log_scores.max())
+        return scores / scores.sum()
+
+    def differential(self, probabilities, limit=5):
+        """Les `limit` maladies les plus probables : [{disease, probability}]"""
+        top = np.argsort(probabilities)[::-1][:limit]
+        return [{"disease": self.statistics.diseases[i], "probability": float(probabilities[i])} for i in top]
+
+    def next_symptoms(self, probabilities, limit=5):
+        """
+        Classe les symptômes non encore renseignés par gain d'information attendu : de
+        combien la réponse (oui/non) réduirait en moyenne l'entropie du diagnostic, calculé
+        sur les CANDIDATE_DISEASES maladies les plus probables.
+
+        Returns:
+            Liste de {symptom, probability, information_gain}, probability étant la
+            probabilité que le patient présente le symptôme
+        """
+        statistics = self.statistics
+        candidates = np.argsort(probabilities)[::-1][:self.CANDIDATE_DISEASES]
+        prior = probabilities[candidates] / probabilities[candidates].sum()
+        frequencies = statistics.frequencies[candidates]
+
+        # Distribution des maladies selon la réponse, pour tous les symptômes à la fois
+        joint_yes = prior[:, None] * frequencies
+        joint_no = prior[:, None] - joint_yes
+        p_yes = joint_yes.sum(axis=0)
+        p_no = 1.0 - p_yes
+        expected_entropy = (p_yes * _entropy(joint_yes / p_yes, axis=0)
+                            + p_no * _entropy(joint_no / p_no, axis=0))
+        gains = _entropy(prior) - expected_entropy
+
+        known = [statistics.positions[s] for s in self.present + self.absent]
+        gains[known] = -np.inf
+        limit = min(limit, len(gains) - len(known))
+        if limit <= 0:
+            return []
+        top = np.argpartition(gains, -limit)[-limit:]
+        top = top[np.argsort(gains[top])[::-1]]
+        return [{"symptom": statistics.symptoms[i], "probability": float(p_yes[i]),
+                 "information_gain": float(gains[i])} for i in top]
+
+    def state(self, differential_size=5, questions=5):
+        """Représentation JSON de la session"""
+        probabilities = self.probabilities()
+        return {
+            "session_id": self.session_id,
+            "symptoms": list(self.present),
+            "absent": list(self.absent),
+            "differential": self.differential(probabilities, differential_size),
+            "next_symptoms": self.next_symptoms(probabilities, questions),
+        }
+
+
+class SessionStore:
+    """
+    Sessions de diagnostic en mémoire du processus, bornées en nombre (la moins récemment
+    utilisée est évincée) et expirées après `idle_timeout` secondes sans activité.
+
+    Les sessions ne sont pas partagées entre workers : en pré-fork, le répartiteur de
+    charge doit renvoyer un patient vers le même worker (ou il recrée sa session).
+    """
+
+    def __init__(self, max_sessions=10000, idle_timeout=1800.0):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expire(self, now):
+        """Supprime les sessions inactives (les plus anciennes sont en tête)"""
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_access <= self.idle_timeout:
+                break
+            self._sessions.popitem(last=False)
+            self.expirations += 1
+
+    def create(self, statistics):
+        session = DiagnosisSession(secrets.token_urlsafe(16), statistics)
+        with self._lock:
+            self._expire(session.created_at)
+            self._sessions[session.session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+            self.created += 1
+        return session
+
+    def get(self, session_id):
+        """Retourne la session (et la marque comme active) ou None si inconnue ou expirée"""
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            session.last_access = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def stats(self):
+        return {
+            "active": len(self._sessions),
+            "created": self.created,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
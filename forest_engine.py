@@ -0,0 +1,117 @@
+import numpy as np
+
+
+class FlatForest:
+    """
+    Moteur d'inférence NumPy pour un RandomForestClassifier entraîné.
+
+    Tous les arbres sont aplatis dans des tableaux contigus (feature, seuil, enfants,
+    distributions des feuilles). Les probabilités et la classe prédite sont calculées
+    en un seul parcours, sans la validation d'entrée de sklearn, et reproduisent
+    exactement predict_proba / predict du modèle d'origine.
+    """
+
+    # Mémoire maximale des distributions de feuilles rassemblées pour un bloc de lignes
+    GATHER_BYTES = 32 * 1024 * 1024
+
+    # Fréquence (en niveaux) du test d'arrêt anticipé
+    LEAF_CHECK_INTERVAL = 8
+
+    def __init__(self, feature, threshold, children, leaf_rows, leaf_values, roots, max_depth, classes):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.leaf_rows = leaf_rows
+        self.leaf_values = leaf_values
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes_ = classes
+        self.n_trees = len(roots)
+        self.is_leaf = children[:, 0] == np.arange(len(children))
+        self._flat_children = children.ravel()
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """Compile un RandomForestClassifier (mono-sortie) en tableaux NumPy"""
+        features, thresholds, children, leaf_rows, values, roots = [], [], [], [], [], []
+        offset = 0
+        leaf_offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes, dtype=np.intp)
+            is_leaf = tree.children_left == -1
+
+            # Les feuilles pointent sur elles-mêmes : la boucle de parcours reste uniforme
+            # (seuil infini, donc toujours à gauche)
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+            feature = np.where(is_leaf, 0, tree.feature)
+            threshold = np.where(is_leaf, np.inf, tree.threshold)
+
+            # Distributions stockées pour les feuilles seulement (la moitié des nœuds) :
+            # leaf_rows donne, pour chaque feuille, sa ligne dans leaf_values
+            n_leaves = int(is_leaf.sum())
+            rows = np.full(n_nodes, -1, dtype=np.intp)
+            rows[is_leaf] = np.arange(leaf_offset, leaf_offset + n_leaves)
+
+            # Même normalisation que DecisionTreeClassifier.predict_proba
+            value = np.array(tree.value[is_leaf, 0, :], dtype=np.float64)
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            value /= normalizer
+
+            features.append(feature)
+            thresholds.append(threshold)
+            children.append(np.column_stack([left, right]))
+            leaf_rows.append(rows)
+            values.append(value)
+            roots.append(offset)
+            offset += n_nodes
+            leaf_offset += n_leaves
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            children=np.ascontiguousarray(np.concatenate(children), dtype=np.intp),
+            leaf_rows=np.concatenate(leaf_rows),
+            leaf_values=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            classes=forest.classes_,
+        )
+
+    def _leaves(self, X):
+        """Retourne l'indice de la feuille atteinte dans chaque arbre, forme (n, n_arbres)"""
+        # Indexation à plat de X : plus rapide que X[lignes, colonnes]
+        flat_X = X.ravel()
+        row_offsets = (np.arange(X.shape[0]) * X.shape[1])[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+        for depth in range(1, self.max_depth + 1):
+            # children[2 * n] = gauche (x <= seuil), children[2 * n + 1] = droite
+            go_right = flat_X[row_offsets + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self._flat_children[2 * nodes + go_right]
+            # Arrêt anticipé : la plupart des chemins sont bien plus courts que max_depth
+            if depth % self.LEAF_CHECK_INTERVAL == 0 and self.is_leaf[nodes].all():
+                break
+        return nodes
+
+    def predict_proba(self, X):
+        """Probabilités moyennes des arbres, identiques à sklearn"""
+        # sklearn compare des valeurs float32 aux seuils float64
+        X = np.asarray(X, dtype=np.float32)
+        proba = np.empty((X.shape[0], len(self.classes_)))
+        chunk_size = max(1, self.GATHER_BYTES // (self.n_trees * len(self.classes_) * 8))
+        for start in range(0, X.shape[0], chunk_size):
+            chunk = X[start:start + chunk_size]
+            leaf_values = self.leaf_values[self.leaf_rows[self._leaves(chunk)]]
+            # Somme séquentielle arbre par arbre, comme l'accumulation de sklearn
+            proba[start:start + len(chunk)] = np.add.reduce(leaf_values, axis=1)
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        """Classe la plus probable pour chaque ligne"""
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1))
@@ -0,0 +1,51 @@
+# Configuration de production : gunicorn -c gunicorn.conf.py "wsgi:create_app()"
+import multiprocessing
+import os
+import signal
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+
+# Application chargée une seule fois dans le maître, partagée copy-on-write par les workers
+preload_app = True
+
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+# Threads par worker : le streaming du chat (/chat/stream) occupe un thread pendant
+# toute la réponse, un worker synchrone serait bloqué
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+worker_class = "gthread" if threads > 1 else "sync"
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+
+# Redémarrage périodique des workers (0 = jamais) : un nouveau worker repart de l'état
+# partagé du maître, la mémoire privée accumulée (caches) est rendue
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+
+
+def when_ready(server):
+    from prefork import format_memory, process_memory
+    server.log.info("Maître prêt (pid %s): %s", os.getpid(), format_memory(process_memory()))
+
+    # Surveillance des fichiers dans le maître : un changement déclenche le même
+    # rechargement que kill -HUP (voir on_reload)
+    from app import start_file_watcher
+    start_file_watcher(on_change=lambda: os.kill(os.getpid(), signal.SIGHUP))
+
+
+def on_reload(server):
+    # SIGHUP (kill -HUP, POST /admin/reload ou surveillance des fichiers) : le maître
+    # reconstruit le prédicteur avant de lancer les nouveaux workers, qui partagent donc
+    # le nouvel état copy-on-write ; les anciens workers terminent leurs requêtes puis
+    # s'arrêtent. En cas d'échec, les nouveaux workers repartent de l'ancien état.
+    # Comme pour max_requests, l'état propre aux workers (sessions de diagnostic,
+    # caches en mémoire) est perdu.
+    from app import reloader
+    from prefork import freeze_shared_state
+    reloader.reload(reason="sighup")
+    freeze_shared_state()
+
+
+def post_worker_init(worker):
+    from prefork import format_memory, process_memory
+    worker.log.info("Worker %s prêt: %s", worker.pid, format_memory(process_memory()))
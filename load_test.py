@@ -0,0 +1,455 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from prefork import format_memory, process_memory
+
+# Répartition par défaut du trafic : {type de requête: poids}
+DEFAULT_MIX = {"index": 30, "predict": 40, "chat": 15, "chat_stream": 15}
+
+# Début des réponses de chat qui signalent une erreur amont (voir chat_service.stream_response)
+CHAT_ERROR_PREFIXES = ("Désolé", "Erreur")
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def _parse_mix(text):
+    """Convertit "index=30,predict=40,..." en {type: poids}"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX and name != "api_predict":
+            raise argparse.ArgumentTypeError(f"Type de requête inconnu: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+def _parse_env(values):
+    return dict(value.split("=", 1) for value in values)
+
+
+# ---- Serveur testé ----
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(server, port, workers, threads, env, log_path):
+    """
+    Démarre l'application comme en production (gunicorn, pré-fork) ou avec le serveur
+    de développement Flask multi-thread, avec le chat servi par StubTransport
+    """
+    bind = f"127.0.0.1:{port}"
+    server_env = dict(os.environ, BIND=bind, WEB_CONCURRENCY=str(workers), GUNICORN_THREADS=str(threads),
+                      CHAT_BACKEND="stub", **env)
+    if server == "gunicorn":
+        command = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:create_app()"]
+    else:
+        command = [sys.executable, "-m", "flask", "--app", "app", "run", "--host", "127.0.0.1",
+                   "--port", str(port), "--no-reload", "--no-debugger", "--with-threads"]
+    log = open(log_path, "ab")
+    return subprocess.Popen(command, env=server_env, stdout=log, stderr=subprocess.STDOUT)
+
+
+def wait_until_ready(host, port, process=None, timeout=300.0):
+    """Attend que le catalogue des symptômes réponde (modèle chargé)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Le serveur s'est arrêté au démarrage (code {process.returncode})")
+        try:
+            connection = http.client.HTTPConnection(host, port, timeout=5)
+            connection.request("GET", "/api/symptoms/catalog")
+            response = connection.getresponse()
+            body = response.read()
+            connection.close()
+            if response.status == 200:
+                return [entry["symptom"] for entry in json.loads(body)["symptoms"]]
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"Serveur non prêt après {timeout:g} s")
+
+
+# ---- Processus serveur : CPU et mémoire ----
+
+def _cpu_seconds(pid):
+    """Temps CPU (utilisateur + système) d'un processus, d'après /proc/<pid>/stat"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+
+
+def _children(pid):
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        if parent == pid:
+            children.append(int(entry))
+    return children
+
+
+class ProcessMonitor:
+    """
+    Échantillonne périodiquement le CPU et la mémoire du processus maître et de ses
+    workers (les workers redémarrés apparaissent sous un nouveau pid)
+    """
+
+    def __init__(self, root_pid, interval=1.0):
+        self.root_pid = root_pid
+        self.interval = interval
+        self.processes = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        now = time.perf_counter()
+        for role, pid in [("master", self.root_pid)] + [("worker", child) for child in _children(self.root_pid)]:
+            cpu = _cpu_seconds(pid)
+            if cpu is None:
+                continue
+            memory = process_memory(pid)
+            state = self.processes.setdefault(pid, {"role": role, "first": (now, cpu), "rss_max": 0})
+            state["last"] = (now, cpu)
+            state["rss_max"] = max(state["rss_max"], memory.get("rss", 0))
+            state["memory"] = memory
+
+    def start(self):
+        self._sample()
+
+        def run():
+            while not self._stop.wait(self.interval):
+                self._sample()
+
+        self._thread = threading.Thread(target=run, name="process-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._sample()
+
+    def report(self):
+        processes = []
+        for pid, state in sorted(self.processes.items()):
+            (start, cpu_start), (end, cpu_end) = state["first"], state["last"]
+            elapsed = end - start
+            processes.append({
+                "pid": pid,
+                "role": state["role"],
+                "cpu_seconds": cpu_end - cpu_start,
+                "cpu_percent": 100 * (cpu_end - cpu_start) / elapsed if elapsed > 0 else 0.0,
+                "rss_max_bytes": state["rss_max"],
+                **{f"{name}_bytes": value for name, value in state["memory"].items()},
+            })
+        return processes
+
+
+# ---- Clients ----
+
+class Client:
+    """Client HTTP d'un thread : connexion persistante, rouverte après une erreur"""
+
+    def __init__(self, host, port, symptoms, chat_distinct, rng, timeout=60.0):
+        self.host = host
+        self.port = port
+        self.symptoms = symptoms
+        self.chat_distinct = chat_distinct
+        self.rng = rng
+        self.timeout = timeout
+        self.connection = None
+
+    def _request(self, method, path, body=None, headers=None):
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        self.connection.request(method, path, body=body, headers=headers or {})
+        return self.connection.getresponse()
+
+    def _chat_message(self, sequence):
+        if self.chat_distinct:
+            return f"Question {self.rng.randrange(self.chat_distinct)} sur mes symptômes"
+        return f"Question {sequence} sur mes symptômes"
+
+    def _random_symptoms(self):
+        return self.rng.sample(self.symptoms, self.rng.randint(3, 6))
+
+    def run(self, kind, sequence):
+        """
+        Envoie une requête du type demandé
+
+        Returns:
+            (statut HTTP, erreur applicative, délai du premier octet en secondes ou None)
+        """
+        first_byte = None
+        start = time.perf_counter()
+        if kind == "index":
+            response = self._request("GET", "/")
+            response.read()
+            return response.status, response.status >= 400, None
+        if kind == "predict":
+            body = urllib.parse.urlencode([("symptoms", s) for s in self._random_symptoms()])
+            response = self._request("POST", "/", body, {"Content-Type": "application/x-www-form-urlencoded"})
+            response.read()
+            return response.status, response.status >= 400, None
+        if kind == "api_predict":
+            body = json.dumps({"records": [self._random_symptoms()]})
+            response = self._request("POST", "/api/predict", body, {"Content-Type": "application/json"})
+            response.read()
+            return response.status, response.status >= 400, None
+        if kind == "chat":
+            body = json.dumps({"message": self._chat_message(sequence)})
+            response = self._request("POST", "/chat", body, {"Content-Type": "application/json"})
+            payload = response.read()
+            if response.status >= 400:
+                return response.status, True, None
+            text = json.loads(payload).get("response", "")
+            return response.status, text.startswith(CHAT_ERROR_PREFIXES), None
+
+        body = json.dumps({"message": self._chat_message(sequence)})
+        response = self._request("POST", "/chat/stream", body, {"Content-Type": "application/json"})
+        if response.status >= 400:
+            response.read()
+            return response.status, True, None
+        text = []
+        while True:
+            line = response.readline()
+            if not line:
+                break
+            if first_byte is None:
+                first_byte = time.perf_counter() - start
+            if line.startswith(b"data: {\"text\""):
+                text.append(json.loads(line[6:])["text"])
+        return response.status, "".join(text).startswith(CHAT_ERROR_PREFIXES), first_byte
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def _latency_stats(values):
+    if not values:
+        return None
+    values = np.array(values) * 1000
+    return {
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p90_ms": float(np.percentile(values, 90)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max()),
+    }
+
+
+def run_load(host, port, symptoms, mix=None, concurrency=16, duration=30.0, warmup=5.0, rate=None,
+             chat_distinct=0, seed=0):
+    """
+    Génère un trafic mixte en boucle fermée : chaque thread enchaîne ses requêtes, avec
+    `rate` requêtes/s au total si demandé (sinon au plus vite). Les requêtes terminées
+    pendant les `warmup` premières secondes ne sont pas comptées.
+
+    Returns:
+        {"duration_seconds", "total", "by_kind"} (statistiques sérialisables en JSON)
+    """
+    mix = mix or DEFAULT_MIX
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    samples = defaultdict(list)  # type -> [(latence, statut, erreur, premier octet)]
+    lock = threading.Lock()
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+    interval = concurrency / rate if rate else 0.0
+
+    def worker(index):
+        rng = random.Random(seed * 1000 + index)
+        client = Client(host, port, symptoms, chat_distinct, rng)
+        local = defaultdict(list)
+        sequence = index
+        next_start = time.perf_counter() + rng.random() * interval
+        while True:
+            if interval:
+                delay = next_start - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                next_start += interval
+            request_start = time.perf_counter()
+            if request_start >= stop_at:
+                break
+            kind = rng.choices(kinds, weights)[0]
+            try:
+                status, failed, first_byte = client.run(kind, sequence)
+            except (OSError, http.client.HTTPException):
+                status, failed, first_byte = None, True, None
+                client.close()
+            end = time.perf_counter()
+            if request_start >= measure_from:
+                local[kind].append((end - request_start, status, failed, first_byte))
+            sequence += concurrency
+        client.close()
+        with lock:
+            for kind, values in local.items():
+                samples[kind].extend(values)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = min(time.perf_counter(), stop_at) - measure_from
+
+    by_kind = {}
+    for kind, values in sorted(samples.items()):
+        errors = sum(failed for _, _, failed, _ in values)
+        by_kind[kind] = {
+            "requests": len(values),
+            "throughput_rps": len(values) / elapsed,
+            "errors": errors,
+            "error_rate": errors / len(values),
+            "status": dict(Counter(str(status) for _, status, _, _ in values)),
+            "latency": _latency_stats([latency for latency, _, _, _ in values]),
+        }
+        first_bytes = [first_byte for _, _, _, first_byte in values if first_byte is not None]
+        if first_bytes:
+            by_kind[kind]["first_byte"] = _latency_stats(first_bytes)
+
+    all_values = [value for values in samples.values() for value in values]
+    total_errors = sum(failed for _, _, failed, _ in all_values)
+    return {
+        "duration_seconds": elapsed,
+        "total": {
+            "requests": len(all_values),
+            "throughput_rps": len(all_values) / elapsed,
+            "errors": total_errors,
+            "error_rate": total_errors / len(all_values) if all_values else 0.0,
+            "latency": _latency_stats([latency for latency, _, _, _ in all_values]),
+        },
+        "by_kind": by_kind,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Test de charge HTTP de l'application (trafic mixte, chat simulé par StubTransport)")
+    parser.add_argument("--server", choices=["gunicorn", "flask"], default="gunicorn",
+                        help="gunicorn (déploiement pré-fork) ou serveur de développement Flask multi-thread")
+    parser.add_argument("--url", help="Tester un serveur déjà démarré au lieu d'en lancer un (ex. http://127.0.0.1:8000)")
+    parser.add_argument("--pid", type=int, help="Avec --url : pid du processus maître à surveiller")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=4, help="Threads par worker gunicorn")
+    parser.add_argument("--env", action="append", default=[], metavar="CLÉ=VALEUR",
+                        help="Variable d'environnement du serveur (ex. MICROBATCH_WINDOW_MS=2), répétable")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clients simultanés")
+    parser.add_argument("--duration", type=float, default=30.0, help="Durée mesurée (secondes)")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Préchauffage non mesuré (secondes)")
+    parser.add_argument("--rate", type=float, help="Débit cible total (requêtes/s), au plus vite par défaut")
+    parser.add_argument("--mix", type=_parse_mix, default=DEFAULT_MIX,
+                        help="Répartition du trafic, ex. index=30,predict=40,chat=15,chat_stream=15,api_predict=0")
+    parser.add_argument("--chat-distinct", type=int, default=0,
+                        help="Nombre de questions de chat différentes (0 = toutes différentes, sans cache)")
+    parser.add_argument("--stub-latency", type=float, default=0.5, help="Délai avant le premier fragment du chat")
+    parser.add_argument("--stub-chunk-delay", type=float, default=0.05, help="Délai entre les fragments du chat")
+    parser.add_argument("--stub-chunks", type=int, default=8, help="Fragments par réponse du chat")
+    parser.add_argument("--stub-error-rate", type=float, default=0.0, help="Proportion d'erreurs du chat simulé")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--server-log", default=os.devnull, help="Fichier de sortie du serveur")
+    parser.add_argument("--output", help="Fichier JSON du rapport")
+    args = parser.parse_args()
+
+    env = {
+        "CHAT_STUB_LATENCY": str(args.stub_latency),
+        "CHAT_STUB_CHUNK_DELAY": str(args.stub_chunk_delay),
+        "CHAT_STUB_CHUNKS": str(args.stub_chunks),
+        "CHAT_STUB_ERROR_RATE": str(args.stub_error_rate),
+        "CHAT_STUB_SEED": str(args.seed),
+        **_parse_env(args.env),
+    }
+
+    process = None
+    if args.url:
+        parsed = urllib.parse.urlparse(args.url)
+        host, port, root_pid = parsed.hostname, parsed.port or 80, args.pid
+    else:
+        host, port = "127.0.0.1", _free_port()
+        process = start_server(args.server, port, args.workers, args.threads, env, args.server_log)
+        root_pid = process.pid
+
+    try:
+        symptoms = wait_until_ready(host, port, process)
+        print(f"✅ Serveur prêt sur {host}:{port} ({len(symptoms)} symptômes)")
+        monitor = ProcessMonitor(root_pid) if root_pid and os.path.isdir("/proc") else None
+        if monitor is not None:
+            monitor.start()
+        results = run_load(host, port, symptoms, mix=args.mix, concurrency=args.concurrency,
+                           duration=args.duration, warmup=args.warmup, rate=args.rate,
+                           chat_distinct=args.chat_distinct, seed=args.seed)
+        if monitor is not None:
+            monitor.stop()
+    finally:
+        if process is not None:
+            process.terminate()
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    report = {
+        "config": {
+            "server": "external" if args.url else args.server,
+            "workers": args.workers,
+            "threads": args.threads,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "rate": args.rate,
+            "mix": args.mix,
+            "chat_distinct": args.chat_distinct,
+            "server_env": env,
+        },
+        **results,
+        "processes": monitor.report() if monitor is not None else [],
+    }
+
+    total = results["total"]
+    print(f"\n== {total['requests']} requêtes en {results['duration_seconds']:.1f} s : "
+          f"{total['throughput_rps']:.1f} req/s, erreurs {total['error_rate']:.2%}")
+    for kind, stats in results["by_kind"].items():
+        latency = stats["latency"]
+        print(f"{kind:<12} {stats['throughput_rps']:>8.1f} req/s  p50 {latency['p50_ms']:>8.1f} ms  "
+              f"p99 {latency['p99_ms']:>8.1f} ms  erreurs {stats['error_rate']:.2%}")
+    for process_stats in report["processes"]:
+        memory = {name: process_stats[f"{name}_bytes"] for name in ("rss", "pss", "private")
+                  if f"{name}_bytes" in process_stats}
+        print(f"{process_stats['role']:<7} {process_stats['pid']:>7}  CPU {process_stats['cpu_percent']:>5.1f} %  "
+              f"{format_memory(memory)}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Rapport écrit dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,82 @@
-import pandas as pd
+import os
 import numpy as np
+from sklearn.calibration import CalibratedClassifierCV
 from sklearn.svm import SVC
 from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
+
+DATA_PATH = os.environ.get("DISEASE_DATA_PATH", "data/maladies_symptomes_binary.csv")
+
+
+class SVMBackend:
+    """
+    Backend SVM (StandardScaler + SVC RBF) entraîné une seule fois.
+
+    Même interface que le RandomForestClassifier utilisé par DiseasePredictor
+    (fit, predict, predict_proba, classes_) : il est sélectionné avec
+    DiseasePredictor(..., model_type="svm"), et le scaler et le modèle sont sauvegardés
+    ensemble par DiseasePredictor.save_model.
+
+    Les probabilités viennent d'une calibration sigmoïde (Platt) sur des prédictions
+    hors pli, comme SVC(probability=True), qui est déprécié depuis scikit-learn 1.9 ;
+    le SVM final est entraîné sur toutes les données. Si une maladie a moins de lignes
+    que de plis (entraînement dédupliqué), la calibration se fait sur les données
+    d'entraînement elles-mêmes.
+    """
+
+    # Nombre de plis de la calibration
+    CALIBRATION_FOLDS = 5
+
+    def __init__(self, C=1.0, gamma='scale', random_state=42):
+        self.C = C
+        self.gamma = gamma
+        self.random_state = random_state
+        self.scaler = StandardScaler()
+        self.svm = None
+
+    @property
+    def classes_(self):
+        return self.svm.classes_
+
+    def fit(self, X, y, sample_weight=None):
+        """Normalise les données puis entraîne le SVM"""
+        X_scaled = self.scaler.fit_transform(np.asarray(X, dtype=np.float64))
+        cv = self.CALIBRATION_FOLDS
+        if np.unique(y, return_counts=True)[1].min() < cv:
+            # Un seul « pli » couvrant toutes les lignes : calibration sur l'entraînement
+            rows = np.arange(len(X_scaled))
+            cv = [(rows, rows)]
+        self.svm = CalibratedClassifierCV(
+            SVC(kernel='rbf', C=self.C, gamma=self.gamma, random_state=self.random_state),
+            method='sigmoid', cv=cv, ensemble=False,
+        )
+        self.svm.fit(X_scaled, y, sample_weight=sample_weight)
+        return self
+
+    def predict_proba(self, X):
+        """Probabilités de chaque maladie, une ligne par patient"""
+        return self.svm.predict_proba(self.scaler.transform(np.asarray(X, dtype=np.float64)))
+
+    def predict(self, X):
+        """Maladie la plus probable pour chaque patient"""
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1))
+
+
+_predictor = None
+
+
+def get_predictor():
+    """
+    Prédicteur SVM partagé : entraîné au premier appel (ou rechargé depuis le cache
+    d'artefacts), puis réutilisé pour toutes les prédictions
+    """
+    global _predictor
+    if _predictor is None:
+        from model_predictor import DiseasePredictor
+        from model_store import ModelArtifactStore
+        _predictor = DiseasePredictor(DATA_PATH, model_type="svm",
+                                      artifact_store=ModelArtifactStore(os.environ.get("MODEL_ARTIFACT_DIR", "models")))
+    return _predictor
+
 
 # Version avec sortie simplifiée pour éviter les problèmes d'affichage
 def simple_prediction(symptom_list):
@@ -16,18 +89,13 @@ def simple_prediction(symptom_list):
     Returns:
         Nom de la maladie prédite et score de confiance
     """
-    # Charger les données
+    # Charger le modèle (entraîné une seule fois)
     try:
-        disease_data = pd.read_csv("C:/Users/Dell/Desktop/Datasets/maladies_symptomes_binary.csv")
-        print("✅ Données chargées avec succès")
+        predictor = get_predictor()
     except Exception as e:
         print(f"❌ Erreur lors du chargement des données: {e}")
         return "Erreur de chargement des données"
     
-    # Préparation des données
-    disease_column = "prognosis"  # Changer si nécessaire
-    all_symptoms = [col for col in disease_data.columns if col != disease_column]
-    
     # Préparation des symptômes de l'utilisateur
     if isinstance(symptom_list, str):
         # Si on reçoit une chaîne, on la divise
@@ -37,60 +105,18 @@ def simple_prediction(symptom_list):
         user_symptoms = [s.strip().lower().replace(" ", "_") for s in symptom_list]
     
     # Vérification des symptômes
-    valid_symptoms = [s for s in user_symptoms if s in all_symptoms]
+    valid_symptoms = [s for s in user_symptoms if s in predictor.symptom_positions]
     if not valid_symptoms:
         print("❌ Aucun symptôme valide détecté dans:", user_symptoms)
-        print("Symptômes disponibles:", all_symptoms[:10], "...")
+        print("Symptômes disponibles:", predictor.all_symptoms[:10], "...")
         return "Impossible de faire une prédiction - symptômes non reconnus"
     
-    # Création du vecteur de symptômes
-    input_vector = np.zeros(len(all_symptoms))
-    for symptom in valid_symptoms:
-        if symptom in all_symptoms:
-            input_vector[all_symptoms.index(symptom)] = 1
-    
-    # Préparation des données d'entraînement
-    X = disease_data[all_symptoms]
-    y = disease_data[disease_column]
-    
-    # Séparation en train/test
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    # Normalisation
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
-    # Entraînement du modèle (avec paramètres simples)
-    print("⏳ Entraînement du modèle SVM...")
-    svm = SVC(probability=True, kernel='rbf', C=1.0, gamma='scale')
-    svm.fit(X_train_scaled, y_train)
-    
-    # Évaluation rapide
-    y_pred = svm.predict(X_test_scaled)
-    accuracy = accuracy_score(y_test, y_pred)
-    print(f"📊 Précision du modèle: {accuracy:.2%}")
-    
-    # Prédiction pour les symptômes de l'utilisateur
-    input_df = pd.DataFrame([input_vector], columns=all_symptoms)
-    input_scaled = scaler.transform(input_df)
-    
     # Faire la prédiction
     try:
-        prediction = svm.predict(input_scaled)[0]
-        probabilities = svm.predict_proba(input_scaled)[0]
-        classes = svm.classes_
-        
-        # Trouver l'index de la maladie prédite
-        disease_idx = np.where(classes == prediction)[0][0]
-        confidence = probabilities[disease_idx] * 100
-        
-        # Symptômes caractéristiques de la maladie
-        disease_data_subset = disease_data[disease_data[disease_column] == prediction]
-        disease_symptoms = []
-        for symptom in all_symptoms:
-            if disease_data_subset[symptom].iloc[0] == 1:
-                disease_symptoms.append(symptom)
+        result = predictor.predict(valid_symptoms)
+        prediction = result["disease"]
+        confidence = result["score"] * 100
+        disease_symptoms = predictor.get_disease_symptoms(prediction)
         
         # Format de sortie simplifié et clair
         print("\n" + "="*50)
@@ -0,0 +1,192 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# Bornes (en secondes) des histogrammes de latence
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_NULL_TIMER = nullcontext()
+
+
+class Histogram:
+    """Histogramme cumulatif au format Prometheus"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _Timer:
+    """Chronomètre une section et enregistre sa durée dans un histogramme"""
+
+    __slots__ = ("registry", "name", "labels", "start")
+
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Registre de métriques (compteurs, histogrammes, collecteurs) exposé au format texte
+    Prometheus. Désactivé, chaque appel retourne immédiatement : le surcoût sur le
+    chemin critique est négligeable.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+        self._buckets = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def describe(self, name, help_text):
+        """Associe un texte d'aide à une métrique"""
+        self._help[name] = help_text
+
+    def set_buckets(self, name, buckets):
+        """Bornes de l'histogramme d'une métrique qui n'est pas une durée (ex. une taille de lot)"""
+        self._buckets[name] = tuple(buckets)
+
+    def inc(self, name, value=1, **labels):
+        """Incrémente un compteur"""
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Ajoute une observation (en secondes, sauf bornes définies par set_buckets) à un histogramme"""
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self._buckets.get(name, DEFAULT_BUCKETS))
+            histogram.observe(value)
+
+    def timer(self, name, **labels):
+        """Gestionnaire de contexte qui chronomètre une section (no-op si désactivé)"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def register_collector(self, collector):
+        """
+        Ajoute un collecteur appelé à chaque export : il retourne une liste de
+        (nom, type, labels, valeur), pour exposer l'état d'autres composants (caches, chat)
+        """
+        self._collectors.append(collector)
+
+    def reset(self):
+        """Remet à zéro compteurs et histogrammes"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    @staticmethod
+    def _format_labels(labels):
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels) + "}"
+
+    def render(self):
+        """Exporte toutes les métriques au format texte Prometheus"""
+        lines = []
+        seen = set()
+
+        def header(name, metric_type):
+            if name in seen:
+                return
+            seen.add(name)
+            if name in self._help:
+                help_text = self._help[name].replace("\\", "\\\\").replace("\n", "\\n")
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, (list(h.counts), h.buckets, h.sum, h.count)) for key, h in self._histograms.items()
+            )
+
+        for (name, labels), value in counters:
+            header(name, "counter")
+            lines.append(f"{name}{self._format_labels(labels)} {value}")
+
+        for (name, labels), (counts, buckets, total, count) in histograms:
+            header(name, "histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{self._format_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{self._format_labels(labels)} {total}")
+            lines.append(f"{name}_count{self._format_labels(labels)} {count}")
+
+        for collector in self._collectors:
+            for name, metric_type, labels, value in collector():
+                header(name, metric_type)
+                lines.append(f"{name}{self._format_labels(tuple(sorted(labels.items())))} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    """Échappement d'une valeur de label Prometheus (\\, " et retours à la ligne)"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def stats_samples(prefix, stats, counters=(), labels=None):
+    """
+    Convertit le dictionnaire stats() d'un composant en échantillons de collecteur : les
+    valeurs de `counters` (cumuls qui ne font qu'augmenter) sont exportées en counter avec
+    le suffixe _total, les autres en gauge
+    """
+    labels = labels or {}
+    return [(f"{prefix}_{name.removesuffix('_total')}_total", "counter", labels, value) if name in counters
+            else (f"{prefix}_{name}", "gauge", labels, value)
+            for name, value in stats.items()]
+
+
+# Registre partagé par tout le processus (METRICS_ENABLED=0 pour le désactiver)
+REGISTRY = MetricsRegistry(enabled=os.environ.get("METRICS_ENABLED", "1") != "0")
+
+
+def inc(name, value=1, **labels):
+    REGISTRY.inc(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    REGISTRY.observe(name, value, **labels)
+
+
+def timer(name, **labels):
+    return REGISTRY.timer(name, **labels)
@@ -0,0 +1,125 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import metrics
+
+# Bornes de l'histogramme des tailles de lot
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+metrics.REGISTRY.set_buckets("predictor_microbatch_size", BATCH_SIZE_BUCKETS)
+
+
+class MicroBatcher:
+    """
+    Regroupe les prédictions unitaires concurrentes en un seul appel à predict_batch.
+
+    La première requête arrivée ouvre une fenêtre de `max_wait` secondes ; le lot part à la
+    fin de la fenêtre ou dès qu'il atteint `max_batch_size` requêtes. Le modèle est ainsi
+    parcouru une fois par lot au lieu d'une fois par requête, et chaque appelant reçoit
+    son propre résultat.
+    """
+
+    def __init__(self, predict_batch, max_batch_size=32, max_wait=0.002):
+        """
+        Args:
+            predict_batch: Fonction liste de listes de symptômes -> liste de résultats
+                (par exemple DiseasePredictor.predict_batch)
+            max_batch_size: Nombre maximal de requêtes par lot
+            max_wait: Durée maximale (en secondes) de la fenêtre de regroupement
+        """
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self.failed_batches = 0
+
+    def _ensure_worker(self):
+        """Démarre le thread de regroupement (à nouveau après un fork : les threads n'y survivent pas)"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+                self._thread.start()
+
+    def submit(self, symptoms):
+        """Met une requête en file et retourne un Future de son résultat"""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((symptoms, future, time.perf_counter()))
+        return future
+
+    def predict(self, symptoms):
+        """Équivalent de DiseasePredictor.predict, servi par le prochain lot"""
+        return self.submit(symptoms).result()
+
+    def _collect(self):
+        """Attend une première requête puis regroupe les suivantes jusqu'à la fin de la fenêtre"""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            for _, _, queued_at in batch:
+                metrics.observe("predictor_microbatch_wait_seconds", started - queued_at)
+            metrics.observe("predictor_microbatch_size", len(batch))
+            self.batches += 1
+            self.items += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+
+            try:
+                results = self.predict_batch([symptoms for symptoms, _, _ in batch])
+            except Exception as e:
+                self.failed_batches += 1
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                else:
+                    self._predict_each(batch)
+                continue
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
+
+    def _predict_each(self, batch):
+        """
+        Rejoue un lot en échec requête par requête : seule la requête fautive reçoit
+        l'exception, les autres appelants du lot obtiennent leur résultat.
+        """
+        for symptoms, future, _ in batch:
+            try:
+                result, = self.predict_batch([symptoms])
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "largest_batch": self.largest_batch,
+            "failed_batches": self.failed_batches,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
@@ -4,26 +4,86 @@ from sklearn.ensemble import RandomForestClassifier
 import joblib
 import os
 import ast  # Pour convertir les chaînes en listes
+from forest_engine import FlatForest
+from mdel_SVM import SVMBackend
+from prediction_cache import PredictionCache
+from symptom_matrix import load_symptom_matrix
+from symptom_index import SymptomIndex
+from symptom_statistics import SymptomStatistics
+from similarity_engine import SimilarityEngine
+import metrics
+from types import MappingProxyType
+from typing import NamedTuple
+
+
+# Paramètres d'entraînement par défaut du RandomForestClassifier
+DEFAULT_TRAINING_PARAMS = {"n_estimators": 100, "random_state": 42}
+
+# Familles de modèles disponibles : {model_type: (classe, paramètres par défaut)}
+MODEL_TYPES = {
+    "random_forest": (RandomForestClassifier, DEFAULT_TRAINING_PARAMS),
+    "svm": (SVMBackend, {"C": 1.0, "gamma": "scale", "random_state": 42}),
+}
+
+
+class DiseaseInfo(NamedTuple):
+    """Informations précalculées pour une maladie (immuables)"""
+    symptoms: tuple
+    symptom_set: frozenset
+    medications: tuple
+    description: object
+    diets: tuple
+    precautions: tuple
+    workout: tuple
 
 
 class DiseasePredictor:
     def __init__(self, disease_data_path, medications_path=None, description_path=None, 
-                 diets_path=None, precautions_path=None, workout_path=None, model_path=None):
+                 diets_path=None, precautions_path=None, workout_path=None, model_path=None,
+                 inference_backend="sklearn", artifact_store=None, training_params=None,
+                 cache_size=0, deduplicate_training=False, model_type="random_forest",
+                 severity_path=None, similarity_weight=0.0):
         """
         Initialise le prédicteur de maladies avec toutes les informations supplémentaires
         
         Args:
-            disease_data_path: Chemin vers le fichier CSV des maladies/symptômes
+            disease_data_path: Chemin vers le fichier CSV des maladies/symptômes, ou vers
+                un répertoire au format binaire (voir symptom_matrix.py)
             medications_path: Chemin vers le fichier CSV des médicaments
             description_path: Chemin vers le fichier CSV des descriptions
             diets_path: Chemin vers le fichier CSV des régimes alimentaires
             precautions_path: Chemin vers le fichier CSV des précautions
             workout_path: Chemin vers le fichier CSV des exercices/routines
             model_path: Chemin vers un modèle préentraîné (optionnel)
+            inference_backend: "sklearn" (par défaut) ou "numpy" pour le moteur FlatForest
+            artifact_store: ModelArtifactStore utilisé si model_path n'est pas fourni (optionnel)
+            training_params: Paramètres du modèle (optionnel)
+            cache_size: Taille du cache LRU des prédictions (0 = désactivé)
+            deduplicate_training: Entraîner sur les motifs uniques pondérés (voir train_model)
+            model_type: "random_forest" (par défaut) ou "svm" (voir mdel_SVM.SVMBackend)
+            severity_path: Chemin vers Symptom-severity.csv pour l'index des symptômes (optionnel)
+            similarity_weight: Part du moteur de similarité pondéré par la gravité dans les
+                probabilités (0 = modèle seul, 1 = similarité seule sans parcours du modèle)
         """
-        self.disease_data = pd.read_csv(disease_data_path)
-        self.disease_column = "prognosis"  # Colonne contenant les noms des maladies
-        self.all_symptoms = [col for col in self.disease_data.columns if col != self.disease_column]
+        if inference_backend not in ("sklearn", "numpy"):
+            raise ValueError(f"Backend d'inférence inconnu: {inference_backend}")
+        if model_type not in MODEL_TYPES:
+            raise ValueError(f"Type de modèle inconnu: {model_type}")
+        if not 0.0 <= similarity_weight <= 1.0:
+            raise ValueError(f"similarity_weight doit être compris entre 0 et 1: {similarity_weight}")
+        self.inference_backend = inference_backend
+        self.engine = None
+        self.model_type = model_type
+        self.training_params = dict(MODEL_TYPES[model_type][1], **(training_params or {}))
+        self.prediction_cache = PredictionCache(cache_size)
+        self.deduplicate_training = deduplicate_training
+        self.training_report = None
+        self.similarity_weight = similarity_weight
+        
+        # Matrice des symptômes en uint8 (projetée en mémoire partagée pour le format binaire)
+        self.symptom_data = load_symptom_matrix(disease_data_path)
+        self.disease_column = self.symptom_data.disease_column  # Colonne contenant les noms des maladies
+        self.all_symptoms = self.symptom_data.symptoms
         
         # Chargement des fichiers supplémentaires s'ils sont fournis
         self.medications_data = self._load_data(medications_path)
@@ -32,38 +92,217 @@ class DiseasePredictor:
         self.precautions_data = self._load_data(precautions_path)
         self.workout_data = self._load_data(workout_path)
         
+        # Index précalculé : une seule recherche par maladie lors de la prédiction
+        self.symptom_positions = {symptom: i for i, symptom in enumerate(self.all_symptoms)}
+        # Index de recherche (préfixes, n-grammes, synonymes) pour les saisies approximatives
+        self.symptom_index = SymptomIndex(self.all_symptoms, severity_path)
+        self.disease_index = self._build_disease_index()
+        # Fréquences des symptômes par maladie (sessions de diagnostic interactives)
+        self.symptom_statistics = SymptomStatistics.from_matrix(self.symptom_data)
+        # Profils maladie x symptôme : similarité pondérée par la gravité (toutes les maladies
+        # en un produit matriciel)
+        self.similarity = SimilarityEngine.from_statistics(
+            self.symptom_statistics, [entry["weight"] for entry in self.symptom_index.entries])
+        # Symptômes de référence en matrice dense (précision des lots déjà vectorisés)
+        codes, first_rows = np.unique(self.symptom_data.label_codes, return_index=True)
+        self._reference_matrix = np.asarray(self.symptom_data.matrix[first_rows], dtype=np.uint8)
+        self._reference_rows = {disease: i for i, disease in enumerate(self.symptom_data.diseases[codes])}
+        self._similarity_columns = None
+        
         # Chargement du modèle s'il existe, sinon entraînement d'un nouveau
         self.model = None
         if model_path and os.path.exists(model_path):
-            self.load_model(model_path)
+            if not self.load_model(model_path):
+                print("⚠️ Entraînement d'un nouveau modèle à la place")
+                self.train_model()
+        elif artifact_store is not None:
+            # Artefact versionné : réentraînement seulement si les données ou paramètres ont changé
+            artifact_params = dict(self.training_params, deduplicate=deduplicate_training)
+            if model_type != "random_forest":
+                artifact_params["model_type"] = model_type
+            artifact_path = artifact_store.artifact_path(disease_data_path, artifact_params)
+            if not (os.path.exists(artifact_path) and self.load_model(artifact_path)):
+                self.train_model()
+                artifact_store.save(self, artifact_path)
         else:
             self.train_model()
     
+    @property
+    def disease_data(self):
+        """
+        Données d'entraînement sous forme de DataFrame, construit au premier accès puis
+        conservé tant que symptom_data ne change pas
+        """
+        cached = getattr(self, "_disease_frame", None)
+        if cached is None or cached[0] is not self.symptom_data:
+            cached = self._disease_frame = (self.symptom_data, self.symptom_data.to_frame())
+        return cached[1]
+    
     def _load_data(self, file_path):
         """Charge un fichier CSV s'il existe"""
         if file_path and os.path.exists(file_path):
             return pd.read_csv(file_path)
         return None
     
+    @staticmethod
+    def _parse_list(value):
+        """Convertit une cellule du type "['a', 'b']" en tuple"""
+        if isinstance(value, str):
+            if value.startswith('['):
+                try:
+                    return tuple(ast.literal_eval(value))
+                except (ValueError, SyntaxError):
+                    return (value,)
+            return (value,)
+        return ()
+    
+    @staticmethod
+    def _first_values(data, key_column, value_column):
+        """Retourne {maladie: valeur} pour la première ligne de chaque maladie"""
+        if data is None or key_column not in data.columns or value_column not in data.columns:
+            return {}
+        first_rows = data.drop_duplicates(subset=key_column, keep='first')
+        return dict(zip(first_rows[key_column], first_rows[value_column]))
+    
+    def _build_disease_index(self):
+        """
+        Construit l'index immuable {maladie: DiseaseInfo} à partir de tous les fichiers CSV.
+        Les analyses pandas et les appels à ast.literal_eval sont faits une seule fois ici
+        au lieu d'être répétés à chaque prédiction.
+        """
+        # Symptômes caractéristiques (première ligne de chaque maladie, comme auparavant)
+        symptoms = {}
+        codes, first_rows = np.unique(self.symptom_data.label_codes, return_index=True)
+        for code, row in zip(codes, first_rows):
+            flags = self.symptom_data.matrix[row]
+            symptoms[self.symptom_data.diseases[code]] = tuple(
+                s for s, flag in zip(self.all_symptoms, flags) if flag == 1)
+        
+        medications = {d: self._parse_list(v) for d, v in
+                       self._first_values(self.medications_data, 'Disease', 'Medication').items()}
+        descriptions = self._first_values(self.description_data, 'Disease', 'Description')
+        diets = {d: self._parse_list(v) for d, v in
+                 self._first_values(self.diets_data, 'Disease', 'Diet').items()}
+        
+        precautions = {}
+        if self.precautions_data is not None and 'Disease' in self.precautions_data.columns:
+            columns = [c for c in ['Precaution_1', 'Precaution_2', 'Precaution_3', 'Precaution_4']
+                       if c in self.precautions_data.columns]
+            first_rows = self.precautions_data.drop_duplicates(subset='Disease', keep='first')
+            for _, row in first_rows.iterrows():
+                precautions[row['Disease']] = tuple(row[c] for c in columns if not pd.isna(row[c]))
+        
+        workout = {}
+        if self.workout_data is not None and {'disease', 'workout'} <= set(self.workout_data.columns):
+            for disease, rows in self.workout_data.groupby('disease', sort=False):
+                workout[disease] = tuple(rows['workout'])
+        
+        index = {}
+        names = set(symptoms) | set(medications) | set(descriptions) | set(diets) | set(precautions) | set(workout)
+        for name in names:
+            disease_symptoms = symptoms.get(name, ())
+            index[name] = DiseaseInfo(
+                symptoms=disease_symptoms,
+                symptom_set=frozenset(disease_symptoms),
+                medications=medications.get(name, ()),
+                description=descriptions.get(name, ""),
+                diets=diets.get(name, ()),
+                precautions=precautions.get(name, ()),
+                workout=workout.get(name, ()),
+            )
+        return MappingProxyType(index)
+    
+    def _get_info(self, disease_name):
+        """Retourne l'entrée de l'index pour une maladie (ou None)"""
+        return self.disease_index.get(disease_name)
+    
     def get_symptoms(self):
         """Renvoie la liste des symptômes disponibles, formatés pour l'affichage"""
         return [symptom.replace('_', ' ').capitalize() for symptom in self.all_symptoms]
     
-    def train_model(self, test_size=0.2, random_state=42):
-        """Entraîne le modèle de prédiction de maladies"""
+    def train_model(self, test_size=0.2, random_state=None, deduplicate=None):
+        """
+        Entraîne le modèle de prédiction de maladies
+        
+        Args:
+            test_size: Conservé pour compatibilité (le modèle est entraîné sur toutes les données)
+            random_state: Graine aléatoire (par défaut celle de training_params)
+            deduplicate: Regrouper les lignes identiques en motifs uniques pondérés par leur
+                nombre d'occurrences (par défaut self.deduplicate_training). Chaque arbre voit
+                alors tous les motifs (bootstrap désactivé sauf indication contraire), ce qui
+                correspond à l'échantillon bootstrap des données complètes où chaque motif
+                répété apparaît presque sûrement. La maladie prédite est la même sur toutes
+                les lignes d'entraînement (seul le score de confiance peut varier de
+                quelques centièmes), mais pas sur des combinaisons partielles de symptômes :
+                environ 75 % d'accord sur des sous-ensembles tirés au hasard. C'est pourquoi
+                l'option est désactivée par défaut (DEDUPLICATE_TRAINING=1 pour l'activer).
+        """
         print("Entraînement du modèle en cours...")
+        if deduplicate is None:
+            deduplicate = self.deduplicate_training
+        
+        params = dict(self.training_params)
+        if random_state is not None:
+            params["random_state"] = random_state
         
         # Séparation des features et de la cible
-        X = self.disease_data[self.all_symptoms]
-        y = self.disease_data[self.disease_column]
+        n_rows = self.symptom_data.matrix.shape[0]
+        if deduplicate:
+            matrix, label_codes, sample_weight = self.symptom_data.deduplicate()
+            y = self.symptom_data.diseases[label_codes]
+            if self.model_type == "random_forest":
+                params.setdefault("bootstrap", False)
+        else:
+            matrix, y, sample_weight = self.symptom_data.matrix, self.symptom_data.labels, None
+        X = pd.DataFrame(matrix, columns=self.all_symptoms, copy=False)
+        self.training_report = {
+            "rows": int(n_rows),
+            "training_rows": int(matrix.shape[0]),
+            "compression_ratio": n_rows / max(1, matrix.shape[0]),
+        }
+        if deduplicate:
+            print(f"Déduplication : {n_rows} lignes -> {matrix.shape[0]} motifs uniques "
+                  f"(x{self.training_report['compression_ratio']:.1f})")
         
         # Création et entraînement du modèle
-        self.model = RandomForestClassifier(n_estimators=100, random_state=random_state)
-        self.model.fit(X, y)  # Entraînement sur toutes les données
+        model_class = MODEL_TYPES[self.model_type][0]
+        model = model_class(**params)
+        model.fit(X, y, sample_weight=sample_weight)  # Entraînement sur toutes les données
+        self._set_model(model)
         
         print("✅ Modèle entraîné avec succès")
         return self.model
     
+    def _set_model(self, model):
+        """
+        Met un modèle en service : le moteur d'inférence et les colonnes de similarité sont
+        préparés d'abord, puis tout est remplacé d'un bloc et le cache des prédictions
+        invalidé. Si la préparation échoue, l'ancien modèle reste en service.
+
+        Raises:
+            ValueError: si le modèle est inutilisable avec ces données
+        """
+        if not hasattr(model, "predict_proba") or not hasattr(model, "classes_"):
+            raise ValueError(f"{type(model).__name__} n'est pas un classifieur entraîné")
+        unknown = [c for c in model.classes_ if c not in self.similarity.positions]
+        if unknown:
+            raise ValueError(f"Maladies inconnues du jeu de données: {unknown[:5]}")
+        engine = self._compile_engine(model)
+        # Colonnes du moteur de similarité dans l'ordre des classes du modèle
+        similarity_columns = np.array([self.similarity.positions[c] for c in model.classes_])
+
+        self.model, self.engine, self._similarity_columns = model, engine, similarity_columns
+        self.prediction_cache.clear()
+    
+    def _compile_engine(self, model):
+        """Compile le modèle pour le moteur NumPy si ce backend est demandé (None sinon)"""
+        if self.inference_backend != "numpy":
+            return None
+        if not isinstance(model, RandomForestClassifier):
+            print("⚠️ Le moteur NumPy ne supporte que RandomForestClassifier, utilisation de sklearn")
+            return None
+        return FlatForest.from_sklearn(model)
+    
     def predict(self, user_symptoms):
         """
         Prédit la maladie basée sur les symptômes fournis par l'utilisateur et récupère
@@ -79,36 +318,158 @@ class DiseasePredictor:
             print("⚠️ Le modèle n'a pas encore été entraîné. Entraînement en cours...")
             self.train_model()
         
-        # Normalisation des symptômes entrés
-        normalized_symptoms = []
-        for symptom in user_symptoms:
-            # Convertir au format du modèle (lower case, underscores)
-            normalized = symptom.lower().replace(' ', '_')
-            if normalized in self.all_symptoms:
-                normalized_symptoms.append(normalized)
+        return self.predict_batch([user_symptoms])[0]
+    
+    def predict_batch(self, symptom_lists):
+        """
+        Prédit les maladies pour plusieurs patients en un seul appel au modèle
         
-        # Création d'un vecteur de symptômes (0 ou 1 pour chaque symptôme possible)
-        input_vector = np.zeros(len(self.all_symptoms))
-        for symptom in normalized_symptoms:
-            if symptom in self.all_symptoms:
-                idx = self.all_symptoms.index(symptom)
-                input_vector[idx] = 1
+        Args:
+            symptom_lists: Liste de listes de symptômes (une liste par patient)
+            
+        Returns:
+            Liste de dictionnaires de résultat, dans le même ordre que l'entrée
+        """
+        if self.model is None:
+            print("⚠️ Le modèle n'a pas encore été entraîné. Entraînement en cours...")
+            self.train_model()
         
-        # Prédiction avec le modèle
-        input_df = pd.DataFrame([input_vector], columns=self.all_symptoms)
-        prediction = self.model.predict(input_df)[0]
+        if not symptom_lists:
+            return []
         
-        # Score de confiance (probabilité de la classe prédite)
-        probabilities = self.model.predict_proba(input_df)[0]
-        classes = self.model.classes_
-        confidence_score = probabilities[np.where(classes == prediction)[0][0]]
+        metrics.inc("predictor_rows_total", len(symptom_lists))
+        with metrics.timer("predictor_stage_seconds", stage="normalize"):
+            normalized_lists = [self.normalize_symptoms(symptoms) for symptoms in symptom_lists]
+        with metrics.timer("predictor_stage_seconds", stage="vectorize"):
+            input_matrix = self._vectorize(normalized_lists)
+        outputs = self._cached_scores(input_matrix)
         
-        # Symptômes caractéristiques de la maladie prédite
-        disease_symptoms = self.get_disease_symptoms(prediction)
+        with metrics.timer("predictor_stage_seconds", stage="enrich"):
+            return [self._build_result(prediction, confidence, normalized, self._precision(prediction, normalized))
+                    for (prediction, confidence), normalized in zip(outputs, normalized_lists)]
+    
+    def vectorize(self, symptom_lists):
+        """Normalise les listes de symptômes et les convertit en matrice (ordre de all_symptoms)"""
+        return self._vectorize([self.normalize_symptoms(symptoms) for symptoms in symptom_lists])
+    
+    def score_matrix(self, input_matrix):
+        """
+        Prédiction sans enrichissement pour une matrice de symptômes déjà vectorisée
+        (colonnes dans l'ordre de all_symptoms), pour le traitement de gros fichiers
         
-        # Calcul de la précision comme pourcentage de symptômes entrés qui correspondent à la maladie
-        matching_symptoms = [s for s in normalized_symptoms if s in disease_symptoms]
-        precision = (len(matching_symptoms) / len(normalized_symptoms)) * 100 if normalized_symptoms else 0
+        Returns:
+            (maladies prédites, scores de confiance, précisions en %), une valeur par ligne
+        """
+        if self.model is None:
+            print("⚠️ Le modèle n'a pas encore été entraîné. Entraînement en cours...")
+            self.train_model()
+        
+        if len(input_matrix) == 0:
+            return [], [], []
+        
+        metrics.inc("predictor_rows_total", len(input_matrix))
+        outputs = self._cached_scores(input_matrix)
+        predictions = [prediction for prediction, _ in outputs]
+        confidence_scores = [float(confidence) for _, confidence in outputs]
+        return predictions, confidence_scores, self._precisions(input_matrix, predictions)
+    
+    def _cached_scores(self, input_matrix):
+        """
+        Retourne (maladie, score) pour chaque ligne, en ne passant au modèle que les
+        vecteurs de symptômes absents du cache
+        """
+        if self.prediction_cache.max_size <= 0:
+            return list(zip(*self._score_matrix(input_matrix)))
+        
+        keys = PredictionCache.keys_for(input_matrix)
+        outputs = [self.prediction_cache.get(key) for key in keys]
+        missing = [i for i, output in enumerate(outputs) if output is None]
+        if missing:
+            predictions, confidence_scores = self._score_matrix(input_matrix[missing])
+            for i, prediction, confidence in zip(missing, predictions, confidence_scores):
+                outputs[i] = (prediction, confidence)
+                self.prediction_cache.put(keys[i], outputs[i])
+        return outputs
+    
+    def _score_matrix(self, input_matrix):
+        """Retourne les maladies prédites et leurs scores de confiance pour une matrice de symptômes"""
+        # Un seul parcours de la forêt : la classe prédite est l'argmax des probabilités
+        if self.similarity_weight >= 1.0:
+            probabilities = None
+        elif self.engine is not None:
+            with metrics.timer("predictor_stage_seconds", stage="model"):
+                probabilities = self.engine.predict_proba(input_matrix)
+        else:
+            with metrics.timer("predictor_stage_seconds", stage="dataframe"):
+                input_df = pd.DataFrame(input_matrix, columns=self.all_symptoms)
+            with metrics.timer("predictor_stage_seconds", stage="model"):
+                probabilities = self.model.predict_proba(input_df)
+        if self.similarity_weight > 0:
+            with metrics.timer("predictor_stage_seconds", stage="similarity"):
+                similarity = self.similarity.predict_proba(input_matrix)[:, self._similarity_columns]
+            if probabilities is None:
+                probabilities = similarity
+            else:
+                probabilities = (1 - self.similarity_weight) * probabilities + self.similarity_weight * similarity
+        best = probabilities.argmax(axis=1)
+        predictions = self.model.classes_.take(best)
+        confidence_scores = probabilities[np.arange(len(best)), best]
+        return predictions, confidence_scores
+    
+    def normalize_symptoms(self, user_symptoms):
+        """
+        Convertit les symptômes au format du modèle. Les saisies qui ne correspondent pas
+        exactement (alias, synonymes, fautes de frappe, texte libre) passent par l'index
+        des symptômes ; celles qui restent inconnues ou sont niées ("no fever") sont ignorées.
+        """
+        normalized_symptoms = []
+        for symptom in user_symptoms:
+            # Convertir au format du modèle (lower case, underscores)
+            normalized = symptom.lower().replace(' ', '_')
+            if normalized in self.symptom_positions:
+                candidates = (normalized,)
+            else:
+                candidates = self.symptom_index.resolve_all(symptom)
+            for candidate in candidates:
+                if candidate not in normalized_symptoms:
+                    normalized_symptoms.append(candidate)
+        return normalized_symptoms
+    
+    def _vectorize(self, normalized_lists):
+        """Crée la matrice de symptômes (0 ou 1 pour chaque symptôme possible), une ligne par patient"""
+        input_matrix = np.zeros((len(normalized_lists), len(self.all_symptoms)))
+        for row, symptoms in enumerate(normalized_lists):
+            for symptom in symptoms:
+                input_matrix[row, self.symptom_positions[symptom]] = 1
+        return input_matrix
+    
+    def _precision(self, prediction, normalized_symptoms):
+        """
+        Précision : pourcentage des symptômes entrés qui appartiennent aux symptômes de
+        référence de la maladie prédite (recherche dans l'ensemble précalculé)
+        """
+        if not normalized_symptoms:
+            return 0.0
+        info = self._get_info(prediction)
+        if info is None:
+            return 0.0
+        matched = sum(1 for symptom in normalized_symptoms if symptom in info.symptom_set)
+        return matched / len(normalized_symptoms) * 100
+
+    def _precisions(self, input_matrix, predictions):
+        """Précision de chaque ligne d'une matrice déjà vectorisée (tout le lot à la fois)"""
+        rows = np.array([self._reference_rows.get(prediction, -1) for prediction in predictions], dtype=int)
+        known = rows >= 0
+        entered = input_matrix.sum(axis=1)
+        matched = np.zeros(len(rows))
+        if known.any():
+            matched[known] = np.einsum("ij,ij->i", self._reference_matrix[rows[known]], input_matrix[known] != 0)
+        return (np.divide(matched, entered, out=np.zeros(len(entered)), where=entered > 0) * 100).tolist()
+    
+    def _build_result(self, prediction, confidence_score, normalized_symptoms, precision):
+        """Assemble le dictionnaire de résultat à partir de l'index précalculé"""
+        info = self._get_info(prediction)
+        disease_symptoms = info.symptoms if info else ()
         
         # Récupération de toutes les informations supplémentaires
         result = {
@@ -117,107 +478,44 @@ class DiseasePredictor:
             "precision": precision,
             "symptoms": [s.replace('_', ' ').capitalize() for s in normalized_symptoms],
             "disease_symptoms": [s.replace('_', ' ').capitalize() for s in disease_symptoms],
-            "medications": self.get_medications(prediction),
-            "description": self.get_description(prediction),
-            "diets": self.get_diets(prediction),
-            "precautions": self.get_precautions(prediction),
-            "workout": self.get_workout(prediction)
+            "medications": list(info.medications) if info else [],
+            "description": info.description if info else "",
+            "diets": list(info.diets) if info else [],
+            "precautions": list(info.precautions) if info else [],
+            "workout": list(info.workout) if info else []
         }
         
         return result
     
     def get_disease_symptoms(self, disease_name):
         """Retourne les symptômes associés à une maladie spécifique"""
-        disease_data = self.disease_data[self.disease_data[self.disease_column] == disease_name]
-        if disease_data.empty:
-            return []
-        
-        # Récupérer les symptômes qui ont une valeur de 1 pour cette maladie
-        symptoms = []
-        for symptom in self.all_symptoms:
-            if disease_data[symptom].iloc[0] == 1:
-                symptoms.append(symptom)
-        
-        return symptoms
+        info = self._get_info(disease_name)
+        return list(info.symptoms) if info else []
     
     def get_medications(self, disease_name):
         """Retourne les médicaments recommandés pour une maladie"""
-        if self.medications_data is None:
-            return []
-        
-        # Vérifier si la maladie est dans le fichier des médicaments
-        if 'Disease' not in self.medications_data.columns or disease_name not in self.medications_data['Disease'].values:
-            return []
-        
-        # Récupérer les médicaments pour cette maladie
-        meds = self.medications_data[self.medications_data['Disease'] == disease_name]['Medication'].iloc[0]
-        
-        # Convertir la chaîne en liste si nécessaire
-        if isinstance(meds, str) and meds.startswith('['):
-            try:
-                return ast.literal_eval(meds)
-            except:
-                return [meds]
-        return [meds] if isinstance(meds, str) else meds
+        info = self._get_info(disease_name)
+        return list(info.medications) if info else []
     
     def get_description(self, disease_name):
         """Retourne la description de la maladie"""
-        if self.description_data is None:
-            return ""
-        
-        if 'Disease' not in self.description_data.columns or disease_name not in self.description_data['Disease'].values:
-            return ""
-        
-        return self.description_data[self.description_data['Disease'] == disease_name]['Description'].iloc[0]
+        info = self._get_info(disease_name)
+        return info.description if info else ""
     
     def get_diets(self, disease_name):
         """Retourne les recommandations alimentaires pour la maladie"""
-        if self.diets_data is None:
-            return []
-        
-        if 'Disease' not in self.diets_data.columns or disease_name not in self.diets_data['Disease'].values:
-            return []
-        
-        diets = self.diets_data[self.diets_data['Disease'] == disease_name]['Diet'].iloc[0]
-        
-        # Convertir la chaîne en liste si nécessaire
-        if isinstance(diets, str) and diets.startswith('['):
-            try:
-                return ast.literal_eval(diets)
-            except:
-                return [diets]
-        return [diets] if isinstance(diets, str) else diets
+        info = self._get_info(disease_name)
+        return list(info.diets) if info else []
     
     def get_precautions(self, disease_name):
         """Retourne les précautions pour la maladie"""
-        if self.precautions_data is None:
-            return []
-        
-        if 'Disease' not in self.precautions_data.columns or disease_name not in self.precautions_data['Disease'].values:
-            return []
-        
-        # Récupérer toutes les précautions pour cette maladie
-        precautions_row = self.precautions_data[self.precautions_data['Disease'] == disease_name]
-        
-        # Collecter toutes les précautions non-nulles
-        precautions = []
-        for col in ['Precaution_1', 'Precaution_2', 'Precaution_3', 'Precaution_4']:
-            if col in precautions_row.columns and not pd.isna(precautions_row[col].iloc[0]):
-                precautions.append(precautions_row[col].iloc[0])
-        
-        return precautions
+        info = self._get_info(disease_name)
+        return list(info.precautions) if info else []
     
     def get_workout(self, disease_name):
         """Retourne les recommandations d'exercice pour la maladie"""
-        if self.workout_data is None:
-            return []
-        
-        if 'disease' not in self.workout_data.columns or disease_name not in self.workout_data['disease'].values:
-            return []
-        
-        # Récupérer toutes les activités physiques pour cette maladie
-        workout_rows = self.workout_data[self.workout_data['disease'] == disease_name]
-        return workout_rows['workout'].tolist()
+        info = self._get_info(disease_name)
+        return list(info.workout) if info else []
     
     def save_model(self, model_path="disease_model.joblib"):
         """Sauvegarde le modèle sur disque"""
@@ -228,9 +526,12 @@ class DiseasePredictor:
         print(f"✅ Modèle sauvegardé à {model_path}")
     
     def load_model(self, model_path="disease_model.joblib"):
-        """Charge un modèle préentraîné depuis le disque"""
+        """
+        Charge un modèle préentraîné depuis le disque. En cas d'échec (fichier illisible,
+        modèle incompatible), le modèle précédent reste en service et False est retourné.
+        """
         try:
-            self.model = joblib.load(model_path)
+            self._set_model(joblib.load(model_path))
             print("✅ Modèle chargé avec succès")
         except Exception as e:
             print(f"❌ Impossible de charger le modèle depuis {model_path}: {e}")
@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold
+
+from forest_engine import FlatForest
+from mdel_SVM import SVMBackend
+from symptom_matrix import load_symptom_matrix
+
+
+def make_random_forest(n_estimators=100, max_depth=None):
+    """Forêt aléatoire (configuration actuelle de DiseasePredictor par défaut)"""
+    return RandomForestClassifier(n_estimators=n_estimators, max_depth=max_depth, random_state=42)
+
+
+def make_svm(C=1.0, gamma="scale"):
+    """SVM RBF avec normalisation (backend de mdel_SVM.py)"""
+    return SVMBackend(C=C, gamma=gamma, random_state=42)
+
+
+# Familles et hyperparamètres évalués : {nom: (fabrique, paramètres)}
+CANDIDATES = {
+    "rf_50": (make_random_forest, {"n_estimators": 50}),
+    "rf_100": (make_random_forest, {"n_estimators": 100}),
+    "rf_200": (make_random_forest, {"n_estimators": 200}),
+    "rf_100_depth20": (make_random_forest, {"n_estimators": 100, "max_depth": 20}),
+    "svm_c1": (make_svm, {"C": 1.0}),
+    "svm_c10": (make_svm, {"C": 10.0}),
+}
+
+# Données partagées par chaque processus du pool (chargées une fois par processus)
+_worker_data = None
+
+
+def _init_worker(data_path):
+    global _worker_data
+    data = load_symptom_matrix(data_path)
+    _worker_data = (np.asarray(data.matrix), data.labels)
+
+
+def _serving_predict_proba(model, inference_backend):
+    """Fonction de prédiction telle que DiseasePredictor l'utiliserait pour ce modèle"""
+    if inference_backend == "numpy" and isinstance(model, RandomForestClassifier):
+        return FlatForest.from_sklearn(model).predict_proba
+    return model.predict_proba
+
+
+def _evaluate_fold(name, train_index, test_index, latency_samples, inference_backend):
+    """Entraîne un candidat sur un pli et mesure précision, temps d'entraînement, latence et taille"""
+    X, y = _worker_data
+    factory, params = CANDIDATES[name]
+    model = factory(**params)
+
+    start = time.perf_counter()
+    model.fit(X[train_index], y[train_index])
+    fit_time = time.perf_counter() - start
+
+    accuracy = float(np.mean(model.predict(X[test_index]) == y[test_index]))
+
+    # Latence d'une requête unitaire (une ligne, comme DiseasePredictor.predict)
+    predict_proba = _serving_predict_proba(model, inference_backend)
+    latencies = []
+    for i in test_index[:latency_samples]:
+        start = time.perf_counter()
+        predict_proba(X[i:i + 1])
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "candidate": name,
+        "accuracy": accuracy,
+        "fit_seconds": fit_time,
+        "latency_ms_p50": float(np.percentile(latencies, 50) * 1000),
+        "latency_ms_p99": float(np.percentile(latencies, 99) * 1000),
+        "model_bytes": len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)),
+    }
+
+
+def evaluate_candidates(data_path, candidates, folds=5, workers=None, latency_samples=50,
+                        inference_backend="numpy"):
+    """
+    Validation croisée de tous les candidats, chaque (candidat, pli) étant évalué dans
+    un processus du pool
+
+    Returns:
+        Liste de résultats agrégés par candidat
+    """
+    data = load_symptom_matrix(data_path)
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
+    splits = list(splitter.split(np.zeros(len(data.label_codes)), data.label_codes))
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                             initializer=_init_worker, initargs=(data_path,)) as pool:
+        futures = [pool.submit(_evaluate_fold, name, train, test, latency_samples, inference_backend)
+                   for name in candidates for train, test in splits]
+        fold_results = [future.result() for future in futures]
+
+    results = []
+    for name in candidates:
+        rows = [r for r in fold_results if r["candidate"] == name]
+        results.append({
+            "candidate": name,
+            "params": CANDIDATES[name][1],
+            "accuracy_mean": float(np.mean([r["accuracy"] for r in rows])),
+            "accuracy_std": float(np.std([r["accuracy"] for r in rows])),
+            "fit_seconds": float(np.mean([r["fit_seconds"] for r in rows])),
+            "latency_ms_p50": float(np.median([r["latency_ms_p50"] for r in rows])),
+            "latency_ms_p99": float(np.max([r["latency_ms_p99"] for r in rows])),
+            "model_bytes": int(np.mean([r["model_bytes"] for r in rows])),
+        })
+    return results
+
+
+def select_best(results, max_latency_ms=None, tolerance=0.001):
+    """
+    Choisit le meilleur compromis précision/latence : parmi les candidats respectant la
+    latence maximale, ceux à moins de `tolerance` de la meilleure précision, puis le plus rapide
+    """
+    eligible = [r for r in results if max_latency_ms is None or r["latency_ms_p50"] <= max_latency_ms]
+    if not eligible:
+        raise ValueError(f"Aucun candidat sous {max_latency_ms} ms de latence")
+    best_accuracy = max(r["accuracy_mean"] for r in eligible)
+    close = [r for r in eligible if r["accuracy_mean"] >= best_accuracy - tolerance]
+    return min(close, key=lambda r: (r["latency_ms_p50"], r["model_bytes"]))
+
+
+def train_and_save(data_path, name, output_path):
+    """Réentraîne le candidat choisi sur toutes les données et l'enregistre pour DiseasePredictor"""
+    data = load_symptom_matrix(data_path)
+    factory, params = CANDIDATES[name]
+    model = factory(**params)
+    model.fit(pd.DataFrame(data.matrix, columns=data.symptoms, copy=False), data.labels)
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = output_path + ".tmp"
+    joblib.dump(model, tmp_path)
+    os.replace(tmp_path, output_path)
+    print(f"✅ Modèle {name} sauvegardé à {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sélection du modèle par validation croisée parallèle")
+    parser.add_argument("--data", default="data/maladies_symptomes_binary.csv")
+    parser.add_argument("--candidates", nargs="*", default=list(CANDIDATES), choices=list(CANDIDATES))
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None, help="Processus du pool (défaut : tous les cœurs)")
+    parser.add_argument("--max-latency-ms", type=float, default=None)
+    parser.add_argument("--backend", choices=["sklearn", "numpy"], default="numpy",
+                        help="Backend d'inférence utilisé pour mesurer la latence des forêts")
+    parser.add_argument("--output", default="models/disease_model.joblib",
+                        help="Artefact chargé par DiseasePredictor (model_path / MODEL_PATH)")
+    parser.add_argument("--report", help="Fichier JSON des résultats")
+    args = parser.parse_args()
+
+    results = evaluate_candidates(args.data, args.candidates, folds=args.folds, workers=args.workers,
+                                  inference_backend=args.backend)
+    best = select_best(results, max_latency_ms=args.max_latency_ms)
+
+    print(f"\n{'candidat':<16} {'précision':>10} {'fit (s)':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'taille':>10}")
+    for r in sorted(results, key=lambda r: -r["accuracy_mean"]):
+        marker = " *" if r is best else ""
+        print(f"{r['candidate']:<16} {r['accuracy_mean']:>10.4f} {r['fit_seconds']:>8.2f} "
+              f"{r['latency_ms_p50']:>9.2f} {r['latency_ms_p99']:>9.2f} {r['model_bytes']:>10}{marker}")
+
+    train_and_save(args.data, best["candidate"], args.output)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"best": best["candidate"], "results": results}, f, indent=2)
+        print(f"✅ Résultats écrits dans {args.report}")
+
+
+if __name__ == "__main__":
+    main()
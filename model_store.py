@@ -0,0 +1,58 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import sklearn
+
+
+class ModelArtifactStore:
+    """
+    Cache disque des modèles entraînés.
+
+    Chaque artefact est identifié par une empreinte du fichier d'entraînement, des
+    paramètres d'entraînement et de la version de scikit-learn : le modèle n'est
+    réentraîné que si l'un d'eux change.
+    """
+
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, directory="models"):
+        self.directory = directory
+
+    def artifact_key(self, data_path, params):
+        """Calcule l'empreinte (sha256) des données et des paramètres d'entraînement"""
+        digest = hashlib.sha256()
+        # Un CSV, ou tous les fichiers d'un répertoire au format binaire
+        if os.path.isdir(data_path):
+            files = [os.path.join(data_path, name) for name in sorted(os.listdir(data_path))]
+        else:
+            files = [data_path]
+        for file_path in files:
+            digest.update(os.path.basename(file_path).encode("utf-8"))
+            with open(file_path, "rb") as f:
+                for block in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                    digest.update(block)
+        metadata = {"params": params, "sklearn": sklearn.__version__}
+        digest.update(json.dumps(metadata, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()[:20]
+
+    def artifact_path(self, data_path, params):
+        """Chemin de l'artefact correspondant à ces données et paramètres"""
+        key = self.artifact_key(data_path, params)
+        return os.path.join(self.directory, f"disease_model-{key}.joblib")
+
+    def save(self, predictor, artifact_path):
+        """
+        Sauvegarde le modèle du prédicteur de façon atomique : un worker qui démarre
+        en parallèle ne peut jamais lire un fichier à moitié écrit.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            predictor.save_model(tmp_path)
+            os.replace(tmp_path, artifact_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
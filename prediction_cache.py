@@ -0,0 +1,70 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PredictionCache:
+    """
+    Cache LRU borné et thread-safe des sorties du modèle.
+
+    La clé est le vecteur de symptômes compacté en bits (132 symptômes -> 17 octets),
+    la valeur le couple (maladie prédite, score de confiance).
+    """
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def keys_for(input_matrix):
+        """Retourne une clé (bytes) par ligne de la matrice binaire de symptômes"""
+        packed = np.packbits(np.asarray(input_matrix) != 0, axis=1)
+        return [row.tobytes() for row in packed]
+
+    def get(self, key):
+        """Retourne la valeur en cache ou None, et met à jour l'ordre LRU"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Ajoute une valeur et évince les entrées les moins récemment utilisées"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vide le cache (appelé quand le modèle ou les données sont rechargés)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Compteurs du cache"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._entries)
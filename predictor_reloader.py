@@ -0,0 +1,208 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+import metrics
+
+
+def validate_predictor(predictor, sample_size=50, min_accuracy=0.9):
+    """
+    Vérifie qu'un prédicteur fraîchement construit est utilisable avant de le mettre en service :
+    il doit retrouver la maladie d'un échantillon de lignes d'entraînement. Ces premières
+    prédictions servent aussi de préchauffage.
+
+    Raises:
+        ValueError: si le prédicteur est inutilisable
+    """
+    if predictor.model is None:
+        raise ValueError("Aucun modèle chargé")
+    data = predictor.symptom_data
+    n_rows = data.matrix.shape[0]
+    if n_rows == 0:
+        raise ValueError("Jeu de données vide")
+
+    rows = np.linspace(0, n_rows - 1, num=min(sample_size, n_rows), dtype=int)
+    symptom_lists = [[s for s, flag in zip(predictor.all_symptoms, data.matrix[row]) if flag] for row in rows]
+    results = predictor.predict_batch(symptom_lists)
+    expected = data.labels[rows]
+    accuracy = float(np.mean([r["disease"] == e for r, e in zip(results, expected)]))
+    if accuracy < min_accuracy:
+        raise ValueError(f"Précision de validation insuffisante: {accuracy:.2%} < {min_accuracy:.0%}")
+    return accuracy
+
+
+class PredictorReloader:
+    """
+    Rechargement à chaud du prédicteur (modèle et CSV de référence) sans interruption.
+
+    Le nouvel état est construit et validé en arrière-plan pendant que l'ancien continue
+    de servir, puis substitué par une simple affectation de `current` (atomique). Chaque
+    requête lit `current` une seule fois : les requêtes en cours terminent sur l'ancien
+    état, qui est libéré quand plus aucune ne le référence.
+    """
+
+    def __init__(self, factory, watch_paths=(), validate=None):
+        """
+        Args:
+            factory: Fonction sans argument qui construit un nouvel état (prédicteur, catalogue...)
+            watch_paths: Fichiers ou répertoires surveillés par start_watcher
+            validate: Fonction appelée sur le nouvel état avant la substitution ; une
+                exception annule le rechargement (l'ancien état reste en service)
+        """
+        self.factory = factory
+        self.watch_paths = [path for path in watch_paths if path]
+        self.validate = validate
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+        self._notified = None
+        self.generation = 0
+        self.reloads = 0
+        self.failures = 0
+        self.last_reload_seconds = None
+        self.last_swap_seconds = None
+        self.last_swap_at = None
+        self.last_error = None
+        self.reloading = False
+
+        self.current = factory()
+        if validate is not None:
+            validate(self.current)
+        self._snapshot = self._fingerprint()
+
+    def _fingerprint(self):
+        """(chemin, mtime, taille) de chaque fichier surveillé"""
+        fingerprint = []
+        for path in self.watch_paths:
+            files = [path]
+            if os.path.isdir(path):
+                files = [os.path.join(path, name) for name in sorted(os.listdir(path))]
+            for file_path in files:
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    fingerprint.append((file_path, None, None))
+                    continue
+                fingerprint.append((file_path, stat.st_mtime_ns, stat.st_size))
+        return tuple(fingerprint)
+
+    def reload(self, reason="manual"):
+        """
+        Construit, valide puis met en service un nouvel état. Un seul rechargement à la fois :
+        retourne False immédiatement si un autre est déjà en cours.
+
+        Returns:
+            True si le nouvel état est en service, False sinon
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        self.reloading = True
+        return self._reload_locked(reason)
+
+    def _reload_locked(self, reason):
+        """Corps du rechargement, appelé verrou pris ; libère le verrou en sortant"""
+        try:
+            snapshot = self._fingerprint()
+            start = time.perf_counter()
+            try:
+                state = self.factory()
+                if self.validate is not None:
+                    self.validate(state)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                metrics.inc("predictor_reloads_total", status="failed", reason=reason)
+                print(f"❌ Rechargement du prédicteur annulé ({reason}): {self.last_error}")
+                return False
+
+            swap_start = time.perf_counter()
+            self.current = state
+            self.last_swap_seconds = time.perf_counter() - swap_start
+            self.last_swap_at = swap_start
+
+            self._snapshot = snapshot
+            self.generation += 1
+            self.reloads += 1
+            self.last_error = None
+            self.last_reload_seconds = time.perf_counter() - start
+            metrics.inc("predictor_reloads_total", status="ok", reason=reason)
+            metrics.observe("predictor_reload_seconds", self.last_reload_seconds)
+            print(f"✅ Prédicteur rechargé ({reason}) en {self.last_reload_seconds:.2f} s, "
+                  f"génération {self.generation}")
+            return True
+        finally:
+            self.reloading = False
+            self._reload_lock.release()
+
+    def reload_async(self, reason="manual"):
+        """
+        Lance un rechargement en arrière-plan ; False si un rechargement est déjà en cours.
+        Le verrou est pris avant de rendre la main : deux appels simultanés ne peuvent pas
+        tous deux réussir, et stats() indique "reloading" dès le retour. L'issue du
+        rechargement se lit ensuite dans stats() (failures, last_error).
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        self.reloading = True
+        try:
+            threading.Thread(target=self._reload_locked, args=(reason,),
+                             name="predictor-reload", daemon=True).start()
+        except Exception:
+            self.reloading = False
+            self._reload_lock.release()
+            raise
+        return True
+
+    def check_for_changes(self, on_change=None):
+        """
+        Recharge si un fichier surveillé a changé depuis le dernier rechargement réussi.
+
+        Args:
+            on_change: Appelé à la place du rechargement (une seule fois par nouvel état
+                des fichiers), quand le rechargement a lieu ailleurs (maître pré-fork)
+        """
+        fingerprint = self._fingerprint()
+        if fingerprint == self._snapshot:
+            return False
+        if on_change is None:
+            return self.reload(reason="watcher")
+        if fingerprint != self._notified:
+            self._notified = fingerprint
+            on_change()
+            return True
+        return False
+
+    def start_watcher(self, interval=2.0, on_change=None):
+        """Surveille les fichiers (par scrutation de mtime/taille) dans un thread d'arrière-plan"""
+        if self._watcher is not None:
+            return
+
+        def watch():
+            while not self._stop.wait(interval):
+                try:
+                    self.check_for_changes(on_change)
+                except Exception as e:
+                    print(f"⚠️ Erreur du surveillant de fichiers: {e}")
+
+        self._watcher = threading.Thread(target=watch, name="predictor-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+        self._stop.clear()
+
+    def stats(self):
+        return {
+            "generation": self.generation,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "reloading": self.reloading,
+            "last_reload_seconds": self.last_reload_seconds,
+            "last_swap_seconds": self.last_swap_seconds,
+            "last_error": self.last_error,
+        }
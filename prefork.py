@@ -0,0 +1,51 @@
+import gc
+import resource
+
+# Champs de /proc/<pid>/smaps_rollup (en kB) retenus pour le rapport mémoire
+_SMAPS_FIELDS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared",
+    "Shared_Dirty": "shared",
+    "Private_Clean": "private",
+    "Private_Dirty": "private",
+}
+
+
+def process_memory(pid="self"):
+    """
+    Mémoire d'un processus en octets : rss (résidente), pss (part proportionnelle des pages
+    partagées), shared (pages partagées avec d'autres processus, dont le maître) et private
+    (pages propres au processus, c'est-à-dire le coût réel d'un worker supplémentaire).
+    Hors Linux, seul le pic de rss est disponible.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            lines = f.readlines()
+    except OSError:
+        return {"rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}
+
+    memory = {"rss": 0, "pss": 0, "shared": 0, "private": 0}
+    for line in lines:
+        field, _, value = line.partition(":")
+        if field in _SMAPS_FIELDS:
+            memory[_SMAPS_FIELDS[field]] += int(value.split()[0]) * 1024
+    return memory
+
+
+def format_memory(memory):
+    return "  ".join(f"{name}={value / 2**20:.1f} Mo" for name, value in memory.items())
+
+
+def freeze_shared_state():
+    """
+    Prépare le tas du processus parent pour le partage copy-on-write (maître gunicorn,
+    processus principal de bulk_score) : après un ramassage complet, gc.freeze() place
+    tous les objets existants (modèle, index, catalogue) dans une génération permanente
+    que le ramasse-miettes des processus enfants ne parcourt plus, donc n'écrit plus.
+    Les tableaux NumPy (moteur FlatForest, matrice des symptômes) restent des blocs
+    contigus que les enfants lisent sans les copier.
+    """
+    gc.unfreeze()
+    gc.collect()
+    gc.freeze()
@@ -0,0 +1,90 @@
+import numpy as np
+from scipy import sparse
+
+# Fréquence minimale d'un symptôme chez une maladie pour appartenir à son profil
+MIN_PROFILE_FREQUENCY = 0.1
+
+
+class SimilarityEngine:
+    """
+    Profils maladie x symptôme précalculés en matrice creuse (CSR) : une entrée est comparée
+    à toutes les maladies en un seul produit matriciel, ce qui reste rapide avec des
+    milliers de maladies.
+
+    Chaque symptôme est pondéré par sa gravité (Symptom-severity.csv). Pour une entrée x et
+    le profil p d'une maladie, avec w(A) la somme des poids de l'ensemble A :
+        jaccard   = w(x ∩ p) / w(x ∪ p)
+        coverage  = w(x ∩ p) / w(p)   (part du profil de la maladie retrouvée)
+        precision = w(x ∩ p) / w(x)   (part des symptômes saisis expliquée par la maladie)
+    """
+
+    METRICS = ("jaccard", "coverage", "precision")
+
+    def __init__(self, diseases, symptoms, profiles, weights=None):
+        """
+        Args:
+            diseases: Noms des maladies (lignes des profils)
+            symptoms: Noms des symptômes (colonnes des profils)
+            profiles: Matrice 0/1 (maladies x symptômes), dense ou creuse
+            weights: Poids de chaque symptôme (None = 1 ; les poids absents reçoivent la
+                médiane des poids connus)
+        """
+        self.diseases = np.asarray(diseases, dtype=object)
+        self.symptoms = list(symptoms)
+        self.positions = {disease: i for i, disease in enumerate(self.diseases)}
+        self.profiles = sparse.csr_matrix(profiles, dtype=np.float32)
+
+        known = [w for w in (weights or []) if w is not None]
+        default = float(np.median(known)) if known else 1.0
+        self.weights = np.array([default if w is None else w for w in (weights or [None] * len(self.symptoms))],
+                                dtype=np.float32)
+        self.weighted_profiles = self.profiles.multiply(self.weights).tocsr()
+        self.profile_weights = np.asarray(self.weighted_profiles.sum(axis=1)).ravel()
+
+    @classmethod
+    def from_statistics(cls, statistics, weights=None, min_frequency=MIN_PROFILE_FREQUENCY):
+        """Profil d'une maladie : symptômes présents dans au moins `min_frequency` de ses lignes"""
+        observed = statistics.counts / np.maximum(statistics.disease_rows, 1)[:, None]
+        return cls(statistics.diseases, statistics.symptoms, observed >= min_frequency, weights)
+
+    def intersections(self, input_matrix):
+        """Poids des symptômes communs à chaque entrée et à chaque maladie (entrées x maladies)"""
+        return np.asarray(self.weighted_profiles @ np.asarray(input_matrix, dtype=np.float32).T).T
+
+    def scores(self, input_matrix, metric="jaccard"):
+        """Score de similarité de chaque entrée avec chaque maladie (entrées x maladies)"""
+        if metric not in self.METRICS:
+            raise ValueError(f"Métrique inconnue: {metric}")
+        input_matrix = np.asarray(input_matrix, dtype=np.float32)
+        shared = self.intersections(input_matrix)
+        if metric == "coverage":
+            denominator = np.broadcast_to(self.profile_weights, shared.shape)
+        else:
+            input_weights = (input_matrix @ self.weights)[:, None]
+            if metric == "precision":
+                denominator = np.broadcast_to(input_weights, shared.shape)
+            else:
+                denominator = input_weights + self.profile_weights - shared
+        return np.divide(shared, denominator, out=np.zeros_like(shared), where=denominator > 0)
+
+    def predict_proba(self, input_matrix, metric="jaccard"):
+        """Scores normalisés en distribution par entrée (uniforme si aucun symptôme ne correspond)"""
+        scores = self.scores(input_matrix, metric)
+        totals = scores.sum(axis=1, keepdims=True)
+        uniform = np.full_like(scores, 1.0 / max(1, scores.shape[1]))
+        return np.divide(scores, totals, out=uniform, where=totals > 0)
+
+    def top_k(self, input_matrix, k=5, metric="jaccard"):
+        """
+        Les k maladies les plus similaires à chaque entrée
+
+        Returns:
+            Par entrée, liste de (maladie, score) par score décroissant
+        """
+        scores = self.scores(input_matrix, metric)
+        k = min(k, scores.shape[1])
+        top = np.argpartition(scores, -k, axis=1)[:, -k:]
+        order = np.take_along_axis(scores, top, axis=1).argsort(axis=1)[:, ::-1]
+        top = np.take_along_axis(top, order, axis=1)
+        return [[(self.diseases[i], float(row_scores[i])) for i in row]
+                for row, row_scores in zip(top, scores)]
@@ -2,112 +2,69 @@
 document.addEventListener('DOMContentLoaded', function() {
     // Initialisation des variables
     const symptomSearch = document.getElementById('symptomSearch');
-    const symptomItems = document.querySelectorAll('.symptom-item');
+    const symptomList = document.getElementById('symptomList');
+    let symptomItems = [];
     const selectedSymptomsContainer = document.getElementById('selectedSymptomsContainer');
     const analyzeButton = document.getElementById('analyzeButton');
     const diagnosisForm = document.getElementById('diagnosisForm');
     const loaderContainer = document.getElementById('loaderContainer');
     const resultSection = document.getElementById('resultSection');
     
-    // Gestion de la recherche de symptômes
-    if (symptomSearch) {
-        symptomSearch.addEventListener('input', function() {
-            const searchTerm = this.value.toLowerCase().trim();
-            
-            symptomItems.forEach(function(item) {
-                const label = item.querySelector('label');
-                const symptomText = label.textContent.toLowerCase();
-                
-                if (symptomText.includes(searchTerm)) {
-                    item.style.display = '';  // Afficher l'élément
-                } else {
-                    item.style.display = 'none';  // Masquer l'élément
-                }
-            });
-        });
-
-        // Créer le conteneur d'image qui sera utilisé pour toutes les images au survol
-        const imageContainer = document.createElement('div');
-        imageContainer.id = 'hover-image-container';
-        
-        const hoverImage = document.createElement('img');
-        hoverImage.id = 'hover-image';
-        
-        imageContainer.appendChild(hoverImage);
-        document.body.appendChild(imageContainer);
-        
-        // Configuration des images au survol des symptômes
-        const symptomItemsWithImages = document.querySelectorAll('.symptom-item');
-        
-        symptomItemsWithImages.forEach(item => {
-            // Récupérer l'URL de l'image de l'élément symptôme
-            const originalImg = item.querySelector('.symptom-hover-image');
-            let imgSrc = '';
-            
-            if (originalImg) {
-                imgSrc = originalImg.getAttribute('src');
-            }
-            
-            // Si l'image existe, configurer les événements de survol
-            if (imgSrc) {
-                item.addEventListener('mouseenter', function(e) {
-                    // Configurer l'image
-                    hoverImage.setAttribute('src', imgSrc);
-                    imageContainer.style.display = 'block';
-                    
-                    // Positionner l'image près du curseur mais en s'assurant qu'elle est entièrement visible
-                    updateImagePosition(e);
-                });
-                
-                item.addEventListener('mousemove', updateImagePosition);
-                
-                item.addEventListener('mouseleave', function() {
-                    imageContainer.style.display = 'none';
-                });
-            }
-        });
-        
-        // Fonction pour mettre à jour la position de l'image en fonction du curseur
-        function updateImagePosition(e) {
-            const x = e.clientX;
-            const y = e.clientY;
-            
-            // Obtenir les dimensions de la fenêtre
-            const windowWidth = window.innerWidth;
-            const windowHeight = window.innerHeight;
-            
-            // Obtenir les dimensions de l'image
-            const imgWidth = 200; // Même largeur que définie dans le CSS
-            const imgHeight = 150; // Hauteur maximale définie dans le CSS
-            
-            // Calculer la position pour s'assurer que l'image reste dans la fenêtre
-            let posX = x + 20; // 20px à droite du curseur par défaut
-            let posY = y - imgHeight / 2; // Centré verticalement par rapport au curseur
-            
-            // Vérifier si l'image dépasse à droite
-            if (posX + imgWidth > windowWidth) {
-                posX = x - imgWidth - 20; // Placer à gauche du curseur
-            }
-            
-            // Vérifier si l'image dépasse en haut ou en bas
-            if (posY < 0) {
-                posY = 0;
-            } else if (posY + imgHeight > windowHeight) {
-                posY = windowHeight - imgHeight;
+    // Créer le conteneur d'image qui sera utilisé pour toutes les images au survol
+    const imageContainer = document.createElement('div');
+    imageContainer.id = 'hover-image-container';
+    
+    const hoverImage = document.createElement('img');
+    hoverImage.id = 'hover-image';
+    
+    imageContainer.appendChild(hoverImage);
+    document.body.appendChild(imageContainer);
+    
+    // Catalogue des symptômes : ressource JSON versionnée, mise en cache par le navigateur
+    async function loadSymptomCatalog() {
+        if (!symptomList) {
+            return;
+        }
+        try {
+            const response = await fetch(symptomList.dataset.catalogUrl);
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
             }
-            
-            // Appliquer la position
-            imageContainer.style.left = posX + 'px';
-            imageContainer.style.top = posY + 'px';
+            const catalog = await response.json();
+            renderSymptomList(catalog.symptoms);
+        } catch (error) {
+            console.error('Erreur lors du chargement des symptômes:', error);
+            symptomList.innerHTML = '<p class="text-muted">Impossible de charger la liste des symptômes.</p>';
         }
     }
     
-    // ... [Reste du code de sélection des symptômes] ...
+    // Construit la liste des symptômes à partir du catalogue
+    function renderSymptomList(symptoms) {
+        const fragment = document.createDocumentFragment();
+        symptoms.forEach(function(entry) {
+            const item = document.createElement('div');
+            item.className = 'symptom-item';
+            item.style.position = 'relative';
+            
+            const label = document.createElement('label');
+            const checkbox = document.createElement('input');
+            checkbox.type = 'checkbox';
+            checkbox.name = 'symptoms';
+            checkbox.value = entry.symptom;
+            label.appendChild(checkbox);
+            label.appendChild(document.createTextNode(' ' + entry.label));
+            item.appendChild(label);
+            
+            setupSymptomItem(item, checkbox, entry.url);
+            fragment.appendChild(item);
+        });
+        symptomList.innerHTML = '';
+        symptomList.appendChild(fragment);
+        symptomItems = Array.from(symptomList.querySelectorAll('.symptom-item'));
+    }
     
-    // Code existant pour les symptômes
-    symptomItems.forEach(function(item) {
-        const checkbox = item.querySelector('input[type="checkbox"]');
-        
+    // Sélection au clic et image au survol d'un symptôme
+    function setupSymptomItem(item, checkbox, imgSrc) {
         item.addEventListener('click', function(e) {
             if (e.target === checkbox) {
                 return;
@@ -128,7 +85,116 @@ document.addEventListener('DOMContentLoaded', function() {
         checkbox.addEventListener('change', function(e) {
             e.stopPropagation();
         });
-    });
+        
+        // Si l'image existe, configurer les événements de survol
+        if (imgSrc) {
+            item.addEventListener('mouseenter', function(e) {
+                // Configurer l'image
+                hoverImage.setAttribute('src', imgSrc);
+                imageContainer.style.display = 'block';
+                
+                // Positionner l'image près du curseur mais en s'assurant qu'elle est entièrement visible
+                updateImagePosition(e);
+            });
+            
+            item.addEventListener('mousemove', updateImagePosition);
+            
+            item.addEventListener('mouseleave', function() {
+                imageContainer.style.display = 'none';
+            });
+        }
+    }
+    
+    // Fonction pour mettre à jour la position de l'image en fonction du curseur
+    function updateImagePosition(e) {
+        const x = e.clientX;
+        const y = e.clientY;
+        
+        // Obtenir les dimensions de la fenêtre
+        const windowWidth = window.innerWidth;
+        const windowHeight = window.innerHeight;
+        
+        // Obtenir les dimensions de l'image
+        const imgWidth = 200; // Même largeur que définie dans le CSS
+        const imgHeight = 150; // Hauteur maximale définie dans le CSS
+        
+        // Calculer la position pour s'assurer que l'image reste dans la fenêtre
+        let posX = x + 20; // 20px à droite du curseur par défaut
+        let posY = y - imgHeight / 2; // Centré verticalement par rapport au curseur
+        
+        // Vérifier si l'image dépasse à droite
+        if (posX + imgWidth > windowWidth) {
+            posX = x - imgWidth - 20; // Placer à gauche du curseur
+        }
+        
+        // Vérifier si l'image dépasse en haut ou en bas
+        if (posY < 0) {
+            posY = 0;
+        } else if (posY + imgHeight > windowHeight) {
+            posY = windowHeight - imgHeight;
+        }
+        
+        // Appliquer la position
+        imageContainer.style.left = posX + 'px';
+        imageContainer.style.top = posY + 'px';
+    }
+    
+    // Gestion de la recherche de symptômes
+    if (symptomSearch) {
+        // Filtrage local, utilisé si le serveur ne répond pas
+        function filterSymptomsLocally(searchTerm) {
+            symptomItems.forEach(function(item) {
+                const label = item.querySelector('label');
+                const symptomText = label.textContent.toLowerCase();
+                item.style.display = symptomText.includes(searchTerm) ? '' : 'none';
+            });
+        }
+
+        // Affiche uniquement les symptômes suggérés par le serveur (alias, synonymes, fautes de frappe)
+        function showSuggestedSymptoms(suggestions) {
+            const suggested = new Set(suggestions.map(s => s.symptom));
+            symptomItems.forEach(function(item) {
+                const checkbox = item.querySelector('input[type="checkbox"]');
+                item.style.display = suggested.has(checkbox.value) ? '' : 'none';
+            });
+        }
+
+        let searchTimer = null;
+        let searchController = null;
+        symptomSearch.addEventListener('input', function() {
+            const searchTerm = this.value.toLowerCase().trim();
+            clearTimeout(searchTimer);
+            if (searchController) {
+                searchController.abort();
+            }
+
+            if (!searchTerm) {
+                symptomItems.forEach(item => item.style.display = '');
+                return;
+            }
+
+            searchTimer = setTimeout(async function() {
+                searchController = new AbortController();
+                try {
+                    const response = await fetch(
+                        `/api/symptoms/suggest?q=${encodeURIComponent(searchTerm)}&limit=${symptomItems.length}`,
+                        { signal: searchController.signal }
+                    );
+                    if (!response.ok) {
+                        throw new Error(`HTTP ${response.status}`);
+                    }
+                    const data = await response.json();
+                    showSuggestedSymptoms(data.suggestions);
+                } catch (error) {
+                    if (error.name !== 'AbortError') {
+                        filterSymptomsLocally(searchTerm);
+                    }
+                }
+            }, 100);
+        });
+    }
+    
+    loadSymptomCatalog();
     
     // Fonction pour ajouter un symptôme sélectionné
     function addSelectedSymptom(symptomName) {
@@ -215,18 +281,12 @@ document.addEventListener('DOMContentLoaded', function() {
         messageDiv.textContent = text;
         chatbotBody.appendChild(messageDiv);
         chatbotBody.scrollTop = chatbotBody.scrollHeight;
+        return messageDiv;
     }
 
-    // Fonction pour appeler l'API de chat
+    // Fonction pour appeler l'API de chat (mode non streaming, utilisé en secours)
     async function fetchChatResponse(message) {
         try {
-            // Afficher un indicateur de chargement
-            const loadingDiv = document.createElement('div');
-            loadingDiv.className = 'message bot';
-            loadingDiv.innerHTML = '<em>Réflexion en cours...</em>';
-            chatbotBody.appendChild(loadingDiv);
-            chatbotBody.scrollTop = chatbotBody.scrollHeight;
-            
             const response = await fetch('/chat', {
                 method: 'POST',
                 headers: {
@@ -235,9 +295,6 @@ document.addEventListener('DOMContentLoaded', function() {
                 body: JSON.stringify({ message: message }),
             });
             
-            // Supprimer l'indicateur de chargement
-            chatbotBody.removeChild(loadingDiv);
-            
             if (!response.ok) {
                 throw new Error(`Erreur HTTP: ${response.status}`);
             }
@@ -250,6 +307,50 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
+    // Fonction pour recevoir la réponse en streaming (Server-Sent Events) et l'afficher au fil de l'eau
+    async function streamChatResponse(message, messageDiv) {
+        const response = await fetch('/chat/stream', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ message: message }),
+        });
+        
+        if (!response.ok || !response.body) {
+            throw new Error(`Erreur HTTP: ${response.status}`);
+        }
+        
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let text = '';
+        
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            
+            // Les événements SSE sont séparés par une ligne vide
+            let separator;
+            while ((separator = buffer.indexOf('\n\n')) !== -1) {
+                const event = buffer.slice(0, separator);
+                buffer = buffer.slice(separator + 2);
+                
+                if (event.startsWith('event: done')) {
+                    return text;
+                }
+                const dataLine = event.split('\n').find(line => line.startsWith('data: '));
+                if (dataLine) {
+                    text += JSON.parse(dataLine.slice(6)).text;
+                    messageDiv.textContent = text;
+                    chatbotBody.scrollTop = chatbotBody.scrollHeight;
+                }
+            }
+        }
+        return text;
+    }
+
     // Fonction pour envoyer un message au chatbot
     async function sendChatMessage() {
         const message = chatbotInput.value.trim();
@@ -259,9 +360,22 @@ document.addEventListener('DOMContentLoaded', function() {
         addChatMessage(message, true);
         chatbotInput.value = '';
         
-        // Obtenir une réponse de l'API
-        const botResponse = await fetchChatResponse(message);
-        addChatMessage(botResponse);
+        // Afficher un indicateur de chargement jusqu'au premier fragment
+        const botDiv = addChatMessage('');
+        botDiv.innerHTML = '<em>Réflexion en cours...</em>';
+        
+        let received = '';
+        try {
+            received = await streamChatResponse(message, botDiv);
+        } catch (error) {
+            console.error('Streaming indisponible, utilisation du mode classique:', error);
+        }
+        
+        // Mode non streaming en secours si aucun fragment n'a été reçu
+        if (!received) {
+            botDiv.textContent = await fetchChatResponse(message);
+            chatbotBody.scrollTop = chatbotBody.scrollHeight;
+        }
     }
 
     // Gestionnaires d'événements pour le chatbot
@@ -296,13 +410,4 @@ document.addEventListener('DOMContentLoaded', function() {
         }, 500);
     }
     // FIN DU CODE CORRIGÉ POUR LE CHATBOT
-
-    // Initialisation des éléments sélectionnés au chargement de la page
-    const selectedItems = document.querySelectorAll('.symptom-item input[type="checkbox"]:checked');
-    selectedItems.forEach(checkbox => {
-        const item = checkbox.closest('.symptom-item');
-        item.classList.add('selected');
-        const symptomName = item.querySelector('label').textContent.trim();
-        addSelectedSymptom(symptomName);
-    });
 });
\ No newline at end of file
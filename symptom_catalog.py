@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+import pandas as pd
+
+
+class SymptomCatalog:
+    """
+    Catalogue des symptômes affichés dans la page (nom, libellé, poids, image), sérialisé
+    une seule fois en JSON.
+
+    Le contenu ne change que si les fichiers sources changent : la version (empreinte du
+    contenu) sert d'ETag et de nom de ressource, ce qui permet au navigateur de le garder
+    en cache indéfiniment.
+    """
+
+    def __init__(self, symptoms, severity_path=None, source_paths=None):
+        """
+        Args:
+            symptoms: Symptômes reconnus par le modèle (all_symptoms)
+            severity_path: Chemin vers Symptom-severity.csv (poids et images, optionnel)
+            source_paths: Fichiers (ou répertoires au format binaire) dont dépend le
+                catalogue, pour Last-Modified (par défaut severity_path)
+        """
+        self.entries = self._build_entries(symptoms, severity_path)
+        content = json.dumps(self.entries, ensure_ascii=False, separators=(",", ":"))
+        self.version = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+        self.body = json.dumps({"version": self.version, "symptoms": self.entries},
+                               ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        paths = source_paths if source_paths is not None else [severity_path]
+        files = []
+        for path in paths:
+            if path and os.path.isdir(path):
+                files += [os.path.join(path, name) for name in os.listdir(path)]
+            elif path:
+                files.append(path)
+        mtimes = [os.path.getmtime(path) for path in files if os.path.exists(path)]
+        self.last_modified = datetime.fromtimestamp(int(max(mtimes)) if mtimes else 0, tz=timezone.utc)
+
+    @staticmethod
+    def _build_entries(symptoms, severity_path):
+        """
+        Symptômes dans l'ordre de Symptom-severity.csv, limités à ceux du modèle (sans
+        doublons), suivis de ceux du modèle absents du fichier
+        """
+        known = set(symptoms)
+        rows = []
+        if severity_path and os.path.exists(severity_path):
+            data = pd.read_csv(severity_path)
+            urls = data['url'] if 'url' in data.columns else [None] * len(data)
+            rows = zip(data['Symptom'], data['weight'], urls)
+
+        entries = []
+        seen = set()
+        for symptom, weight, url in rows:
+            symptom = str(symptom).strip()
+            if symptom not in known or symptom in seen:
+                continue
+            seen.add(symptom)
+            entries.append({
+                "symptom": symptom,
+                "label": symptom.replace('_', ' ').capitalize(),
+                "weight": int(weight) if not pd.isna(weight) else None,
+                "url": url if isinstance(url, str) else None,
+            })
+        for symptom in symptoms:
+            if symptom not in seen:
+                seen.add(symptom)
+                entries.append({
+                    "symptom": symptom,
+                    "label": symptom.replace('_', ' ').capitalize(),
+                    "weight": None,
+                    "url": None,
+                })
+        return entries
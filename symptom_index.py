@@ -0,0 +1,356 @@
+import re
+import unicodedata
+from collections import defaultdict
+from functools import lru_cache
+
+import pandas as pd
+
+# Synonymes (anglais) et alias (français, dont ceux de chatbot_server.py) : {alias: symptôme}
+SYMPTOM_ALIASES = {
+    # Français
+    "fièvre": "high_fever",
+    "fièvre légère": "mild_fever",
+    "maux de tête": "headache",
+    "mal de tête": "headache",
+    "migraine": "headache",
+    "toux": "cough",
+    "fatigue": "fatigue",
+    "courbatures": "muscle_pain",
+    "douleurs musculaires": "muscle_pain",
+    "mal de gorge": "throat_irritation",
+    "congestion nasale": "congestion",
+    "nez bouché": "congestion",
+    "nez qui coule": "runny_nose",
+    "essoufflement": "breathlessness",
+    "douleur thoracique": "chest_pain",
+    "démangeaisons": "itching",
+    "éruption cutanée": "skin_rash",
+    "éternuements": "continuous_sneezing",
+    "frissons": "chills",
+    "vomissements": "vomiting",
+    "nausée": "nausea",
+    "diarrhée": "diarrhoea",
+    "vertiges": "dizziness",
+    "douleurs articulaires": "joint_pain",
+    "mal de ventre": "abdominal_pain",
+    "douleur abdominale": "abdominal_pain",
+    "mal de dos": "back_pain",
+    "perte d'appétit": "loss_of_appetite",
+    "perte de poids": "weight_loss",
+    "prise de poids": "weight_gain",
+    "anxiété": "anxiety",
+    "sueurs": "sweating",
+    "transpiration": "sweating",
+    "déshydratation": "dehydration",
+    "jaunisse": "yellowish_skin",
+    "urine foncée": "dark_urine",
+    "crampes": "cramps",
+    "douleur au cou": "neck_pain",
+    "vision floue": "blurred_and_distorted_vision",
+    "perte d'odorat": "loss_of_smell",
+    # Anglais
+    "fever": "high_fever",
+    "temperature": "high_fever",
+    "tiredness": "fatigue",
+    "shortness of breath": "breathlessness",
+    "sore throat": "throat_irritation",
+    "stuffy nose": "congestion",
+    "blocked nose": "congestion",
+    "rash": "skin_rash",
+    "body aches": "muscle_pain",
+    "diarrhea": "diarrhoea",
+    "stomach ache": "stomach_pain",
+    "heartburn": "acidity",
+    "sneezing": "continuous_sneezing",
+    "throwing up": "vomiting",
+    "jaundice": "yellowish_skin",
+    "dizzy": "dizziness",
+    "itchy skin": "itching",
+    "blurry vision": "blurred_and_distorted_vision",
+}
+
+# Séparateurs d'une saisie libre contenant plusieurs symptômes ; les conjonctions ne
+# séparent qu'en dehors des noms connus ("blurred and distorted vision")
+_SEPARATORS = re.compile(r"[,;/+\n]")
+_CONJUNCTIONS = frozenset(["et", "and"])
+
+# Négations : le symptôme qui suit ("no fever", "pas de fièvre", "sans toux ni fièvre")
+# est nié par le patient et n'est pas retenu
+_NEGATIONS = frozenset(["no", "not", "without", "nor", "sans", "pas", "ni", "aucun", "aucune"])
+# Mots ignorés entre la négation et le symptôme ("pas de", "not any")
+_NEGATION_FILLERS = frozenset(["de", "d", "du", "des", "any", "a"])
+
+
+def fold_text(text):
+    """Forme de recherche : sans accents, en minuscules, ponctuation et _ remplacés par des espaces"""
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", _strip_accents(text)).split())
+
+
+def _strip_accents(text):
+    text = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in text if not unicodedata.combining(c)).casefold()
+
+
+def _ngrams(term, n=3):
+    padded = f" {term} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class _TrieNode:
+    __slots__ = ("children", "ranked")
+
+    def __init__(self):
+        self.children = {}
+        self.ranked = {}  # pendant la construction : {symptôme: clé de tri}, ensuite tuple trié
+
+
+class SymptomIndex:
+    """
+    Index de résolution des symptômes construit une seule fois.
+
+    - Trie des préfixes : chaque terme (nom du symptôme ou alias) y est inséré à partir
+      du début de chacun de ses mots ; chaque nœud stocke ses résultats déjà triés, une
+      suggestion ne coûte donc qu'un parcours de la longueur de la saisie.
+    - N-grammes de caractères (trigrammes) : rattrapent les fautes de frappe ("hedache").
+    """
+
+    FUZZY_THRESHOLD = 0.4
+    AMBIGUITY_MARGIN = 0.05
+    # Une saisie plus courte que cette part du terme n'est pas une faute de frappe mais
+    # un fragment ("high" pour high fever), sauf si elle en compte tous les mots ("vomit")
+    MIN_LENGTH_RATIO = 0.75
+    RESOLVE_CACHE_SIZE = 4096
+
+    def __init__(self, symptoms, severity_path=None, aliases=None):
+        """
+        Args:
+            symptoms: Symptômes reconnus par le modèle (all_symptoms)
+            severity_path: Chemin vers Symptom-severity.csv (poids de gravité, optionnel)
+            aliases: {alias: symptôme} (par défaut SYMPTOM_ALIASES)
+        """
+        self.symptoms = list(symptoms)
+        positions = {symptom: i for i, symptom in enumerate(self.symptoms)}
+        severity = self._load_severity(severity_path)
+
+        # Résultat renvoyé pour chaque symptôme (précalculé, partagé entre les requêtes).
+        # Les images (souvent encodées en base64) restent dans la page : pas dans les suggestions.
+        self.entries = tuple(
+            {
+                "symptom": symptom,
+                "label": symptom.replace('_', ' ').capitalize(),
+                "weight": severity.get(symptom),
+            }
+            for symptom in self.symptoms
+        )
+
+        # Termes : noms des symptômes puis alias dont la cible existe dans ce jeu de données
+        self.terms = {}
+        alias_terms = set()
+        for symptom in self.symptoms:
+            self.terms.setdefault(fold_text(symptom), positions[symptom])
+        for alias, symptom in (SYMPTOM_ALIASES if aliases is None else aliases).items():
+            term = fold_text(alias)
+            if symptom in positions and term not in self.terms:
+                self.terms[term] = positions[symptom]
+                alias_terms.add(term)
+        self._max_term_words = max((term.count(" ") + 1 for term in self.terms), default=0)
+
+        self._root = _TrieNode()
+        self._ngram_postings = defaultdict(list)
+        self._ngram_counts = {}
+        for term, symptom_id in self.terms.items():
+            words = term.split(" ")
+            start = 0
+            for word_number, word in enumerate(words):
+                # Préfixe du terme entier avant préfixe d'un mot intérieur, nom avant alias,
+                # puis le plus court
+                rank = (min(word_number, 1), term in alias_terms,
+                        len(self.symptoms[symptom_id]), self.symptoms[symptom_id])
+                self._insert(term[start:], symptom_id, rank)
+                start += len(word) + 1
+            grams = _ngrams(term)
+            self._ngram_counts[term] = len(grams)
+            for gram in grams:
+                self._ngram_postings[gram].append(term)
+        self._finalize(self._root)
+
+        self.resolve = lru_cache(maxsize=self.RESOLVE_CACHE_SIZE)(self._resolve)
+
+    @staticmethod
+    def _load_severity(severity_path):
+        """Retourne {symptôme: poids} depuis Symptom-severity.csv"""
+        if not severity_path:
+            return {}
+        data = pd.read_csv(severity_path, usecols=['Symptom', 'weight'])
+        return {str(symptom).strip(): int(weight)
+                for symptom, weight in zip(data['Symptom'], data['weight']) if not pd.isna(weight)}
+
+    def _insert(self, text, symptom_id, rank):
+        node = self._root
+        for char in text:
+            node = node.children.setdefault(char, _TrieNode())
+            best = node.ranked.get(symptom_id)
+            if best is None or rank < best:
+                node.ranked[symptom_id] = rank
+
+    def _finalize(self, node):
+        node.ranked = tuple(sorted(node.ranked, key=node.ranked.__getitem__))
+        for child in node.children.values():
+            self._finalize(child)
+
+    def _prefix_ids(self, folded):
+        node = self._root
+        for char in folded:
+            node = node.children.get(char)
+            if node is None:
+                return ()
+        return node.ranked
+
+    def _fuzzy_scores(self, folded, complete_only=False):
+        """
+        Similarité de Dice sur les trigrammes, meilleur score par symptôme
+
+        Args:
+            complete_only: Ignorer les termes dont la saisie n'est qu'un fragment
+                (moins de mots et nettement plus courte)
+        """
+        grams = _ngrams(folded)
+        shared = defaultdict(int)
+        for gram in grams:
+            for term in self._ngram_postings.get(gram, ()):
+                shared[term] += 1
+        word_count = folded.count(" ") + 1
+        scores = {}
+        for term, count in shared.items():
+            if (complete_only and word_count < term.count(" ") + 1
+                    and len(folded) < self.MIN_LENGTH_RATIO * len(term)):
+                continue
+            score = 2 * count / (len(grams) + self._ngram_counts[term])
+            symptom_id = self.terms[term]
+            if score > scores.get(symptom_id, 0):
+                scores[symptom_id] = score
+        return sorted(scores.items(), key=lambda item: -item[1])
+
+    def suggest(self, query, limit=10):
+        """
+        Suggestions pour une saisie partielle, par préfixe puis par similarité
+
+        Returns:
+            Liste de dictionnaires {symptom, label, weight}
+        """
+        folded = fold_text(query)
+        if not folded or limit <= 0:
+            return []
+
+        ids = self._prefix_ids(folded)
+        if not ids and " " in folded:
+            # "pain che" : intersection des préfixes de chaque mot, dans l'ordre du premier
+            words = folded.split(" ")
+            others = [set(self._prefix_ids(word)) for word in words[1:]]
+            ids = [i for i in self._prefix_ids(words[0]) if all(i in other for other in others)]
+
+        results = list(ids[:limit])
+        if len(results) < limit:
+            seen = set(results)
+            for symptom_id, score in self._fuzzy_scores(folded):
+                if score < self.FUZZY_THRESHOLD or len(results) >= limit:
+                    break
+                if symptom_id not in seen:
+                    seen.add(symptom_id)
+                    results.append(symptom_id)
+        return [self.entries[i] for i in results]
+
+    def _resolve(self, text):
+        """Symptôme correspondant à une saisie (terme exact, alias ou faute de frappe), ou None"""
+        folded = fold_text(text)
+        if not folded:
+            return None
+        symptom_id = self.terms.get(folded)
+        if symptom_id is not None:
+            return self.symptoms[symptom_id]
+        # Rapprochement approximatif seulement s'il n'est pas ambigu ("pain" ne devine rien)
+        # et si la saisie n'est pas un simple fragment du nom ("back" ne devine pas back pain)
+        scores = self._fuzzy_scores(folded, complete_only=True)
+        if not scores or scores[0][1] < self.FUZZY_THRESHOLD:
+            return None
+        if len(scores) > 1 and scores[0][1] - scores[1][1] < self.AMBIGUITY_MARGIN:
+            return None
+        return self.symptoms[scores[0][0]]
+
+    def _exact_matches(self, words):
+        """
+        Découpe une suite de mots en termes connus (le plus long d'abord, de gauche à droite)
+
+        Returns:
+            Liste de (symptom_id ou None, mots) : les mots hors de tout terme connu sont
+            regroupés en fragments, coupés aux conjonctions. Un terme ou un fragment
+            précédé d'une négation est omis.
+        """
+        pieces = []
+        fragment = []
+        negated = False
+        i = 0
+        while i < len(words):
+            symptom_id = self._term_at(words, i)
+            if symptom_id is None and words[i] in _NEGATIONS:
+                # La négation porte sur le terme connu qui suit, ou sinon sur les mots
+                # jusqu'à la prochaine conjonction
+                pieces.append((None, fragment))
+                fragment = []
+                negated = True
+                i += 1
+                while i < len(words) and words[i] in _NEGATION_FILLERS:
+                    i += 1
+                continue
+            if symptom_id is None:
+                if words[i] in _CONJUNCTIONS:
+                    negated = False
+                    pieces.append((None, fragment))
+                    fragment = []
+                elif not negated:
+                    fragment.append(words[i])
+                i += 1
+            else:
+                length = self._term_length(words, i)
+                pieces.append((None, fragment))
+                if not negated:
+                    pieces.append((symptom_id, words[i:i + length]))
+                fragment = []
+                negated = False
+                i += length
+        pieces.append((None, fragment))
+        return [(symptom_id, piece) for symptom_id, piece in pieces if piece]
+
+    def _term_length(self, words, start):
+        """Nombre de mots du plus long terme connu commençant à `start` (0 si aucun)"""
+        for end in range(min(len(words), start + self._max_term_words), start, -1):
+            if " ".join(words[start:end]) in self.terms:
+                return end - start
+        return 0
+
+    def _term_at(self, words, start):
+        """Symptôme du plus long terme connu commençant à `start`, ou None"""
+        length = self._term_length(words, start)
+        return self.terms[" ".join(words[start:start + length])] if length else None
+
+    def resolve_all(self, text):
+        """
+        Symptômes d'une saisie libre, éventuellement composée de plusieurs parties
+        ("fièvre, toux et mal de gorge"). Les noms et alias connus sont reconnus en
+        entier avant tout découpage aux conjonctions ; les fautes de frappe ne sont
+        cherchées que dans les fragments restants.
+
+        Returns:
+            Liste des symptômes reconnus, sans doublons
+        """
+        resolved = []
+        for part in _SEPARATORS.split(text):
+            words = fold_text(part).split()
+            for symptom_id, piece in self._exact_matches(words):
+                if symptom_id is not None:
+                    symptom = self.symptoms[symptom_id]
+                else:
+                    symptom = self.resolve(" ".join(piece))
+                if symptom is not None and symptom not in resolved:
+                    resolved.append(symptom)
+        return resolved
@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Version du format sur disque
+FORMAT_VERSION = 1
+
+MATRIX_FILE = "matrix.npy"
+LABELS_FILE = "labels.npy"
+META_FILE = "meta.json"
+
+
+class SymptomMatrix:
+    """
+    Matrice binaire maladies/symptômes chargée en mémoire ou projetée depuis le disque.
+
+    Attributes:
+        symptoms: Noms des colonnes de symptômes
+        diseases: Vocabulaire des maladies (indexé par les codes de label_codes)
+        matrix: Tableau uint8 (lignes x symptômes) de 0/1
+        label_codes: Code de la maladie de chaque ligne
+        disease_column: Nom de la colonne des maladies dans le CSV d'origine
+    """
+
+    def __init__(self, symptoms, diseases, matrix, label_codes, disease_column="prognosis"):
+        self.symptoms = list(symptoms)
+        self.diseases = np.asarray(diseases, dtype=object)
+        self.matrix = matrix
+        self.label_codes = label_codes
+        self.disease_column = disease_column
+
+    @property
+    def labels(self):
+        """Nom de la maladie de chaque ligne"""
+        return self.diseases[self.label_codes]
+
+    @classmethod
+    def from_csv(cls, csv_path, disease_column="prognosis"):
+        """Lit le CSV en stockant les symptômes sur 1 octet au lieu de 8"""
+        columns = pd.read_csv(csv_path, nrows=0).columns
+        symptoms = [c for c in columns if c != disease_column]
+        frame = pd.read_csv(csv_path, dtype={c: np.uint8 for c in symptoms})
+        diseases, label_codes = np.unique(frame[disease_column].to_numpy(dtype=object), return_inverse=True)
+        matrix = np.ascontiguousarray(frame[symptoms].to_numpy(dtype=np.uint8))
+        return cls(symptoms, diseases, matrix, label_codes.astype(np.uint16), disease_column)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """
+        Charge le format binaire. Avec mmap=True les tableaux sont projetés en lecture
+        seule : les pages sont partagées par tous les processus qui lisent le même fichier.
+        """
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Version de format non supportée: {meta.get('format_version')}")
+        mmap_mode = "r" if mmap else None
+        matrix = np.load(os.path.join(directory, MATRIX_FILE), mmap_mode=mmap_mode)
+        label_codes = np.load(os.path.join(directory, LABELS_FILE), mmap_mode=mmap_mode)
+        # Fichiers lus pendant un save() concurrent : l'ensemble n'est pas cohérent
+        if matrix.shape != (meta["rows"], len(meta["symptoms"])) or label_codes.shape != (meta["rows"],):
+            raise ValueError(f"Fichiers incohérents dans {directory} (écriture en cours ?)")
+        return cls(meta["symptoms"], meta["diseases"], matrix, label_codes, meta["disease_column"])
+
+    def save(self, directory):
+        """
+        Écrit matrix.npy (uint8), labels.npy (codes uint16) et meta.json (vocabulaires).
+
+        Les fichiers sont écrits dans un répertoire temporaire voisin puis substitués un
+        par un (os.replace) : un processus qui projette l'ancien matrix.npy garde l'ancien
+        fichier intact. meta.json est remplacé en dernier et sert de marque de validation.
+        """
+        directory = os.path.abspath(directory)
+        os.makedirs(directory, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f".{os.path.basename(directory)}-", dir=os.path.dirname(directory))
+        try:
+            self._write_files(staging)
+            for name in (MATRIX_FILE, LABELS_FILE, META_FILE):
+                os.replace(os.path.join(staging, name), os.path.join(directory, name))
+            _fsync_directory(directory)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _write_files(self, directory):
+        """Écrit les trois fichiers et les force sur disque"""
+        with open(os.path.join(directory, MATRIX_FILE), "wb") as f:
+            np.save(f, np.ascontiguousarray(self.matrix, dtype=np.uint8))
+            f.flush()
+            os.fsync(f.fileno())
+        with open(os.path.join(directory, LABELS_FILE), "wb") as f:
+            np.save(f, np.asarray(self.label_codes, dtype=np.uint16))
+            f.flush()
+            os.fsync(f.fileno())
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "disease_column": self.disease_column,
+            "symptoms": self.symptoms,
+            "diseases": [str(d) for d in self.diseases],
+            "rows": int(self.matrix.shape[0]),
+        }
+        with open(os.path.join(directory, META_FILE), "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def deduplicate(self):
+        """
+        Regroupe les lignes identiques (symptômes + maladie) en motifs uniques
+
+        Returns:
+            (matrice des motifs uniques, codes de maladie, poids = nombre d'occurrences)
+        """
+        keys = np.column_stack([np.asarray(self.matrix, dtype=np.uint16), self.label_codes])
+        unique_keys, counts = np.unique(keys, axis=0, return_counts=True)
+        matrix = np.ascontiguousarray(unique_keys[:, :-1], dtype=np.uint8)
+        return matrix, unique_keys[:, -1], counts
+
+    def to_frame(self):
+        """Reconstruit le DataFrame au format du CSV d'origine"""
+        frame = pd.DataFrame(np.asarray(self.matrix), columns=self.symptoms)
+        frame[self.disease_column] = self.labels
+        return frame
+
+
+def _fsync_directory(directory):
+    """Rend durables les renommages dans le répertoire (sans effet hors POSIX)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def is_binary_dataset(path):
+    """Vrai si le chemin désigne un répertoire au format binaire"""
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, META_FILE))
+
+
+def load_symptom_matrix(path, disease_column="prognosis"):
+    """Charge la matrice depuis un CSV ou depuis le format binaire, indifféremment"""
+    if is_binary_dataset(path):
+        return SymptomMatrix.load(path)
+    return SymptomMatrix.from_csv(path, disease_column)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convertit le CSV maladies/symptômes au format binaire")
+    parser.add_argument("csv_path")
+    parser.add_argument("output_dir")
+    args = parser.parse_args()
+
+    data = SymptomMatrix.from_csv(args.csv_path)
+    data.save(args.output_dir)
+    print(f"✅ {data.matrix.shape[0]} lignes x {data.matrix.shape[1]} symptômes écrits dans {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
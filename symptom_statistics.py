@@ -0,0 +1,48 @@
+import numpy as np
+
+# Lignes traitées par bloc lors du comptage (borne la mémoire sur les gros jeux projetés)
+COUNT_CHUNK_ROWS = 8192
+
+
+class SymptomStatistics:
+    """
+    Statistiques maladie x symptôme précalculées à partir de la matrice d'entraînement.
+
+    Attributes:
+        diseases: Noms des maladies (ordre de SymptomMatrix.diseases)
+        symptoms: Noms des symptômes (ordre des colonnes)
+        counts: Tableau (maladies x symptômes) du nombre de lignes de la maladie présentant le symptôme
+        disease_rows: Nombre de lignes d'entraînement par maladie
+        frequencies: P(symptôme | maladie) lissée (Laplace), tableau (maladies x symptômes)
+        log_prior: log P(maladie)
+        log_present / log_absent: log P(symptôme | maladie) et log (1 - P(symptôme | maladie))
+    """
+
+    def __init__(self, diseases, symptoms, counts, disease_rows, smoothing=1.0):
+        self.diseases = np.asarray(diseases, dtype=object)
+        self.symptoms = list(symptoms)
+        self.positions = {symptom: i for i, symptom in enumerate(self.symptoms)}
+        self.counts = counts
+        self.disease_rows = disease_rows
+
+        self.frequencies = (counts + smoothing) / (disease_rows[:, None] + 2 * smoothing)
+        self.log_prior = np.log((disease_rows + smoothing) / (disease_rows.sum() + smoothing * len(disease_rows)))
+        self.log_present = np.log(self.frequencies)
+        self.log_absent = np.log1p(-self.frequencies)
+
+    @classmethod
+    def from_matrix(cls, symptom_data, smoothing=1.0):
+        """
+        Compte les symptômes par maladie en un produit matriciel par bloc de lignes
+        (indicatrice des maladies transposée x matrice des symptômes)
+        """
+        n_diseases = len(symptom_data.diseases)
+        counts = np.zeros((n_diseases, len(symptom_data.symptoms)))
+        label_codes = np.asarray(symptom_data.label_codes)
+        for start in range(0, len(label_codes), COUNT_CHUNK_ROWS):
+            codes = label_codes[start:start + COUNT_CHUNK_ROWS]
+            indicator = np.zeros((len(codes), n_diseases), dtype=np.float32)
+            indicator[np.arange(len(codes)), codes] = 1
+            counts += indicator.T @ np.asarray(symptom_data.matrix[start:start + COUNT_CHUNK_ROWS], dtype=np.float32)
+        disease_rows = np.bincount(label_codes, minlength=n_diseases).astype(float)
+        return cls(symptom_data.diseases, symptom_data.symptoms, counts, disease_rows, smoothing)
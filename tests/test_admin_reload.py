@@ -0,0 +1,30 @@
+import os
+import signal
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", "secret")
+    return app_module.app.test_client()
+
+
+def test_admin_reload_rejects_a_wrong_token(client):
+    assert client.get("/admin/reload", headers={"X-Admin-Token": "wrong"}).status_code == 403
+    assert client.get("/admin/reload").status_code == 403
+    assert client.get("/admin/reload", headers={"X-Admin-Token": "secret"}).status_code == 200
+
+
+def test_prefork_reload_signals_the_master(client, monkeypatch):
+    signals = []
+    monkeypatch.setattr(os, "kill", lambda pid, sig: signals.append((pid, sig)))
+    monkeypatch.setitem(app_module.app.config, "PREFORK", True)
+
+    response = client.post("/admin/reload", headers={"X-Admin-Token": "secret"})
+
+    assert response.status_code == 202
+    assert signals == [(os.getppid(), signal.SIGHUP)]
+    assert not app_module.reloader.stats()["reloading"]
@@ -0,0 +1,18 @@
+from benchmark_predictor import indexed_enrichment, legacy_enrichment
+from model_predictor import DiseasePredictor
+
+
+def test_enrichment_helpers_run_against_the_current_predictor():
+    predictor = DiseasePredictor("data/maladies_symptomes_binary.csv",
+                                 medications_path="data/medications.csv",
+                                 description_path="data/description.csv",
+                                 diets_path="data/diets.csv",
+                                 precautions_path="data/precautions_df.csv",
+                                 workout_path="data/workout_df.csv")
+    disease = predictor.model.classes_[0]
+
+    result = indexed_enrichment(predictor, disease)
+
+    assert result["disease"] == disease
+    assert result["disease_symptoms"]
+    legacy_enrichment(predictor, disease)
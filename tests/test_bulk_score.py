@@ -0,0 +1,162 @@
+import csv
+import json
+
+import pytest
+
+import bulk_score
+
+
+def _options(input_format, output_format, **overrides):
+    options = {
+        "data_path": "data/maladies_symptomes_binary.csv",
+        "model_path": None,
+        "model_type": "random_forest",
+        "artifact_dir": "models",
+        "backend": "numpy",
+        "cache_size": 0,
+        "enrich": False,
+        "input_format": input_format,
+        "output_format": output_format,
+        "symptoms_field": "symptoms",
+        "id_column": "id",
+    }
+    options.update(overrides)
+    return options
+
+
+def test_parse_list_accepts_python_lists():
+    assert bulk_score._parse_list("['itching', 'skin_rash']") == ["itching", "skin_rash"]
+    assert bulk_score._parse_list("itching; skin rash") == ["itching", "skin rash"]
+    with pytest.raises(ValueError):
+        bulk_score._parse_list("['itching'")
+
+
+def test_invalid_jsonl_records_are_reported_and_skipped(tmp_path):
+    input_path = tmp_path / "patients.jsonl"
+    input_path.write_text("\n".join([
+        json.dumps({"id": "a", "symptoms": ["itching", "skin_rash"]}),
+        json.dumps({"id": "b", "symptoms": None}),
+        '{"id": "c", "symptoms": ',
+        "",
+        json.dumps({"id": "d", "symptoms": "['itching', 'nodal_skin_eruptions']"}),
+    ]) + "\n")
+    output_path = tmp_path / "results.jsonl"
+
+    stats = bulk_score.run(str(input_path), str(output_path), _options("jsonl", "jsonl"), workers=1)
+
+    rows = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert stats["errors"] == 2
+    assert [row["row"] for row in rows] == [0, 1, 2, 4]
+    assert [row.get("id") for row in rows] == ["a", "b", None, "d"]
+    assert "error" not in rows[0] and rows[0]["disease"]
+    assert "error" in rows[1] and "error" in rows[2]
+    assert rows[3]["disease"] == rows[0]["disease"]
+
+
+def test_invalid_csv_records_are_reported_and_skipped(tmp_path):
+    input_path = tmp_path / "patients.csv"
+    input_path.write_text("id,symptoms\n"
+                          'a,"itching; skin_rash"\n'
+                          'b,"[\'itching\'"\n'
+                          "c,itching,extra\n"
+                          'd,"[\'itching\', \'skin_rash\']"\n')
+    output_path = tmp_path / "results.csv"
+
+    stats = bulk_score.run(str(input_path), str(output_path), _options("csv", "csv"), workers=1)
+
+    with open(output_path) as f:
+        rows = list(csv.DictReader(f))
+    assert stats["errors"] == 2
+    assert [row["id"] for row in rows] == ["a", "b", "c", "d"]
+    assert [bool(row["error"]) for row in rows] == [False, True, True, False]
+    assert rows[0]["disease"] == rows[3]["disease"] != ""
+
+
+def test_invalid_wide_csv_records_are_reported_and_skipped(tmp_path):
+    with open("data/maladies_symptomes_binary.csv") as f:
+        header = f.readline().strip().split(",")
+        lines = [f.readline().strip() for _ in range(3)]
+    bad = lines[1].split(",")
+    bad[header.index("itching")] = "x"
+    input_path = tmp_path / "patients.csv"
+    input_path.write_text("\n".join([",".join(header), lines[0], ",".join(bad), lines[2]]) + "\n")
+    output_path = tmp_path / "results.jsonl"
+
+    stats = bulk_score.run(str(input_path), str(output_path), _options("csv", "jsonl", id_column=None), workers=1)
+
+    rows = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert stats["errors"] == 1
+    assert [row["row"] for row in rows] == [0, 1, 2]
+    assert "itching" in rows[1]["error"]
+    assert rows[0]["disease"] and rows[2]["disease"]
+
+
+def _write_patients(path, count):
+    symptoms = [["itching", "skin_rash"], ["vomiting", "fatigue"], ["cough", "high_fever"], ["headache"]]
+    path.write_text("".join(json.dumps({"id": f"p{i}", "symptoms": symptoms[i % len(symptoms)]}) + "\n"
+                            for i in range(count)))
+
+
+def _interrupt_after(monkeypatch, chunks):
+    """Simule un arrêt brutal (Ctrl-C) au bloc suivant les `chunks` premiers"""
+    score_chunk = bulk_score.score_chunk
+    calls = []
+
+    def interrupted(*args):
+        if len(calls) == chunks:
+            raise KeyboardInterrupt
+        calls.append(args[0])
+        return score_chunk(*args)
+
+    monkeypatch.setattr(bulk_score, "score_chunk", interrupted)
+
+
+def test_resume_after_interruption_writes_each_row_once(tmp_path, monkeypatch):
+    input_path = tmp_path / "patients.jsonl"
+    _write_patients(input_path, 50)
+    options = _options("jsonl", "jsonl")
+    expected_path = tmp_path / "expected.jsonl"
+    bulk_score.run(str(input_path), str(expected_path), options, chunk_size=7, workers=1)
+
+    output_path = tmp_path / "results.jsonl"
+    with monkeypatch.context() as patch:
+        _interrupt_after(patch, 3)
+        with pytest.raises(KeyboardInterrupt):
+            bulk_score.run(str(input_path), str(output_path), options, chunk_size=7, workers=1)
+    assert len(output_path.read_text().splitlines()) == 21
+    # Bloc à moitié écrit au moment de l'arrêt
+    with open(output_path, "a") as f:
+        f.write('{"row": 21, "id": "p2')
+
+    stats = bulk_score.run(str(input_path), str(output_path), options, chunk_size=7, workers=1, resume=True)
+
+    rows = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert stats["resumed_from"] == 21 and stats["rows"] == 50
+    assert [row["row"] for row in rows] == list(range(50))
+    assert [row["id"] for row in rows] == [f"p{i}" for i in range(50)]
+    assert output_path.read_text() == expected_path.read_text()
+    assert not (tmp_path / "results.jsonl.checkpoint").exists()
+
+
+def test_resume_is_refused_when_the_run_differs(tmp_path, monkeypatch):
+    input_path = tmp_path / "patients.jsonl"
+    _write_patients(input_path, 20)
+    options = _options("jsonl", "jsonl")
+    output_path = tmp_path / "results.jsonl"
+    with monkeypatch.context() as patch:
+        _interrupt_after(patch, 1)
+        with pytest.raises(KeyboardInterrupt):
+            bulk_score.run(str(input_path), str(output_path), options, chunk_size=5, workers=1)
+    partial = output_path.read_text()
+
+    with pytest.raises(ValueError, match="enrich"):
+        bulk_score.run(str(input_path), str(output_path), _options("jsonl", "jsonl", enrich=True),
+                       chunk_size=5, workers=1, resume=True)
+    with pytest.raises(ValueError, match="id_column"):
+        bulk_score.run(str(input_path), str(output_path), _options("jsonl", "jsonl", id_column=None),
+                       chunk_size=5, workers=1, resume=True)
+    with open(input_path, "a") as f:
+        f.write(json.dumps({"id": "p20", "symptoms": ["headache"]}) + "\n")
+    with pytest.raises(ValueError, match="input_size"):
+        bulk_score.run(str(input_path), str(output_path), options, chunk_size=5, workers=1, resume=True)
+    assert output_path.read_text() == partial
@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+from chat_service import ChatBackend, StubTransport, StubUpstreamError
+
+
+def test_backend_streams_all_chunks():
+    backend = ChatBackend(StubTransport(latency=0, chunk_delay=0, chunks=3))
+
+    chunks = list(backend("bonjour"))
+
+    assert len(chunks) == 3
+    assert backend.stats()["in_flight"] == 0
+
+
+def test_timeout_applies_before_the_first_chunk():
+    backend = ChatBackend(StubTransport(latency=2.0, chunks=1), request_timeout=0.2)
+
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        list(backend("bonjour"))
+
+    assert time.perf_counter() - start < 1.0
+    assert backend.stats()["timeouts"] == 1
+
+
+def test_timeout_applies_between_chunks():
+    backend = ChatBackend(StubTransport(latency=0, chunk_delay=2.0, chunks=2), request_timeout=0.2)
+
+    received = []
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        for chunk in backend("bonjour"):
+            received.append(chunk)
+
+    assert len(received) == 1
+    assert time.perf_counter() - start < 1.0
+
+
+def test_upstream_error_is_raised_and_counted():
+    backend = ChatBackend(StubTransport(latency=0, error_rate=1.0))
+
+    with pytest.raises(StubUpstreamError):
+        list(backend("bonjour"))
+
+    assert backend.stats()["errors"] == 1
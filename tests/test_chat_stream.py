@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from app import app
+
+
+def fake_source(user_input, system_instruction):
+    """Faux générateur local à la place de Gemini"""
+    yield "Bonjour, "
+    yield f"vous avez écrit : {user_input}\n"
+    yield "fin"
+
+
+def failing_source(user_input, system_instruction):
+    yield "début "
+    raise RuntimeError("panne amont")
+
+
+@pytest.fixture
+def client():
+    original = app.config["CHAT_SOURCE"]
+    app.config["CHAT_SOURCE"] = fake_source
+    try:
+        yield app.test_client()
+    finally:
+        app.config["CHAT_SOURCE"] = original
+
+
+def _events(response):
+    body = response.get_data(as_text=True)
+    return [block for block in body.split("\n\n") if block]
+
+
+def test_chat_stream_sends_each_chunk_as_an_event(client):
+    response = client.post("/chat/stream", json={"message": "fièvre"})
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    events = _events(response)
+    texts = [json.loads(event[len("data: "):])["text"] for event in events[:-1]]
+    assert texts == ["Bonjour, ", "vous avez écrit : fièvre\n", "fin"]
+    assert events[-1] == "event: done\ndata: {}"
+
+
+def test_chat_stream_turns_upstream_error_into_last_chunk(client):
+    app.config["CHAT_SOURCE"] = failing_source
+    response = client.post("/chat/stream", json={"message": "toux"})
+
+    events = _events(response)
+    texts = [json.loads(event[len("data: "):])["text"] for event in events[:-1]]
+    assert texts[0] == "début "
+    assert "panne amont" in texts[1]
+    assert events[-1].startswith("event: done")
+
+
+def test_chat_stream_requires_a_message(client):
+    assert client.post("/chat/stream", json={}).status_code == 400
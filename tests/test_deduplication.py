@@ -0,0 +1,30 @@
+import pytest
+
+from model_predictor import DiseasePredictor
+
+DATA = "data/maladies_symptomes_binary.csv"
+
+
+@pytest.fixture(scope="module")
+def predictors():
+    return DiseasePredictor(DATA), DiseasePredictor(DATA, deduplicate_training=True)
+
+
+def test_deduplicated_training_predicts_the_same_diseases_on_training_rows(predictors):
+    full, deduplicated = predictors
+    data = full.symptom_data
+    symptom_lists = [[data.symptoms[i] for i in row.nonzero()[0]] for row in data.matrix]
+    assert len(symptom_lists) == 4920
+
+    expected = [result["disease"] for result in full.predict_batch(symptom_lists)]
+    actual = [result["disease"] for result in deduplicated.predict_batch(symptom_lists)]
+
+    assert actual == expected
+
+
+def test_batch_prediction_matches_single_predictions(predictors):
+    _, deduplicated = predictors
+    data = deduplicated.symptom_data
+    symptom_lists = [[data.symptoms[i] for i in row.nonzero()[0]] for row in data.matrix[::250]]
+
+    assert deduplicated.predict_batch(symptom_lists) == [deduplicated.predict(s) for s in symptom_lists]
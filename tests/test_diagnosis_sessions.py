@@ -0,0 +1,32 @@
+import app as app_module
+
+
+def test_invalid_limits_do_not_create_a_session():
+    client = app_module.app.test_client()
+    created = app_module.diagnosis_sessions.created
+
+    response = client.post("/api/sessions?top=abc", json={"present": ["itching"]})
+
+    assert response.status_code == 400
+    assert app_module.diagnosis_sessions.created == created
+
+
+def test_invalid_limits_do_not_modify_a_session():
+    client = app_module.app.test_client()
+    session = client.post("/api/sessions", json={"present": ["itching"]}).get_json()
+
+    response = client.post(f"/api/sessions/{session['session_id']}?questions=x", json={"present": ["skin rash"]})
+    assert response.status_code == 400
+
+    state = client.get(f"/api/sessions/{session['session_id']}").get_json()
+    assert state["symptoms"] == ["itching"]
+
+
+def test_answers_are_normalized():
+    client = app_module.app.test_client()
+
+    state = client.post("/api/sessions", json={"present": ["Skin rash", "hedache"], "absent": ["toux"]}).get_json()
+
+    assert state["symptoms"] == ["skin_rash", "headache"]
+    assert state["absent"] == ["cough"]
+    assert state["unrecognized"] == []
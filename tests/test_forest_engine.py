@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from forest_engine import FlatForest
+from symptom_matrix import load_symptom_matrix
+
+
+@pytest.fixture(scope="module")
+def data():
+    data = load_symptom_matrix("data/maladies_symptomes_binary.csv")
+    return np.asarray(data.matrix, dtype=np.float64), data.labels
+
+
+@pytest.fixture(scope="module")
+def random_inputs(data):
+    # Entrées creuses : 1 à 8 symptômes tirés au hasard, jamais vues à l'entraînement
+    matrix, _ = data
+    rng = np.random.default_rng(0)
+    inputs = np.zeros((500, matrix.shape[1]))
+    for row in inputs:
+        row[rng.choice(matrix.shape[1], size=rng.integers(1, 9), replace=False)] = 1
+    return inputs
+
+
+@pytest.mark.parametrize("params", [
+    {"n_estimators": 100},
+    {"n_estimators": 50, "max_depth": 5},
+], ids=["default", "depth_limited"])
+def test_flat_forest_matches_sklearn(data, random_inputs, params):
+    matrix, labels = data
+    forest = RandomForestClassifier(random_state=42, **params).fit(matrix, labels)
+    engine = FlatForest.from_sklearn(forest)
+
+    for inputs in (matrix, random_inputs):
+        np.testing.assert_allclose(engine.predict_proba(inputs), forest.predict_proba(inputs), rtol=0, atol=1e-12)
+        assert np.array_equal(engine.predict(inputs), forest.predict(inputs))
+    assert np.array_equal(engine.classes_, forest.classes_)
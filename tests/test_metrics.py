@@ -0,0 +1,18 @@
+from metrics import MetricsRegistry, stats_samples
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.inc("requests_total", route='a"b\\c\nd')
+    assert 'requests_total{route="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+
+def test_cumulative_stats_are_counters():
+    registry = MetricsRegistry()
+    stats = {"size": 3, "hits": 10, "queue_wait_total": 1.5}
+    registry.register_collector(lambda: stats_samples("cache", stats, counters={"hits", "queue_wait_total"}))
+    text = registry.render()
+    assert "# TYPE cache_size gauge" in text
+    assert "# TYPE cache_hits_total counter" in text
+    assert "cache_hits_total 10" in text
+    assert "cache_queue_wait_total 1.5" in text
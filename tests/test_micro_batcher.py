@@ -0,0 +1,47 @@
+import pytest
+
+from micro_batcher import MicroBatcher
+
+
+def _predict_batch(calls):
+    def predict_batch(symptom_lists):
+        calls.append(len(symptom_lists))
+        if any("unknown" in symptoms for symptoms in symptom_lists):
+            raise ValueError("symptôme inconnu")
+        return [",".join(symptoms) for symptoms in symptom_lists]
+    return predict_batch
+
+
+def test_requests_are_grouped_in_one_batch():
+    calls = []
+    batcher = MicroBatcher(_predict_batch(calls), max_batch_size=3, max_wait=1.0)
+
+    futures = [batcher.submit([f"s{i}"]) for i in range(3)]
+
+    assert [future.result(timeout=5) for future in futures] == ["s0", "s1", "s2"]
+    assert calls == [3]
+    assert batcher.stats()["failed_batches"] == 0
+
+
+def test_failing_request_does_not_fail_its_batch():
+    calls = []
+    batcher = MicroBatcher(_predict_batch(calls), max_batch_size=3, max_wait=1.0)
+
+    futures = [batcher.submit(["itching"]), batcher.submit(["unknown"]), batcher.submit(["cough"])]
+
+    assert futures[0].result(timeout=5) == "itching"
+    with pytest.raises(ValueError, match="inconnu"):
+        futures[1].result(timeout=5)
+    assert futures[2].result(timeout=5) == "cough"
+    # Le lot complet, puis chaque requête seule
+    assert calls == [3, 1, 1, 1]
+    assert batcher.stats()["failed_batches"] == 1
+
+
+def test_single_failing_request_is_not_retried():
+    calls = []
+    batcher = MicroBatcher(_predict_batch(calls), max_batch_size=1)
+
+    with pytest.raises(ValueError):
+        batcher.predict(["unknown"])
+    assert calls == [1]
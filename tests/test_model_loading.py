@@ -0,0 +1,39 @@
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from model_predictor import DiseasePredictor
+
+DATA = "data/maladies_symptomes_binary.csv"
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    return DiseasePredictor(DATA, inference_backend="numpy")
+
+
+def test_incompatible_model_leaves_the_current_one_in_service(predictor, tmp_path):
+    model, engine, columns = predictor.model, predictor.engine, predictor._similarity_columns
+    expected = predictor.predict(["itching", "skin_rash"])
+    rows = np.tile(np.eye(2, len(predictor.all_symptoms)), (4, 1))
+    foreign = RandomForestClassifier(n_estimators=2).fit(rows, ["maladie a", "maladie b"] * 4)
+    path = tmp_path / "foreign.joblib"
+    joblib.dump(foreign, path)
+
+    assert not predictor.load_model(str(path))
+
+    assert predictor.model is model
+    assert predictor.engine is engine
+    assert predictor._similarity_columns is columns
+    assert predictor.predict(["itching", "skin_rash"]) == expected
+
+
+def test_unreadable_model_path_falls_back_to_training(tmp_path):
+    path = tmp_path / "broken.joblib"
+    path.write_bytes(b"pas un modele")
+
+    predictor = DiseasePredictor(DATA, model_path=str(path))
+
+    assert predictor.model is not None
+    assert predictor.predict(["itching", "skin_rash", "nodal_skin_eruptions"])["disease"] == "Fungal infection"
@@ -0,0 +1,97 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from model_predictor import DiseasePredictor
+from prediction_cache import PredictionCache
+from predictor_reloader import PredictorReloader
+
+DATA = "data/maladies_symptomes_binary.csv"
+FUNGAL = ["itching", "skin_rash", "nodal_skin_eruptions"]
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = PredictionCache(max_size=2)
+    cache.put(b"a", ("A", 1.0))
+    cache.put(b"b", ("B", 1.0))
+    assert cache.get(b"a") == ("A", 1.0)
+
+    cache.put(b"c", ("C", 1.0))
+
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") == ("A", 1.0)
+    assert cache.get(b"c") == ("C", 1.0)
+    assert cache.stats() == {"size": 2, "max_size": 2, "hits": 3, "misses": 1, "evictions": 1, "hit_ratio": 0.75}
+
+
+def test_keys_ignore_the_value_of_non_zero_flags():
+    assert PredictionCache.keys_for(np.array([[0, 1, 2]])) == PredictionCache.keys_for(np.array([[0, 1, 1]]))
+
+
+def test_zero_size_cache_stores_nothing():
+    cache = PredictionCache(max_size=0)
+    cache.put(b"a", ("A", 1.0))
+
+    assert len(cache) == 0
+    assert cache.get(b"a") is None
+
+
+def test_predictor_without_cache():
+    predictor = DiseasePredictor(DATA, cache_size=0)
+
+    assert predictor.predict(FUNGAL)["disease"] == "Fungal infection"
+    assert predictor.prediction_cache.stats()["size"] == 0
+
+
+@pytest.fixture
+def predictor():
+    return DiseasePredictor(DATA, cache_size=64)
+
+
+def test_repeated_prediction_is_served_from_the_cache(predictor):
+    first = predictor.predict(FUNGAL)
+    second = predictor.predict(FUNGAL)
+
+    assert first == second
+    stats = predictor.prediction_cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+
+def _shifted_model(predictor):
+    """Modèle qui prédit pour chaque ligne la maladie suivante dans l'ordre alphabétique"""
+    data = predictor.symptom_data
+    shifted = data.diseases[(data.label_codes + 1) % len(data.diseases)]
+    features = pd.DataFrame(np.asarray(data.matrix), columns=data.symptoms)
+    return RandomForestClassifier(n_estimators=10, random_state=0).fit(features, shifted)
+
+
+def test_load_model_invalidates_the_cache(predictor, tmp_path):
+    before = predictor.predict(FUNGAL)["disease"]
+    path = tmp_path / "shifted.joblib"
+    joblib.dump(_shifted_model(predictor), path)
+
+    assert predictor.load_model(str(path))
+
+    assert len(predictor.prediction_cache) == 0
+    assert predictor.predict(FUNGAL)["disease"] != before
+
+
+def test_train_model_invalidates_the_cache(predictor):
+    predictor.predict(FUNGAL)
+
+    predictor.train_model(random_state=7)
+
+    assert len(predictor.prediction_cache) == 0
+
+
+def test_reload_serves_from_a_fresh_cache():
+    reloader = PredictorReloader(lambda: DiseasePredictor(DATA, cache_size=64))
+    old = reloader.current
+    old.predict(FUNGAL)
+
+    assert reloader.reload()
+
+    assert reloader.current is not old
+    assert len(reloader.current.prediction_cache) == 0
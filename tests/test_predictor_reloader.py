@@ -0,0 +1,60 @@
+import threading
+
+from predictor_reloader import PredictorReloader
+
+
+def test_reload_async_claims_the_reload_before_returning():
+    release = threading.Event()
+    states = iter(["initial", "reloaded"])
+
+    def factory():
+        state = next(states)
+        if state == "reloaded":
+            release.wait(5)
+        return state
+
+    reloader = PredictorReloader(factory)
+
+    assert reloader.reload_async()
+    assert reloader.stats()["reloading"]
+    assert not reloader.reload_async()
+    assert not reloader.reload()
+
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == "predictor-reload":
+            thread.join(5)
+    assert reloader.current == "reloaded"
+    assert not reloader.stats()["reloading"]
+
+
+def test_failed_reload_keeps_the_current_state_and_is_reported():
+    def validate(state):
+        if state == "broken":
+            raise ValueError("modèle invalide")
+
+    states = iter(["initial", "broken"])
+    reloader = PredictorReloader(lambda: next(states), validate=validate)
+
+    assert not reloader.reload()
+
+    stats = reloader.stats()
+    assert reloader.current == "initial"
+    assert stats["failures"] == 1
+    assert stats["last_error"] == "ValueError: modèle invalide"
+
+
+def test_watcher_can_delegate_the_reload(tmp_path):
+    watched = tmp_path / "data.csv"
+    watched.write_text("a")
+    reloader = PredictorReloader(lambda: "state", watch_paths=[str(watched)])
+    calls = []
+
+    assert not reloader.check_for_changes(on_change=lambda: calls.append(1))
+    watched.write_text("ab")
+    assert reloader.check_for_changes(on_change=lambda: calls.append(1))
+    # Même état des fichiers : pas de nouvelle notification tant que rien ne change
+    assert not reloader.check_for_changes(on_change=lambda: calls.append(1))
+
+    assert calls == [1]
+    assert reloader.generation == 0
@@ -0,0 +1,18 @@
+import os
+
+from symptom_catalog import SymptomCatalog
+
+
+def test_last_modified_follows_every_source(tmp_path):
+    severity = tmp_path / "severity.csv"
+    severity.write_text("Symptom,weight\nitching,1\n")
+    dataset = tmp_path / "binary"
+    dataset.mkdir()
+    (dataset / "meta.json").write_text("{}")
+    os.utime(severity, (1_000_000, 1_000_000))
+    os.utime(dataset / "meta.json", (2_000_000, 2_000_000))
+
+    catalog = SymptomCatalog(["itching"], str(severity), [str(severity), str(dataset)])
+
+    assert catalog.last_modified.timestamp() == 2_000_000
+    assert SymptomCatalog(["itching"], str(severity)).last_modified.timestamp() == 1_000_000
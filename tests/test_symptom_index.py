@@ -0,0 +1,60 @@
+import pytest
+
+from symptom_index import SymptomIndex
+from symptom_matrix import load_symptom_matrix
+
+
+@pytest.fixture(scope="module")
+def index():
+    data = load_symptom_matrix("data/maladies_symptomes_binary.csv")
+    return SymptomIndex(data.symptoms, "data/Symptom-severity.csv")
+
+
+@pytest.mark.parametrize("symptom", [
+    "cold_hands_and_feets",
+    "blurred_and_distorted_vision",
+    "puffy_face_and_eyes",
+    "drying_and_tingling_lips",
+])
+def test_multi_word_names_are_not_split_on_and(index, symptom):
+    assert index.resolve_all(symptom.replace("_", " ")) == [symptom]
+    assert index.resolve_all(symptom) == [symptom]
+
+
+def test_multi_word_names_inside_a_list(index):
+    assert index.resolve_all("blurred and distorted vision, cough") == ["blurred_and_distorted_vision", "cough"]
+    assert index.resolve_all("puffy face and eyes and cough") == ["puffy_face_and_eyes", "cough"]
+    assert index.resolve_all("cold hands and feets et vision floue") == [
+        "cold_hands_and_feets", "blurred_and_distorted_vision"]
+
+
+def test_free_text_is_still_split_on_conjunctions(index):
+    assert index.resolve_all("fièvre, toux et mal de gorge") == ["high_fever", "cough", "throat_irritation"]
+    assert index.resolve_all("hedache and vomiting") == ["headache", "vomiting"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("no fever", []),
+    ("not itching", []),
+    ("itching and no rash", ["itching"]),
+    ("without vomiting, cough", ["cough"]),
+    ("pas de fièvre, toux", ["cough"]),
+    ("sans fièvre ni toux et vomissements", ["vomiting"]),
+    ("no feverr and cough", ["cough"]),
+])
+def test_negated_symptoms_are_dropped(index, text, expected):
+    assert index.resolve_all(text) == expected
+
+
+@pytest.mark.parametrize("text", ["high", "back", "stomach", "pain"])
+def test_fragments_of_a_symptom_name_are_not_guessed(index, text):
+    assert index.resolve_all(text) == []
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("hedache", "headache"),
+    ("vomit", "vomiting"),
+    ("stomack pain", "stomach_pain"),
+])
+def test_typos_are_still_resolved(index, text, expected):
+    assert index.resolve_all(text) == [expected]
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from symptom_matrix import MATRIX_FILE, SymptomMatrix
+
+
+@pytest.fixture(scope="module")
+def data():
+    return SymptomMatrix.from_csv("data/maladies_symptomes_binary.csv")
+
+
+def test_save_then_mmap_load_round_trip(data, tmp_path):
+    data.save(tmp_path / "binary")
+
+    loaded = SymptomMatrix.load(tmp_path / "binary", mmap=True)
+
+    assert isinstance(loaded.matrix, np.memmap)
+    assert np.array_equal(loaded.matrix, data.matrix)
+    assert np.array_equal(loaded.labels, data.labels)
+    assert loaded.symptoms == data.symptoms
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["binary"]
+
+
+def test_save_does_not_touch_a_mapped_matrix(data, tmp_path):
+    directory = tmp_path / "binary"
+    data.save(directory)
+    mapped = SymptomMatrix.load(directory, mmap=True)
+    expected = np.array(mapped.matrix)
+
+    smaller = SymptomMatrix(data.symptoms, data.diseases, data.matrix[:10], data.label_codes[:10])
+    smaller.save(directory)
+
+    # L'ancien fichier projeté reste lisible et inchangé ; le nouveau est complet
+    assert np.array_equal(mapped.matrix, expected)
+    assert SymptomMatrix.load(directory).matrix.shape[0] == 10
+
+
+def test_load_rejects_an_inconsistent_set_of_files(data, tmp_path):
+    directory = tmp_path / "binary"
+    data.save(directory)
+    np.save(directory / MATRIX_FILE, np.asarray(data.matrix[:5]))
+
+    with pytest.raises(ValueError):
+        SymptomMatrix.load(directory)
@@ -0,0 +1,30 @@
+import os
+
+import metrics
+from prefork import format_memory, freeze_shared_state, process_memory
+
+
+def collect_memory_metrics():
+    """Mémoire du processus qui répond à /metrics (un worker), étiquetée par pid"""
+    labels = {"pid": os.getpid()}
+    return [(f"process_memory_{name}_bytes", "gauge", labels, value)
+            for name, value in process_memory().items()]
+
+
+def create_app():
+    """
+    Fabrique WSGI pour un serveur pré-fork :
+
+        gunicorn -c gunicorn.conf.py "wsgi:create_app()"
+
+    Avec preload_app, l'application (prédicteur, index, catalogue) est construite une seule
+    fois dans le maître, puis partagée par tous les workers après le fork. Les rechargements
+    ont donc lieu dans le maître (voir on_reload dans gunicorn.conf.py).
+    """
+    from app import app
+
+    app.config["PREFORK"] = True
+    metrics.REGISTRY.register_collector(collect_memory_metrics)
+    freeze_shared_state()
+    print(f"✅ Application chargée dans le maître (pid {os.getpid()}): {format_memory(process_memory())}")
+    return app